@@ -0,0 +1,110 @@
+"""
+Benchmark calendar renders: static layout engine vs FullCalendar in Chromium.
+
+For each view, times the Python layout + template render of the static
+calendar, and, when a Chromium binary is available, the full screenshot of
+the static page and of the FullCalendar page (which needs
+src/static/scripts/calendar.min.js, see install/update_vendors.sh).
+
+Usage:
+    python scripts/benchmark_calendar_render.py [--events 60] [--repeat 3] [--resolution 800x480]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+import pytz
+from plugins.base_plugin.base_plugin import BasePlugin
+from plugins.calendar.layout import build_layout
+from utils.app_utils import resolve_path
+from utils.image_utils import _find_chromium_binary
+
+VIEWS = ["timeGridDay", "timeGridWeek", "dayGrid", "dayGridMonth", "listMonth"]
+COLORS = ["#007BFF", "#db3246", "#20b7ae", "#ffcc00"]
+SETTINGS = {
+    "weekStartDay": "0",
+    "displayWeekends": "true",
+    "displayEventTime": "true",
+    "displayNowIndicator": "true",
+    "displayTitle": "true",
+    "displayPreviousDays": "true",
+    "backgroundColor": "#ffffff",
+    "textColor": "#000000",
+}
+
+
+def make_events(count, now):
+    """Random mix of timed, all-day and multi-day events around now."""
+    rng = random.Random(42)
+    events = []
+    for index in range(count):
+        day = now + timedelta(days=rng.randint(-10, 30))
+        color = rng.choice(COLORS)
+        kind = rng.random()
+        if kind < 0.2:
+            start = day.date()
+            end = start + timedelta(days=rng.randint(1, 4))
+            event = {"start": start.isoformat(), "end": end.isoformat(), "allDay": True}
+        else:
+            start = day.replace(hour=rng.randint(7, 19), minute=rng.choice([0, 15, 30, 45]))
+            end = start + timedelta(minutes=rng.choice([30, 60, 90, 120]))
+            event = {"start": start.isoformat(), "end": end.isoformat(), "allDay": False}
+        event.update({"title": f"Event {index}", "backgroundColor": color, "textColor": "#ffffff"})
+        events.append(event)
+    return events
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark calendar renders")
+    parser.add_argument("--events", type=int, default=60, help="Number of generated events")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per case, the fastest is reported")
+    parser.add_argument("--resolution", default="800x480", help="Display resolution, e.g. 800x480")
+    args = parser.parse_args()
+    dimensions = tuple(int(value) for value in args.resolution.lower().split("x"))
+
+    tz = pytz.timezone("America/New_York")
+    now = datetime.now(tz).replace(minute=0, second=0, microsecond=0)
+    events = make_events(args.events, now)
+    plugin = BasePlugin({"id": "calendar"})
+
+    browser = _find_chromium_binary()
+    fullcalendar = os.path.isfile(resolve_path(os.path.join("static", "scripts", "calendar.min.js")))
+    if not browser:
+        print("No Chromium binary found, only timing the Python layout and template render\n")
+
+    def best(func):
+        timings = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - start)
+        return min(timings) * 1000
+
+    print(f"{'view':<14} {'layout+html (ms)':>17} {'static shot (ms)':>17} {'fullcalendar (ms)':>18}")
+    for view in VIEWS:
+        grid_view = "timeGrid" if view == "timeGridWeek" and SETTINGS["displayPreviousDays"] != "true" else view
+        params = {"view": grid_view, "events": events, "current_dt": now.isoformat(), "timezone": tz.zone,
+                  "plugin_settings": SETTINGS, "time_format": "12h", "font_scale": 1}
+
+        def layout_and_html():
+            template_params = dict(params, layout=build_layout(grid_view, events, now, SETTINGS, "12h"))
+            plugin.env.get_template("calendar/calendar_static.html").render(template_params)
+
+        static_shot = fullcalendar_shot = "-"
+        if browser:
+            static_params = dict(params, layout=build_layout(grid_view, events, now, SETTINGS, "12h"))
+            static_shot = f"{best(lambda: plugin.render_image(dimensions, 'calendar_static.html', 'calendar_static.css', dict(static_params))):.0f}"
+            if fullcalendar:
+                fullcalendar_shot = f"{best(lambda: plugin.render_image(dimensions, 'calendar.html', 'calendar.css', dict(params))):.0f}"
+
+        print(f"{view:<14} {best(layout_and_html):>17.1f} {static_shot:>17} {fullcalendar_shot:>18}")
+
+
+if __name__ == "__main__":
+    main()
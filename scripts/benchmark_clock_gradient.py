@@ -0,0 +1,113 @@
+"""
+Benchmark the Gradient Clock background before and after the cached angle field.
+
+"before" is the original implementation: two full-frame draw_gradient_image calls,
+each computing np.arctan2 and float64 per-channel intermediates, combined with
+Image.alpha_composite. "after" is Clock.draw_conic_gradients, which reuses the
+uint16 angle field cached per resolution and renders both layers in one lookup.
+
+Reports the fastest wall time and the peak traced allocation (numpy buffers are
+tracked by tracemalloc) per resolution, and the largest per-pixel difference
+between both outputs.
+
+Usage:
+    python scripts/benchmark_clock_gradient.py [--repeat 5]
+"""
+
+import argparse
+import math
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+import numpy as np
+from PIL import Image
+from plugins.clock.clock import Clock
+
+RESOLUTIONS = [
+    (400, 300),    # Inky wHAT
+    (800, 480),    # Inky Impression 7.3"
+    (1600, 1200),  # Inky Impression 13.3"
+]
+HOUR_ANGLE = math.radians(90 - (10 * 30 + 8 * 0.5))
+MINUTE_ANGLE = math.radians((90 - 8 * 6) % 360)
+START_COLOR = (0, 0, 0)
+END_COLOR = (219, 50, 70)
+
+
+def legacy_gradient_image(w, h, start_angle, end_angle, start_color, end_color):
+    x,y = np.ogrid[:h,:w]
+    cx,cy = h/2, w/2
+
+    start_angle = -start_angle
+    end_angle = -end_angle
+
+    theta = (np.arctan2(x-cx,y-cy) - start_angle)  % (2*np.pi)
+
+    angle_range = ((end_angle-start_angle) % (2 * np.pi))
+    if angle_range == 0:
+        angle_range = 2*np.pi
+
+    anglemask = theta <= angle_range
+    theta = theta / angle_range
+
+    gradient = np.zeros((h, w, 4), dtype=np.uint8)
+    start_color = Clock.pad_color(start_color)
+    end_color = Clock.pad_color(end_color)
+    for c in range(4):
+        gradient[..., c] = (
+            start_color[c] * (1 - theta) + end_color[c] * (theta)
+        ).astype(np.uint8)
+
+    gradient[~anglemask] = (0, 0, 0, 0)
+    return Image.fromarray(gradient, mode="RGBA")
+
+
+def before(w, h):
+    image_hour = legacy_gradient_image(w, h, HOUR_ANGLE, MINUTE_ANGLE, START_COLOR, END_COLOR)
+    image_minute = legacy_gradient_image(w, h, MINUTE_ANGLE, HOUR_ANGLE, START_COLOR, END_COLOR)
+    return Image.alpha_composite(image_hour, image_minute)
+
+
+def after(w, h):
+    return Clock.draw_conic_gradients(w, h, HOUR_ANGLE, MINUTE_ANGLE, START_COLOR, END_COLOR)
+
+
+def measure(func, w, h, repeat):
+    # first call outside of the measurement, it fills the angle field cache
+    func(w, h)
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(w, h)
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    image = func(w, h)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return min(timings), peak, image
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Gradient Clock background")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per case, the fastest is reported")
+    args = parser.parse_args()
+
+    print(f"{'resolution':<12} {'version':<8} {'time (ms)':>10} {'peak (MB)':>10}")
+    for w, h in RESOLUTIONS:
+        results = {}
+        for name, func in (("before", before), ("after", after)):
+            elapsed, peak, image = measure(func, w, h, args.repeat)
+            results[name] = image
+            print(f"{f'{w}x{h}':<12} {name:<8} {elapsed * 1000:>10.1f} {peak / 1024 / 1024:>10.1f}")
+        diff = np.abs(np.asarray(results["before"], dtype=np.int16) - np.asarray(results["after"], dtype=np.int16))
+        mismatched = np.count_nonzero(diff.max(axis=2) > 2) / (w * h)
+        print(f"{'':<12} max channel difference {diff.max()}, {mismatched:.3%} of pixels differ by more than 2")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Benchmark the streaming feed reader against feedparser on large generated feeds.
+
+Generates an RSS 2.0 and an Atom feed with many entries and long HTML
+descriptions, then reports the parse time and peak Python memory (tracemalloc)
+of feedparser parsing the whole document vs utils.feed_reader stopping after
+the first N entries. The body is fed in network sized chunks like read_feed
+does with the HTTP response.
+
+Usage:
+    python scripts/benchmark_feed_reader.py [--items 500] [--entries 10] [--repeat 3]
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from utils.feed_reader import CHUNK_SIZE, Feed, iter_entries
+
+PARAGRAPH = ("<p>Lorem ipsum dolor sit amet, <a href=\"https://example.com\">consectetur</a> adipiscing elit, "
+             "sed do eiusmod tempor incididunt ut labore et dolore magna aliqua.</p>")
+
+
+def make_rss(items):
+    entries = "".join(f"""
+    <item>
+      <title>Item {index} &amp; more</title>
+      <link>https://example.com/items/{index}</link>
+      <pubDate>Mon, 19 Oct 2026 12:00:00 GMT</pubDate>
+      <description><![CDATA[{PARAGRAPH * 20}]]></description>
+      <content:encoded><![CDATA[{PARAGRAPH * 40}<img src="https://example.com/{index}.jpg" alt="Item {index}"/>]]></content:encoded>
+      <media:content url="https://example.com/{index}.jpg" medium="image"/>
+    </item>""" for index in range(items))
+    return f"""<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0" xmlns:content="http://purl.org/rss/1.0/modules/content/" xmlns:media="http://search.yahoo.com/mrss/">
+  <channel><title>Benchmark</title><link>https://example.com</link>{entries}
+  </channel>
+</rss>""".encode()
+
+
+def make_atom(items):
+    entries = "".join(f"""
+  <entry>
+    <title>Item {index}</title>
+    <link href="https://example.com/items/{index}" rel="alternate"/>
+    <id>https://example.com/items/{index}</id>
+    <updated>2026-10-19T12:00:00Z</updated>
+    <summary type="html">{(PARAGRAPH * 20).replace("&", "&amp;").replace("<", "&lt;")}</summary>
+  </entry>""" for index in range(items))
+    return f"""<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom"><title>Benchmark</title><id>urn:benchmark</id>
+  <updated>2026-10-19T12:00:00Z</updated>{entries}
+</feed>""".encode()
+
+
+def measure(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    tracemalloc.start()
+    result = func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return min(timings) * 1000, peak / 1024 / 1024, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark feed parsing")
+    parser.add_argument("--items", type=int, default=500, help="Entries in the generated feeds")
+    parser.add_argument("--entries", type=int, default=10, help="Entries the plugin needs")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per case, the fastest is reported")
+    args = parser.parse_args()
+
+    try:
+        import feedparser
+    except ImportError:
+        feedparser = None
+        print("feedparser is not installed, only timing the streaming reader\n")
+
+    print(f"{'feed':<6} {'size (MB)':>9} {'parser':<22} {'time (ms)':>10} {'peak (MB)':>10} {'entries':>8}")
+    for name, content in [("rss", make_rss(args.items)), ("atom", make_atom(args.items))]:
+        chunks = [content[offset:offset + CHUNK_SIZE] for offset in range(0, len(content), CHUNK_SIZE)]
+        cases = [(f"stream (first {args.entries})", lambda: Feed(list(iter_entries(chunks, args.entries)))),
+                 ("stream (all)", lambda: Feed(list(iter_entries(chunks))))]
+        if feedparser:
+            cases.insert(0, ("feedparser", lambda: feedparser.parse(content)))
+
+        for label, func in cases:
+            elapsed, peak, feed = measure(func, args.repeat)
+            print(f"{name:<6} {len(content) / 1024 / 1024:>9.2f} {label:<22} {elapsed:>10.1f} {peak:>10.1f} {len(feed.entries):>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Benchmark the Pillow and libvips image backends on the plugin workloads.
+
+Generates large synthetic inputs (panorama picture of the day, newspaper scan,
+camera photo) and measures wall time and peak RSS of each backend for the
+operations plugins run: cover-resize for the display, blurred padding for
+image_folder/image_album/image_upload, and the display pipeline
+(rotate + enhance).
+
+Each case runs in a fresh process so peak memory is not polluted by earlier runs.
+
+Usage:
+    python scripts/benchmark_image_backends.py [--resolution 800x480] [--repeat 3]
+"""
+
+import argparse
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from PIL import Image, ImageDraw
+from utils.image_backend import BACKENDS, pyvips
+
+INPUTS = {
+    "panorama_potd": ((16000, 4000), "RGB", "JPEG"),
+    "newspaper_scan": ((7000, 11000), "L", "JPEG"),
+    "camera_photo": ((6000, 4000), "RGB", "JPEG"),
+    "screenshot_png": ((2400, 1440), "RGB", "PNG"),
+}
+
+
+def make_input(directory, name, size, mode, fmt):
+    """Write a synthetic image with enough structure to not compress to nothing."""
+    path = os.path.join(directory, f"{name}.{fmt.lower()}")
+    img = Image.linear_gradient("L").resize(size)
+    if mode == "RGB":
+        img = Image.merge("RGB", (img, img.transpose(Image.FLIP_LEFT_RIGHT), img.transpose(Image.FLIP_TOP_BOTTOM)))
+    draw = ImageDraw.Draw(img)
+    step = max(size) // 40
+    for offset in range(0, max(size), step):
+        draw.line((offset, 0, 0, offset), fill=0, width=3)
+    img.save(path, format=fmt, quality=90)
+    return path
+
+
+def workload_thumbnail(backend, path, dimensions):
+    return backend.thumbnail(path, dimensions)
+
+
+def workload_pad(backend, path, dimensions):
+    img = backend.thumbnail(path, (dimensions[0] * 2, dimensions[1] * 2), fit="contain")
+    return backend.pad(img, dimensions)
+
+
+def workload_display(backend, path, dimensions):
+    img = backend.thumbnail(path, dimensions[::-1])
+    img = backend.rotate(img, 90)
+    return backend.enhance(img, {"brightness": 1.1, "contrast": 1.2, "saturation": 1.3, "sharpness": 1.1})
+
+
+WORKLOADS = {
+    "thumbnail": workload_thumbnail,
+    "pad_blur": workload_pad,
+    "display_pipeline": workload_display,
+}
+
+
+def run_case(backend_name, workload, path, dimensions, repeat, queue):
+    backend = BACKENDS[backend_name]()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        WORKLOADS[workload](backend, path, dimensions)
+        timings.append(time.perf_counter() - start)
+    # ru_maxrss is reported in kilobytes on Linux
+    queue.put((min(timings), resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024))
+
+
+def measure(backend_name, workload, path, dimensions, repeat):
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.Queue()
+    process = ctx.Process(target=run_case, args=(backend_name, workload, path, dimensions, repeat, queue))
+    process.start()
+    result = queue.get()
+    process.join()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark InkyPi image backends")
+    parser.add_argument("--resolution", default="800x480", help="Display resolution, e.g. 800x480")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per case, the fastest is reported")
+    args = parser.parse_args()
+    dimensions = tuple(int(value) for value in args.resolution.lower().split("x"))
+
+    backends = ["pillow"]
+    if pyvips is not None:
+        backends.append("vips")
+    else:
+        print("pyvips is not available, only benchmarking the Pillow backend\n")
+
+    with tempfile.TemporaryDirectory() as directory:
+        inputs = {name: make_input(directory, name, *spec) for name, spec in INPUTS.items()}
+
+        print(f"{'input':<16} {'workload':<18} {'backend':<8} {'time (ms)':>10} {'peak RSS (MB)':>14}")
+        for name, path in inputs.items():
+            for workload in WORKLOADS:
+                for backend_name in backends:
+                    elapsed, peak_mb = measure(backend_name, workload, path, dimensions, args.repeat)
+                    print(f"{name:<16} {workload:<18} {backend_name:<8} {elapsed * 1000:>10.1f} {peak_mb:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
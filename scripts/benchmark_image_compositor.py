@@ -0,0 +1,124 @@
+"""
+Benchmark the image compositor against the previous fit/pad code.
+
+Generates camera sized synthetic inputs and measures wall time and peak RSS
+of the padding and cropping the image plugins run, decoding from the file:
+
+- legacy: full decode, ImageOps.fit + BoxBlur at display size for the
+  background and ImageOps.contain for the foreground (blur), ImageOps.pad
+  (color) or ImageOps.fit (crop)
+- compositor: draft decode with utils.image_compositor.open_image, then
+  compose_image with a single resize and a downscaled blur
+
+Each case runs in a fresh process so peak memory is not polluted by earlier runs.
+
+Usage:
+    python scripts/benchmark_image_compositor.py [--resolution 800x480] [--repeat 3]
+"""
+
+import argparse
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from PIL import Image, ImageColor, ImageDraw, ImageFilter, ImageOps
+from utils.image_compositor import compose_image, open_image
+
+INPUTS = {
+    "camera_photo": ((6000, 4000), "JPEG"),
+    "portrait_photo": ((3000, 4000), "JPEG"),
+    "screenshot_png": ((2400, 1440), "PNG"),
+}
+
+SETTINGS = {
+    "pad_blur": {"padImage": "true", "backgroundOption": "blur"},
+    "pad_color": {"padImage": "true", "backgroundOption": "color", "backgroundColor": "#ffffff"},
+    "crop": {"padImage": "false"},
+}
+
+
+def make_input(directory, name, size, fmt):
+    """Write a synthetic image with enough structure to not compress to nothing."""
+    path = os.path.join(directory, f"{name}.{fmt.lower()}")
+    img = Image.linear_gradient("L").resize(size)
+    img = Image.merge("RGB", (img, img.transpose(Image.FLIP_LEFT_RIGHT), img.transpose(Image.FLIP_TOP_BOTTOM)))
+    draw = ImageDraw.Draw(img)
+    step = max(size) // 40
+    for offset in range(0, max(size), step):
+        draw.line((offset, 0, 0, offset), fill=0, width=3)
+    img.save(path, format=fmt, quality=90)
+    return path
+
+
+def legacy(path, dimensions, settings):
+    img = ImageOps.exif_transpose(Image.open(path)).convert("RGB")
+    if settings["padImage"] != "true":
+        return ImageOps.fit(img, dimensions, method=Image.LANCZOS)
+    if settings["backgroundOption"] == "blur":
+        bkg = ImageOps.fit(img, dimensions).filter(ImageFilter.BoxBlur(8))
+        img = ImageOps.contain(img, dimensions)
+        bkg.paste(img, ((dimensions[0] - img.width) // 2, (dimensions[1] - img.height) // 2))
+        return bkg
+    color = ImageColor.getcolor(settings["backgroundColor"], img.mode)
+    return ImageOps.pad(img, dimensions, color=color, method=Image.LANCZOS)
+
+
+def compositor(path, dimensions, settings):
+    img = open_image(path, dimensions, fit="contain" if settings["padImage"] == "true" else "cover")
+    return compose_image(img, dimensions, settings)
+
+
+IMPLEMENTATIONS = {
+    "legacy": legacy,
+    "compositor": compositor,
+}
+
+
+def run_case(implementation, path, dimensions, settings, repeat, queue):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        IMPLEMENTATIONS[implementation](path, dimensions, settings)
+        timings.append(time.perf_counter() - start)
+    # ru_maxrss is reported in kilobytes on Linux
+    queue.put((min(timings), resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024))
+
+
+def measure(implementation, path, dimensions, settings, repeat):
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.Queue()
+    process = ctx.Process(target=run_case, args=(implementation, path, dimensions, settings, repeat, queue))
+    process.start()
+    result = queue.get()
+    process.join()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the InkyPi image compositor")
+    parser.add_argument("--resolution", default="800x480", help="Display resolution, e.g. 800x480")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per case, the fastest is reported")
+    args = parser.parse_args()
+    dimensions = tuple(int(value) for value in args.resolution.lower().split("x"))
+
+    with tempfile.TemporaryDirectory() as directory:
+        # inputs are written by a child process, peak RSS is inherited by the processes spawned later
+        ctx = multiprocessing.get_context("spawn")
+        with ctx.Pool(1) as pool:
+            inputs = {name: pool.apply(make_input, (directory, name, *spec)) for name, spec in INPUTS.items()}
+
+        print(f"{'input':<16} {'mode':<10} {'implementation':<14} {'time (ms)':>10} {'peak RSS (MB)':>14}")
+        for name, path in inputs.items():
+            for mode, settings in SETTINGS.items():
+                for implementation in IMPLEMENTATIONS:
+                    elapsed, peak_mb = measure(implementation, path, dimensions, settings, args.repeat)
+                    print(f"{name:<16} {mode:<10} {implementation:<14} {elapsed * 1000:>10.1f} {peak_mb:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Benchmark the weather plugin's hourly chart.
+
+Times the Python chart layout and the weather.html template render and, when a
+Chromium binary is available, the screenshot of the page with and without the
+chart, reporting wall time and the CPU time spent in the browser processes.
+
+Usage:
+    python scripts/benchmark_weather_chart.py [--hours 24] [--repeat 3] [--resolution 800x480]
+"""
+
+import argparse
+import os
+import random
+import resource
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from plugins.base_plugin.base_plugin import BasePlugin
+from plugins.weather.chart import build_hourly_chart
+from utils.image_utils import _find_chromium_binary
+
+SETTINGS = {
+    "displayGraph": "true",
+    "displayRain": "true",
+    "displayGraphIcons": "true",
+    "graphIconStep": "2",
+    "displayForecast": "true",
+    "forecastDays": "5",
+    "textColor": "#000000",
+    "backgroundColor": "#ffffff",
+}
+
+
+def make_params(plugin, hours, settings, dimensions):
+    """Template params for weather.html with a generated hourly forecast."""
+    rng = random.Random(42)
+    icon = plugin.get_plugin_dir("icons/01d.png")
+    hourly = [{
+        "time": f"{(index % 12) or 12} {'AM' if index < 12 else 'PM'}",
+        "temperature": 12 + int(6 * rng.random()),
+        "precipitation": round(rng.random(), 2),
+        "rain": round(rng.random(), 2),
+        "icon": icon,
+    } for index in range(hours)]
+    forecast = [{"day": "Mon", "high": 18, "low": 9, "icon": icon} for _ in range(6)]
+    return {
+        "title": "Benchmark", "current_date": "Monday, October 19", "current_day_icon": icon,
+        "current_temperature": 15, "temperature_unit": "°C", "feels_like": 14, "units": "metric",
+        "forecast": forecast, "data_points": [], "hourly_forecast": hourly, "plugin_settings": settings,
+        "last_refresh_time": "", "chart": build_hourly_chart(hourly, "metric", settings, dimensions),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the weather hourly chart")
+    parser.add_argument("--hours", type=int, default=24, help="Number of hours in the chart")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per case, the fastest is reported")
+    parser.add_argument("--resolution", default="800x480", help="Display resolution, e.g. 800x480")
+    args = parser.parse_args()
+    dimensions = tuple(int(value) for value in args.resolution.lower().split("x"))
+
+    plugin = BasePlugin({"id": "weather"})
+    params = make_params(plugin, args.hours, SETTINGS, dimensions)
+
+    def best(func):
+        timings, cpu = [], []
+        for _ in range(args.repeat):
+            children = resource.getrusage(resource.RUSAGE_CHILDREN)
+            start = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - start)
+            after = resource.getrusage(resource.RUSAGE_CHILDREN)
+            cpu.append(after.ru_utime + after.ru_stime - children.ru_utime - children.ru_stime)
+        return min(timings) * 1000, min(cpu) * 1000
+
+    layout, _ = best(lambda: build_hourly_chart(params["hourly_forecast"], "metric", SETTINGS, dimensions))
+    html, _ = best(lambda: plugin.env.get_template("weather/weather.html").render(params))
+    print(f"chart layout: {layout:.2f} ms, template render: {html:.2f} ms")
+
+    if not _find_chromium_binary():
+        print("No Chromium binary found, skipping screenshots")
+        return
+
+    print(f"\n{'case':<12} {'wall (ms)':>10} {'browser cpu (ms)':>17}")
+    for name, settings in [("no chart", dict(SETTINGS, displayGraph="false")), ("chart", SETTINGS)]:
+        case = dict(params, plugin_settings=settings)
+        wall, cpu = best(lambda: plugin.render_image(dimensions, "weather.html", "weather.css", dict(case)))
+        print(f"{name:<12} {wall:>10.0f} {cpu:>17.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
 from flask import Blueprint, request, jsonify, current_app, render_template, send_file
 import os
-from datetime import datetime
+from utils.image_preview import image_etag, get_preview, preferred_format
+from utils.event_stream import get_event_stream
 
 main_bp = Blueprint("main", __name__)
 
@@ -11,37 +12,81 @@ def main_page():
 
 @main_bp.route('/api/current_image')
 def get_current_image():
-    """Serve current_image.png with conditional request support (If-Modified-Since)."""
-    image_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'static', 'images', 'current_image.png')
-    
-    if not os.path.exists(image_path):
+    """Serve current_image.png with conditional request support (ETag, If-Modified-Since)."""
+    device_config = current_app.config['DEVICE_CONFIG']
+    response = send_image(device_config.current_image_file, device_config.get_refresh_info().image_hash)
+    if response is None:
         return jsonify({"error": "Image not found"}), 404
-    
-    # Get the file's last modified time (truncate to seconds to match HTTP header precision)
-    file_mtime = int(os.path.getmtime(image_path))
-    last_modified = datetime.fromtimestamp(file_mtime)
-    
-    # Check If-Modified-Since header
-    if_modified_since = request.headers.get('If-Modified-Since')
-    if if_modified_since:
-        try:
-            # Parse the If-Modified-Since header
-            client_mtime = datetime.strptime(if_modified_since, '%a, %d %b %Y %H:%M:%S %Z')
-            client_mtime_seconds = int(client_mtime.timestamp())
-            
-            # Compare (both now in seconds, no sub-second precision)
-            if file_mtime <= client_mtime_seconds:
-                return '', 304
-        except (ValueError, AttributeError):
-            pass
-    
-    # Send the file with Last-Modified header
-    response = send_file(image_path, mimetype='image/png')
-    response.headers['Last-Modified'] = last_modified.strftime('%a, %d %b %Y %H:%M:%S GMT')
+    return response
+
+
+def send_image(image_path, image_hash=None):
+    """Sends a generated image with a strong ETag, answering conditional requests with 304.
+
+    A `w` query parameter sends a cached WebP or JPEG preview about that wide instead.
+
+    Args:
+        image_path: Path of the PNG image.
+        image_hash: Stored hash of the image, used in the ETag.
+
+    Returns:
+        The response, or None if the image does not exist.
+    """
+    etag = image_etag(image_path, image_hash)
+    if etag is None:
+        return None
+
+    width = request.args.get('w', type=int)
+    if width is not None and width <= 0:
+        width = None
+    image_format = preferred_format(request.headers.get('Accept')) if width else None
+    response_etag = f"{etag}-{width}-{image_format}" if width else etag
+
+    # answer revalidations before opening or resizing anything
+    if request.if_none_match.contains(response_etag):
+        response = current_app.response_class(status=304)
+        response.set_etag(response_etag)
+        response.headers['Cache-Control'] = 'no-cache'
+        return response
+
+    path, mimetype = image_path, 'image/png'
+    if width:
+        preview = get_preview(image_path, etag, width, image_format)
+        if preview:
+            path, mimetype, _ = preview
+
+    response = send_file(path, mimetype=mimetype, etag=response_etag, conditional=True,
+                         last_modified=os.path.getmtime(image_path))
     response.headers['Cache-Control'] = 'no-cache'
+    if width:
+        response.vary.add('Accept')
     return response
 
 
+@main_bp.route('/api/events')
+def get_events():
+    """Server-Sent Events with the refresh lifecycle events after the client's Last-Event-ID.
+
+    The stream is held open and new events are pushed as they are published, see
+    EventStream.stream for the limits on open streams.
+    """
+    last_event_id = request.headers.get('Last-Event-ID') or request.args.get('lastEventId')
+    response = current_app.response_class(get_event_stream().stream(last_event_id), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+
+@main_bp.route('/api/jobs/<job_id>')
+def get_job(job_id):
+    """Status of a queued manual update, see RefreshJob.to_dict."""
+    refresh_task = current_app.config['REFRESH_TASK']
+    job = refresh_task.get_job(job_id)
+    if not job:
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify(job.to_dict())
+
+
 @main_bp.route('/api/plugin_order', methods=['POST'])
 def save_plugin_order():
     """Save the custom plugin order."""
@@ -51,7 +51,7 @@ def add_plugin():
                 return jsonify({"error": "Refresh time is required"}), 400
             refresh_config = {"scheduled": refresh_time}
 
-        plugin_settings.update(handle_request_files(request.files))
+        plugin_settings.update(handle_request_files(request.files, derivative_size=max(device_config.get_resolution())))
         plugin_dict = {
             "plugin_id": plugin_id,
             "refresh": refresh_config,
@@ -154,7 +154,7 @@ def delete_playlist(playlist_name):
     # Delete all images associated with plugin instances in this playlist
     from blueprints.plugin import _delete_plugin_instance_images
     for plugin_instance in playlist.plugins:
-        _delete_plugin_instance_images(device_config, plugin_instance)
+        _delete_plugin_instance_images(device_config, plugin_instance, deleted_instances=playlist.plugins)
 
     playlist_manager.delete_playlist(playlist_name)
     device_config.write_config()
@@ -1,18 +1,28 @@
-from flask import Blueprint, request, jsonify, current_app, render_template, send_from_directory
+from flask import Blueprint, request, jsonify, current_app, render_template, send_from_directory, url_for
 from plugins.plugin_registry import get_plugin_instance
 from utils.app_utils import resolve_path, handle_request_files, parse_form
-from refresh_task import ManualRefresh, PlaylistRefresh
+from refresh_task import ManualRefresh, PlaylistRefresh, JobQueueFull
+from blueprints.main import send_image
+from utils.image_writer import get_image_writer
+from utils.image_memory_cache import get_image_memory_cache
+from datetime import datetime
 import json
 import os
 import logging
+import pytz
 
 logger = logging.getLogger(__name__)
 plugin_bp = Blueprint("plugin", __name__)
 
-def _delete_plugin_instance_images(device_config, plugin_instance_obj):
-    """Delete all images associated with a plugin instance."""
+def _delete_plugin_instance_images(device_config, plugin_instance_obj, deleted_instances=()):
+    """Delete all images associated with a plugin instance.
+
+    deleted_instances are the other instances removed along with it (e.g. the rest of a deleted
+    playlist), files they share with this instance are deleted too.
+    """
     # Delete the plugin instance's generated image
     plugin_image_path = os.path.join(device_config.plugin_image_dir, plugin_instance_obj.get_image_path())
+    get_image_memory_cache().discard(plugin_image_path)
     if os.path.exists(plugin_image_path):
         try:
             os.remove(plugin_image_path)
@@ -25,10 +35,44 @@ def _delete_plugin_instance_images(device_config, plugin_instance_obj):
         plugin_config = device_config.get_plugin(plugin_instance_obj.plugin_id)
         if plugin_config:
             plugin = get_plugin_instance(plugin_config)
-            plugin.cleanup(plugin_instance_obj.settings)
+            plugin.cleanup(_without_shared_files(device_config, plugin_instance_obj, deleted_instances))
     except Exception as e:
         logger.warning(f"Error during plugin cleanup for {plugin_instance_obj.plugin_id}: {e}")
 
+def _without_shared_files(device_config, plugin_instance_obj, deleted_instances=()):
+    """Settings of a plugin instance without the file paths other instances also use.
+
+    Identical uploads are stored once, so an uploaded file can belong to several instances.
+    Instances in deleted_instances are being deleted as well and don't count as users.
+    """
+    excluded = {id(plugin_instance_obj)} | {id(instance) for instance in deleted_instances}
+    shared = set()
+    for playlist in device_config.get_playlist_manager().playlists:
+        for other in playlist.plugins:
+            if id(other) in excluded:
+                continue
+            for value in other.settings.values():
+                values = value if isinstance(value, list) else [value]
+                shared.update(path for path in values if isinstance(path, str) and os.path.isfile(path))
+
+    def is_shared(value):
+        return isinstance(value, str) and value in shared
+
+    settings = {}
+    for key, value in plugin_instance_obj.settings.items():
+        if isinstance(value, list):
+            settings[key] = [item for item in value if not is_shared(item)]
+        elif not is_shared(value):
+            settings[key] = value
+    return settings
+
+def _job_accepted(job):
+    """202 response for a queued manual update, pointing to its status endpoint."""
+    status_url = url_for('main.get_job', job_id=job.id)
+    response = jsonify({"success": True, "message": "Update queued", "job_id": job.id, "status_url": status_url})
+    response.headers['Location'] = status_url
+    return response, 202
+
 # Removed module-level PLUGINS_DIR - will resolve dynamically in route handlers
 
 @plugin_bp.route('/plugin/<plugin_id>')
@@ -110,13 +154,12 @@ def plugin_instance_image(playlist_name, plugin_id, instance_name):
     image_filename = plugin_instance.get_image_path()
     image_path = os.path.join(device_config.plugin_image_dir, image_filename)
 
-    # Check if the image exists
-    if not os.path.exists(image_path):
+    # Serve the image, or a preview if a width is requested
+    response = send_image(image_path, plugin_instance.image_hash)
+    if response is None:
         # Return a placeholder or 404
         return "Image not yet generated", 404
-
-    # Serve the image
-    return send_from_directory(device_config.plugin_image_dir, image_filename)
+    return response
 
 @plugin_bp.route('/delete_plugin_instance', methods=['POST'])
 def delete_plugin_instance():
@@ -190,10 +233,13 @@ def update_plugin_instance(instance_name):
 
         # Only update plugin settings if there's actual data (not just refresh settings)
         plugin_settings = form_data
-        plugin_settings.update(handle_request_files(request.files, request.form))
+        plugin_settings.update(handle_request_files(request.files, request.form,
+                                                    derivative_size=max(device_config.get_resolution())))
 
         if plugin_settings:  # Only update if there are actual plugin settings
             plugin_instance.settings = plugin_settings
+            # the next change time was computed for the previous settings
+            plugin_instance.next_change_time = None
 
         device_config.write_config()
     except Exception as e:
@@ -204,6 +250,7 @@ def update_plugin_instance(instance_name):
 def display_plugin_instance():
     device_config = current_app.config['DEVICE_CONFIG']
     refresh_task = current_app.config['REFRESH_TASK']
+    display_manager = current_app.config['DISPLAY_MANAGER']
     playlist_manager = device_config.get_playlist_manager()
 
     data = request.json
@@ -220,7 +267,25 @@ def display_plugin_instance():
         if not plugin_instance:
             return jsonify({"success": False, "message": f"Plugin instance '{plugin_instance_name}' not found"}), 400
 
-        refresh_task.manual_update(PlaylistRefresh(playlist, plugin_instance, force=True))
+        refresh_action = PlaylistRefresh(playlist, plugin_instance, force=True)
+        if refresh_task.running:
+            return _job_accepted(refresh_task.submit(refresh_action))
+
+        # In development mode, directly update the display
+        logger.info("Refresh task not running, updating display directly")
+        plugin_config = device_config.get_plugin(plugin_id)
+        if not plugin_config:
+            return jsonify({"error": f"Plugin '{plugin_id}' not found"}), 404
+
+        current_dt = datetime.now(pytz.timezone(device_config.get_config("timezone", default="UTC")))
+        image = refresh_action.execute(get_plugin_instance(plugin_config), device_config, current_dt)
+        display_manager.display_image(image, image_settings=plugin_config.get("image_settings", []),
+                                      image_hash=refresh_action.image_hash)
+        device_config.write_config()
+        # the page reloads the current image right away
+        get_image_writer().flush()
+    except JobQueueFull as e:
+        return jsonify({"error": str(e)}), 429
     except Exception as e:
         return jsonify({"error": f"An error occurred: {str(e)}"}), 500
 
@@ -234,12 +299,12 @@ def update_now():
 
     try:
         plugin_settings = parse_form(request.form)
-        plugin_settings.update(handle_request_files(request.files))
+        plugin_settings.update(handle_request_files(request.files, derivative_size=max(device_config.get_resolution())))
         plugin_id = plugin_settings.pop("plugin_id")
 
         # Check if refresh task is running
         if refresh_task.running:
-            refresh_task.manual_update(ManualRefresh(plugin_id, plugin_settings))
+            return _job_accepted(refresh_task.submit(ManualRefresh(plugin_id, plugin_settings)))
         else:
             # In development mode, directly update the display
             logger.info("Refresh task not running, updating display directly")
@@ -250,7 +315,11 @@ def update_now():
             plugin = get_plugin_instance(plugin_config)
             image = plugin.generate_image(plugin_settings, device_config)
             display_manager.display_image(image, image_settings=plugin_config.get("image_settings", []))
+            # the page reloads the current image right away
+            get_image_writer().flush()
 
+    except JobQueueFull as e:
+        return jsonify({"error": str(e)}), 429
     except Exception as e:
         logger.exception(f"Error in update_now: {str(e)}")
         return jsonify({"error": f"An error occurred: {str(e)}"}), 500
@@ -1,10 +1,10 @@
-from flask import Blueprint, request, jsonify, current_app, render_template, Response
+from flask import Blueprint, request, jsonify, current_app, render_template, Response, stream_with_context
 from utils.time_utils import calculate_seconds
+from utils.log_export import MAX_RECORDS, parse_level, format_journal_record, filter_log_lines, iter_chunks, gzip_chunks
 from datetime import datetime, timedelta
 import os
 import pytz
 import logging
-import io
 
 # Try to import cysystemd for journal reading (Linux only)
 try:
@@ -94,9 +94,8 @@ def shutdown():
 
 @settings_bp.route('/download-logs')
 def download_logs():
+    """Streams the service logs, optionally filtered by ?level=, ?logger= and ?q= and gzipped with ?gzip=1."""
     try:
-        buffer = io.StringIO()
-        
         # Get 'hours' from query parameters, default to 2 if not provided or invalid
         hours_str = request.args.get('hours', '2')
         try:
@@ -105,40 +104,44 @@ def download_logs():
             hours = 2
         since = datetime.now() - timedelta(hours=hours)
 
+        level_name = request.args.get('level')
+        level = parse_level(level_name)
+        if level_name and level is None:
+            return jsonify({"error": f"Invalid log level: {level_name}"}), 400
+        limit = min(max(request.args.get('limit', MAX_RECORDS, type=int), 1), MAX_RECORDS)
+        compress = request.args.get('gzip', '').lower() in ("1", "true")
+
         if not JOURNAL_AVAILABLE:
             # Return a message when running in development mode without systemd
-            buffer.write(f"Log download not available in development mode (cysystemd not installed).\n")
-            buffer.write(f"Logs would normally show InkyPi service logs from the last {hours} hours.\n")
-            buffer.write(f"\nTo see Flask development logs, check your terminal output.\n")
+            records = [{"line": line, "message": line, "priority": None} for line in (
+                f"Log download not available in development mode (cysystemd not installed).\n",
+                f"Logs would normally show InkyPi service logs from the last {hours} hours.\n",
+                f"\nTo see Flask development logs, check your terminal output.\n",
+            )]
         else:
+            # opened here so errors are still reported before the response starts
             reader = JournalReader()
             reader.open(JournalOpenMode.SYSTEM)
             reader.add_filter(Rule("_SYSTEMD_UNIT", "inkypi.service"))
             reader.seek_realtime_usec(int(since.timestamp() * 1_000_000))
+            records = (format_journal_record(record) for record in reader)
 
-            for record in reader:
-                try:
-                    ts = datetime.fromtimestamp(record.get_realtime_usec() / 1_000_000)
-                    formatted_ts = ts.strftime("%b %d %H:%M:%S")
-                except Exception:
-                    formatted_ts = "??? ?? ??:??:??"
-
-                data = record.data
-                hostname = data.get("_HOSTNAME", "unknown-host")
-                identifier = data.get("SYSLOG_IDENTIFIER") or data.get("_COMM", "?")
-                pid = data.get("_PID", "?")
-                msg = data.get("MESSAGE", "").rstrip()
-
-                # Format the log entry similar to the journalctl default output
-                buffer.write(f"{formatted_ts} {hostname} {identifier}[{pid}]: {msg}\n")
+        # records are read, filtered and sent one chunk at a time
+        lines = filter_log_lines(records, level=level, logger_name=request.args.get('logger'),
+                                 text=request.args.get('q'), limit=limit)
+        body = iter_chunks(lines)
 
-        buffer.seek(0)
         # Add date and time to the filename
         now_str = datetime.now().strftime("%Y%m%d-%H%M%S")
         filename = f"inkypi_{now_str}.log"
+        mimetype = "text/plain"
+        if compress:
+            body = gzip_chunks(body)
+            filename += ".gz"
+            mimetype = "application/gzip"
         return Response(
-            buffer.read(),
-            mimetype="text/plain",
+            stream_with_context(body),
+            mimetype=mimetype,
             headers={"Content-Disposition": f"attachment; filename={filename}"}
         )
 
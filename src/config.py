@@ -19,6 +19,9 @@ class Config:
     # Directory path for storing plugin instance images
     plugin_image_dir = os.path.join(BASE_DIR, "static", "images", "plugins")
 
+    # Cached plugin-info.json contents, rebuilt when any plugin-info.json changes
+    plugin_manifest_file = os.path.join(BASE_DIR, "cache", "plugin_manifest.json")
+
     def __init__(self):
         self.config = self.read_config()
         self.plugins_list = self.read_plugins_list()
@@ -36,21 +39,67 @@ class Config:
         return config
 
     def read_plugins_list(self):
-        """Reads the plugin-info.json config JSON from each plugin folder. Excludes the base plugin."""
-        # Iterate over all plugin folders
+        """Reads the plugin-info.json config JSON from each plugin folder. Excludes the base plugin.
+
+        The parsed list is cached in a manifest file keyed by the modification time and
+        size of every plugin-info.json, so unchanged plugins are not re-read on startup.
+        """
+        plugin_info_files = self.get_plugin_info_files()
+        fingerprint = []
+        for plugin_info_file in plugin_info_files:
+            stat = os.stat(plugin_info_file)
+            fingerprint.append([os.path.relpath(plugin_info_file, self.BASE_DIR), stat.st_mtime_ns, stat.st_size])
+
+        plugins_list = self.read_plugin_manifest(fingerprint)
+        if plugins_list is not None:
+            logger.debug(f"Loaded {len(plugins_list)} plugins from manifest {self.plugin_manifest_file}")
+            return plugins_list
+
         plugins_list = []
+        for plugin_info_file in plugin_info_files:
+            logger.debug(f"Reading plugin info from {plugin_info_file}")
+            with open(plugin_info_file) as f:
+                plugin_info = json.load(f)
+            plugins_list.append(plugin_info)
+
+        self.write_plugin_manifest(fingerprint, plugins_list)
+        return plugins_list
+
+    def get_plugin_info_files(self):
+        """Returns the plugin-info.json path of each plugin folder, sorted by plugin folder."""
+        plugin_info_files = []
         for plugin in sorted(os.listdir(os.path.join(self.BASE_DIR, "plugins"))):
             plugin_path = os.path.join(self.BASE_DIR, "plugins", plugin)
             if os.path.isdir(plugin_path) and plugin != "__pycache__":
                 # Check if the plugin-info.json file exists
                 plugin_info_file = os.path.join(plugin_path, "plugin-info.json")
                 if os.path.isfile(plugin_info_file):
-                    logger.debug(f"Reading plugin info from {plugin_info_file}")
-                    with open(plugin_info_file) as f:
-                        plugin_info = json.load(f)
-                    plugins_list.append(plugin_info)
-
-        return plugins_list
+                    plugin_info_files.append(plugin_info_file)
+        return plugin_info_files
+
+    def read_plugin_manifest(self, fingerprint):
+        """Returns the cached plugins list if the manifest matches the fingerprint, None otherwise."""
+        try:
+            with open(self.plugin_manifest_file) as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if manifest.get("fingerprint") != fingerprint:
+            logger.info("Plugin manifest is outdated, re-reading plugin info files")
+            return None
+        return manifest.get("plugins")
+
+    def write_plugin_manifest(self, fingerprint, plugins_list):
+        """Writes the plugins list manifest. Failures are logged, the manifest is only a cache."""
+        try:
+            os.makedirs(os.path.dirname(self.plugin_manifest_file), exist_ok=True)
+            tmp_file = f"{self.plugin_manifest_file}.tmp"
+            with open(tmp_file, 'w') as f:
+                json.dump({"fingerprint": fingerprint, "plugins": plugins_list}, f)
+            os.replace(tmp_file, self.plugin_manifest_file)
+        except OSError as e:
+            logger.warning(f"Could not write plugin manifest {self.plugin_manifest_file}: {e}")
 
     def write_config(self):
         """Updates the cached config from the model objects and writes to the config file."""
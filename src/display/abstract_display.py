@@ -3,7 +3,8 @@ class AbstractDisplay:
     Abstract base class for all display devices.
 
     This class defines methods that subclasses are required to implement for
-    initialization and to display images on a screen.  
+    initialization and to display images on a screen: prepare_image converts an
+    image into the panel native frame and show_prepared sends a frame to the panel.
 
     These implementations will be device specific.
     """
@@ -32,14 +33,39 @@ class AbstractDisplay:
 
     def display_image(self, image, image_settings=[]):
         """
-        Abstract method to display an image on the screen.  Implementations of this
-        method should handle the device specific operations.
+        Displays an image on the screen by preparing the panel frame and showing it.
 
         Args:
             image (PIL.Image): The image to be displayed.
             image_settings (list, optional): List of settings to modify how the image is displayed.
+        """
+        self.show_prepared(self.prepare_image(image, image_settings), image_settings)
+
+    def prepare_image(self, image, image_settings=[]):
+        """
+        Converts a processed image into the panel native frame, e.g. quantized and packed
+        buffers. The display manager caches frames and shows them again with show_prepared
+        when the same image is displayed, so showing a frame must not modify it.
+
+        Args:
+            image (PIL.Image): The processed image, oriented and resized to the panel.
+            image_settings (list, optional): List of settings to modify how the image is displayed.
+
+        Returns:
+            The frame, the image itself for devices without a native format.
+        """
+        return image
+
+    def show_prepared(self, frame, image_settings=[]):
+        """
+        Abstract method to send a frame returned by prepare_image to the screen.
+        Implementations of this method should handle the device specific operations.
+
+        Args:
+            frame: The frame returned by prepare_image.
+            image_settings (list, optional): List of settings to modify how the image is displayed.
 
         Raises:
             NotImplementedError: If not implemented in a subclass.
         """
-        raise NotImplementedError("Method 'display_image(...) must be provided in a subclass.")
+        raise NotImplementedError("Method 'show_prepared(...) must be provided in a subclass.")
@@ -1,12 +1,19 @@
 import fnmatch
 import json
 import logging
+from collections import OrderedDict
 
+from PIL import Image
 from utils.image_utils import resize_image, change_orientation, apply_image_enhancement
+from utils.image_writer import get_image_writer
+from display.abstract_display import AbstractDisplay
 from display.mock_display import MockDisplay
 
 logger = logging.getLogger(__name__)
 
+# Panel frames kept for images displayed again, e.g. when a playlist cycles back
+PANEL_FRAME_CACHE_SIZE = 8
+
 # Try to import hardware displays, but don't fail if they're not available
 try:
     from display.inky_display import InkyDisplay
@@ -54,14 +61,21 @@ class DisplayManager:
         else:
             raise ValueError(f"Unsupported display type: {display_type}")
 
-    def display_image(self, image, image_settings=[]):
+        # panel native frames by image hash and display settings, least recently shown first
+        self.frames = OrderedDict()
+
+    def display_image(self, image, image_settings=[], image_hash=None):
         
         """
         Delegates image rendering to the appropriate display instance.
 
+        The processed frame of an image is cached by its hash, displaying the same image
+        again with the same settings sends the cached frame to the panel right away.
+
         Args:
             image (PIL.Image): The image to be displayed.
             image_settings (list, optional): List of settings to modify image rendering.
+            image_hash (str, optional): Hash of the image, enables the frame cache.
 
         Raises:
             ValueError: If no valid display instance is found.
@@ -70,15 +84,50 @@ class DisplayManager:
         if not hasattr(self, "display"):
             raise ValueError("No valid display instance initialized.")
         
-        # Save the image
+        # Save the image, written in the background while the display updates
         logger.info(f"Saving image to {self.device_config.current_image_file}")
-        image.save(self.device_config.current_image_file)
+        get_image_writer().write(image, self.device_config.current_image_file)
 
-        # Resize and adjust orientation
+        frame_key = self.get_frame_key(image_hash, image_settings)
+        frame = self.frames.get(frame_key) if frame_key else None
+        if frame is not None:
+            logger.info("Image already prepared for the panel, showing cached frame")
+            self.frames.move_to_end(frame_key)
+            self.display.show_prepared(frame, image_settings)
+            return
+
+        # Resize and adjust orientation, steps that would not change the image are skipped
         image = change_orientation(image, self.device_config.get_config("orientation"))
         image = resize_image(image, self.device_config.get_resolution(), image_settings)
-        if self.device_config.get_config("inverted_image"): image = image.rotate(180)
+        if self.device_config.get_config("inverted_image"): image = image.transpose(Image.Transpose.ROTATE_180)
         image = apply_image_enhancement(image, self.device_config.get_config("image_settings"))
 
-        # Pass to the concrete instance to render to the device.
-        self.display.display_image(image, image_settings)
\ No newline at end of file
+        if not frame_key:
+            # Pass to the concrete instance to render to the device.
+            self.display.display_image(image, image_settings)
+            return
+
+        frame = self.display.prepare_image(image, image_settings)
+        self.frames[frame_key] = frame
+        while len(self.frames) > PANEL_FRAME_CACHE_SIZE:
+            self.frames.popitem(last=False)
+        self.display.show_prepared(frame, image_settings)
+
+    def get_frame_key(self, image_hash, image_settings=[]):
+        """
+        Returns the frame cache key of an image, everything the panel frame depends on.
+
+        Returns None if the image hash is unknown or the display does not support
+        prepared frames.
+        """
+        if not image_hash or type(self.display).show_prepared is AbstractDisplay.show_prepared:
+            return None
+        return (
+            image_hash,
+            json.dumps(image_settings, sort_keys=True),
+            self.device_config.get_config("display_type"),
+            self.device_config.get_config("orientation"),
+            bool(self.device_config.get_config("inverted_image")),
+            tuple(self.device_config.get_resolution()),
+            json.dumps(self.device_config.get_config("image_settings"), sort_keys=True),
+        )
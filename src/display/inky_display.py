@@ -37,13 +37,14 @@ class InkyDisplay(AbstractDisplay):
                 [int(self.inky_display.width), int(self.inky_display.height)], 
                 write=True)
 
-    def display_image(self, image, image_settings=[]):
+    def prepare_image(self, image, image_settings=[]):
         
         """
-        Displays the provided image on the Inky display.
+        Converts the image into the Inky display buffer.
 
         The image has been processed by adjusting orientation and resizing 
-        before being sent to the display.
+        before being sent to the display. The driver quantizes it to the panel
+        palette, the resulting buffer is returned as the frame.
 
         Args:
             image (PIL.Image): The image to be displayed.
@@ -53,12 +54,25 @@ class InkyDisplay(AbstractDisplay):
             ValueError: If no image is provided.
         """
 
-        logger.info("Displaying image to Inky display.")
         if not image:
             raise ValueError(f"No image provided.")
 
-        # Display the image on the Inky display
         inky_saturation = self.device_config.get_config('image_settings').get("inky_saturation", 0.5)
         logger.info(f"Inky Saturation: {inky_saturation}")
         self.inky_display.set_image(image, saturation=inky_saturation)
-        self.inky_display.show()
\ No newline at end of file
+        return self.inky_display.buf.copy()
+
+    def show_prepared(self, frame, image_settings=[]):
+
+        """
+        Displays a prepared buffer on the Inky display.
+
+        Args:
+            frame: Display buffer returned by prepare_image.
+            image_settings (list, optional): Additional settings to modify image rendering.
+        """
+
+        logger.info("Displaying image to Inky display.")
+        # copied, cached frames are shown again
+        self.inky_display.buf = frame.copy()
+        self.inky_display.show()
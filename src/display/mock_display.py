@@ -2,6 +2,7 @@ import os
 import logging
 from datetime import datetime
 from .abstract_display import AbstractDisplay
+from utils.image_writer import get_image_writer
 
 logger = logging.getLogger(__name__)
 
@@ -20,10 +21,8 @@ class MockDisplay(AbstractDisplay):
         """Initialize mock display (no-op for development)."""
         logger.info(f"Mock display initialized: {self.width}x{self.height}")
         
-    def display_image(self, image, image_settings=[]):
+    def show_prepared(self, image, image_settings=[]):
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filepath = os.path.join(self.output_dir, f"display_{timestamp}.png")
-        image.save(filepath, "PNG")
-        
-        # Also save as latest.png for convenience
-        image.save(os.path.join(self.output_dir, 'latest.png'), "PNG")
\ No newline at end of file
+        # Also save as latest.png for convenience, the image is encoded once in the background
+        get_image_writer().write(image, [filepath, os.path.join(self.output_dir, 'latest.png')])
\ No newline at end of file
@@ -100,26 +100,47 @@ class WaveshareDisplay(AbstractDisplay):
                 write=True)
 
 
-    def display_image(self, image, image_settings=[]):
+    def prepare_image(self, image, image_settings=[]):
         
         """
-        Displays an image on the Waveshare display.
+        Converts an image into the buffers of the Waveshare display.
 
-        The image has been processed by adjusting orientation, resizing, and converting it
-        into the buffer format required for e-paper rendering.
+        The image has been processed by adjusting orientation and resizing, it is
+        converted into the buffer format required for e-paper rendering, split into
+        black and red layers for bi-color displays.
 
         Args:
             image (PIL.Image): The image to be displayed.
             image_settings (list, optional): Additional settings to modify image rendering.
 
+        Returns:
+            tuple: The buffers passed to the driver's display method.
+
         Raises:
             ValueError: If no image is provided.
         """
 
-        logger.info("Displaying image to Waveshare display.")
         if not image:
             raise ValueError(f"No image provided.")
 
+        if not self.bi_color_display:
+            return (self.epd_display.getbuffer(image),)
+
+        black_layer, red_layer = split_image_for_bi_color_epd(image)
+        return (self.epd_display.getbuffer(black_layer), self.epd_display.getbuffer(red_layer))
+
+    def show_prepared(self, frame, image_settings=[]):
+
+        """
+        Displays prepared buffers on the Waveshare display.
+
+        Args:
+            frame (tuple): Buffers returned by prepare_image.
+            image_settings (list, optional): Additional settings to modify image rendering.
+        """
+
+        logger.info("Displaying image to Waveshare display.")
+
         # Assume device was in sleep mode.
         self.epd_display_init()
 
@@ -127,15 +148,7 @@ class WaveshareDisplay(AbstractDisplay):
         self.epd_display.Clear()
 
         # Display the image on the WS display.
-        if not self.bi_color_display:
-            self.epd_display.display(self.epd_display.getbuffer(image))
-        else:
-            black_layer, red_layer = split_image_for_bi_color_epd(image)
-
-            self.epd_display.display(
-                self.epd_display.getbuffer(black_layer),
-                self.epd_display.getbuffer(red_layer),
-            )
+        self.epd_display.display(*frame)
 
         # Put device into low power mode (EPD displays maintain image when powered off)
         logger.info("Putting Waveshare display into sleep mode for power saving.")
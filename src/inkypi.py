@@ -19,7 +19,10 @@ import json
 import logging
 import threading
 import argparse
-from utils.app_utils import generate_startup_image
+from utils.app_utils import generate_startup_image, preload_fonts
+from utils.image_backend import set_image_backend
+from utils.image_writer import configure_image_writer
+from utils.event_stream import MAX_SUBSCRIBERS
 from flask import Flask, request, send_from_directory
 from werkzeug.serving import is_running_from_reloader
 from config import Config
@@ -31,7 +34,7 @@ from blueprints.plugin import plugin_bp
 from blueprints.playlist import playlist_bp
 from blueprints.apikeys import apikeys_bp
 from jinja2 import ChoiceLoader, FileSystemLoader
-from plugins.plugin_registry import load_plugins
+from plugins.plugin_registry import load_plugins, warm_up_plugins
 from waitress import serve
 
 
@@ -61,6 +64,9 @@ template_dirs = [
 app.jinja_loader = ChoiceLoader([FileSystemLoader(directory) for directory in template_dirs])
 
 device_config = Config()
+set_image_backend(device_config.get_config("image_backend", default="pillow"))
+configure_image_writer(device_config.get_config("image_compress_level", default=1))
+preload_fonts()
 display_manager = DisplayManager(device_config)
 refresh_task = RefreshTask(device_config, display_manager)
 
@@ -112,6 +118,12 @@ if __name__ == '__main__':
             except:
                 pass  # Ignore if we can't get the IP
 
-        serve(app, host="0.0.0.0", port=PORT, threads=1)
+        # optionally import plugins in the background once the server is accepting requests,
+        # otherwise each plugin is loaded on first use
+        if device_config.get_config("plugin_warmup", default=False):
+            warm_up_plugins(delay=10)
+
+        # one thread for regular requests plus one per open event stream
+        serve(app, host="0.0.0.0", port=PORT, threads=1 + MAX_SUBSCRIBERS)
     finally:
         refresh_task.stop()
@@ -279,14 +279,21 @@ class PluginInstance:
         settings (dict): Settings associated with the plugin.
         refresh (dict): Refresh settings, such as interval and scheduled time.
         latest_refresh (str): ISO-formatted string representing the last refresh time.
+        input_key (str): Fingerprint of the inputs the latest image was generated from, if the plugin provides one.
+        image_hash (str): Hash of the latest generated image.
+        next_change_time (str): ISO-formatted time the latest image goes stale, if the plugin provides one.
     """
 
-    def __init__(self, plugin_id, name, settings, refresh, latest_refresh_time=None):
+    def __init__(self, plugin_id, name, settings, refresh, latest_refresh_time=None, input_key=None, image_hash=None,
+                 next_change_time=None):
         self.plugin_id = plugin_id
         self.name = name
         self.settings = settings
         self.refresh = refresh
         self.latest_refresh_time = latest_refresh_time
+        self.input_key = input_key
+        self.image_hash = image_hash
+        self.next_change_time = next_change_time
 
     def update(self, updated_data):
         """Update attributes of the class with the dictionary values."""
@@ -294,11 +301,19 @@ class PluginInstance:
             setattr(self, key, value)
 
     def should_refresh(self, current_time):
-        """Checks whether the plugin should be refreshed based on its refresh settings and the current time."""
+        """Checks whether the plugin should be refreshed based on its refresh settings and the current time.
+
+        While the plugin's next change time is ahead, the latest image is still current and is
+        not regenerated, even once the interval or scheduled time has passed.
+        """
         latest_refresh_dt = self.get_latest_refresh_dt()
         if not latest_refresh_dt:
             return True
 
+        next_change_dt = self.get_next_change_dt()
+        if next_change_dt and current_time < next_change_dt:
+            return False
+
         # Check for interval-based refresh
         if "interval" in self.refresh:
             interval = self.refresh.get("interval")
@@ -338,6 +353,25 @@ class PluginInstance:
         if self.latest_refresh_time:
             latest_refresh = datetime.fromisoformat(self.latest_refresh_time)
         return latest_refresh
+
+    def get_next_change_dt(self):
+        """Returns the time the latest image goes stale as a datetime object, or None if not known."""
+        next_change = None
+        if self.next_change_time:
+            next_change = datetime.fromisoformat(self.next_change_time)
+        return next_change
+
+    def get_stale_dt(self):
+        """Returns when the displayed image should be refreshed, or None if only the playlist cycle applies.
+
+        The first time the interval is due and the content has changed, the later of the two.
+        """
+        next_change_dt = self.get_next_change_dt()
+        latest_refresh_dt = self.get_latest_refresh_dt()
+        interval = self.refresh.get("interval")
+        if not next_change_dt or not latest_refresh_dt or not interval:
+            return None
+        return max(next_change_dt, latest_refresh_dt + timedelta(seconds=interval))
     
     def to_dict(self):
         return {
@@ -346,6 +380,9 @@ class PluginInstance:
             "plugin_settings": self.settings,
             "refresh": self.refresh,
             "latest_refresh_time": self.latest_refresh_time,
+            "input_key": self.input_key,
+            "image_hash": self.image_hash,
+            "next_change_time": self.next_change_time,
         }
 
     @classmethod
@@ -356,4 +393,7 @@ class PluginInstance:
             settings=data["plugin_settings"],
             refresh=data["refresh"],
             latest_refresh_time=data.get("latest_refresh_time"),
+            input_key=data.get("input_key"),
+            image_hash=data.get("image_hash"),
+            next_change_time=data.get("next_change_time"),
         )
\ No newline at end of file
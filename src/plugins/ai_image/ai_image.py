@@ -3,12 +3,14 @@ from openai import OpenAI
 from PIL import Image
 from io import BytesIO
 import base64
-from utils.http_client import get_http_session
+from utils.image_loader import ImageVariant, covers
 import logging
 
 logger = logging.getLogger(__name__)
 
 IMAGE_MODELS = ["dall-e-3", "dall-e-2", "gpt-image-1"]
+# Square sizes supported by dall-e-2, smallest first
+DALL_E_2_SIZES = [(256, 256), (512, 512), (1024, 1024)]
 DEFAULT_IMAGE_MODEL = "dall-e-3"
 DEFAULT_IMAGE_QUALITY = "standard"
 
@@ -40,6 +42,9 @@ class AIImage(BasePlugin):
         image_quality = settings.get('quality', "medium" if image_model == "gpt-image-1" else "standard")
         randomize_prompt = settings.get('randomizePrompt') == 'true'
         orientation = device_config.get_config("orientation")
+        dimensions = device_config.get_resolution()
+        if orientation == "vertical":
+            dimensions = dimensions[::-1]
 
         logger.info(f"Settings: model={image_model}, quality={image_quality}, orientation={orientation}")
         logger.debug(f"Original prompt: '{text_prompt}'")
@@ -60,7 +65,8 @@ class AIImage(BasePlugin):
                 text_prompt,
                 model=image_model,
                 quality=image_quality,
-                orientation=orientation
+                orientation=orientation,
+                dimensions=dimensions
             )
 
             if image:
@@ -73,7 +79,7 @@ class AIImage(BasePlugin):
         logger.info("=== AI Image Plugin: Image generation complete ===")
         return image
 
-    def fetch_image(self, ai_client, prompt, model="dall-e-3", quality="standard", orientation="horizontal"):
+    def fetch_image(self, ai_client, prompt, model="dall-e-3", quality="standard", orientation="horizontal", dimensions=(800, 480)):
         """
         Fetch image from OpenAI API. Now an instance method to access image_loader.
         """
@@ -87,10 +93,12 @@ class AIImage(BasePlugin):
             "and visual appeal. Avoid excessive detail or complex gradients, ensuring "
             "the design works well with flat, vibrant colors."
         )
+        # dall-e-2 only generates squares, request the smallest one covering the display
+        size = next((size for size in DALL_E_2_SIZES if covers(size, dimensions)), DALL_E_2_SIZES[-1])
         args = {
             "model": model,
             "prompt": prompt,
-            "size": "1024x1024",
+            "size": f"{size[0]}x{size[1]}",
         }
         if model == "dall-e-3":
             args["size"] = "1792x1024" if orientation == "horizontal" else "1024x1792"
@@ -102,11 +110,12 @@ class AIImage(BasePlugin):
         response = ai_client.images.generate(**args)
         if model in ["dall-e-3", "dall-e-2"]:
             image_url = response.data[0].url
+            width, height = (int(value) for value in args["size"].split("x"))
             # Use adaptive loader for memory-efficient processing
             # AI images are pre-sized, but still benefit from optimized loading
-            session = get_http_session()
-            response = session.get(image_url)
-            img = Image.open(BytesIO(response.content))
+            img = self.image_loader.from_variants([ImageVariant(image_url, width, height)], dimensions, resize=False)
+            if img is None:
+                raise RuntimeError("Failed to download generated image.")
         elif model == "gpt-image-1":
             image_base64 = response.data[0].b64_json
             image_bytes = base64.b64decode(image_base64)
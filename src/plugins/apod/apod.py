@@ -9,12 +9,17 @@ from plugins.base_plugin.base_plugin import BasePlugin
 from PIL import Image
 from io import BytesIO
 from utils.http_client import get_http_session
+from utils.image_loader import ImageVariant
 import logging
 from random import randint
 from datetime import datetime, timedelta
+import pytz
 
 logger = logging.getLogger(__name__)
 
+# NASA publishes a new picture at midnight US Eastern time
+APOD_TIMEZONE = "America/New_York"
+
 class Apod(BasePlugin):
     def generate_settings_template(self):
         template_params = super().generate_settings_template()
@@ -26,6 +31,13 @@ class Apod(BasePlugin):
         template_params['style_settings'] = False
         return template_params
 
+    def compute_input_key(self, settings, device_config, now):
+        if settings.get("randomizeApod") == "true":
+            return None
+        if settings.get("customDate"):
+            return settings["customDate"]
+        return datetime.now(pytz.timezone(APOD_TIMEZONE)).date().isoformat()
+
     def generate_image(self, settings, device_config):
         logger.info("=== APOD Plugin: Starting image generation ===")
 
@@ -65,9 +77,12 @@ class Apod(BasePlugin):
             logger.warning(f"APOD media type is '{data.get('media_type')}', not 'image'")
             raise RuntimeError("APOD is not an image today.")
 
-        image_url = data.get("hdurl") or data.get("url")
-        logger.info(f"APOD image URL: {image_url}")
-        logger.debug(f"Using {'HD URL' if data.get('hdurl') else 'standard URL'}")
+        # The standard image is used when it is large enough for the display, otherwise the HD image
+        image_urls = [url for url in (data.get("url"), data.get("hdurl")) if url]
+        if not image_urls:
+            logger.error("APOD response does not contain an image URL")
+            raise RuntimeError("Failed to retrieve NASA APOD.")
+        logger.info(f"APOD image URLs: {image_urls}")
 
         # Get target dimensions
         dimensions = device_config.get_resolution()
@@ -75,8 +90,10 @@ class Apod(BasePlugin):
             dimensions = dimensions[::-1]
             logger.debug(f"Vertical orientation detected, dimensions: {dimensions[0]}x{dimensions[1]}")
 
+        variants = [ImageVariant(url) for url in dict.fromkeys(image_urls)]
+
         # Use adaptive image loader for memory-efficient processing
-        image = self.image_loader.from_url(image_url, dimensions, timeout_ms=40000)
+        image = self.image_loader.from_variants(variants, dimensions, timeout_ms=40000)
 
         if not image:
             logger.error("Failed to load APOD image")
@@ -1,12 +1,15 @@
 import logging
 import os
-from utils.app_utils import resolve_path, get_fonts
+from utils.app_utils import resolve_path, get_fonts, get_cache_dir
 from utils.image_utils import take_screenshot_html
 from utils.image_loader import AdaptiveImageLoader
-from jinja2 import Environment, FileSystemLoader, select_autoescape
+from utils.asset_cache import localize_remote_assets
+from utils.asset_bundle import get_style_bundle
+from jinja2 import Environment, FileSystemLoader, FileSystemBytecodeCache, ChoiceLoader, PrefixLoader, select_autoescape
 from pathlib import Path
 import asyncio
 import base64
+import threading
 
 logger = logging.getLogger(__name__)
 
@@ -14,6 +17,34 @@ STATIC_DIR = resolve_path("static")
 PLUGINS_DIR = resolve_path("plugins")
 BASE_PLUGIN_DIR =  os.path.join(PLUGINS_DIR, "base_plugin")
 BASE_PLUGIN_RENDER_DIR = os.path.join(BASE_PLUGIN_DIR, "render")
+BASE_PLUGIN_CSS = os.path.join(BASE_PLUGIN_RENDER_DIR, "plugin.css")
+
+# Font faces passed to every render, the font files do not change at runtime
+FONT_FACES = get_fonts()
+
+# Shared jinja2 environment for plugin renders, each plugin's render directory is
+# mounted under its plugin id and templates fall back to the base plugin render directory
+_plugin_render_loaders = {}
+_render_env = None
+_render_env_lock = threading.Lock()
+
+def get_render_environment(plugin_id=None, render_dir=None):
+    """Returns the shared render environment, registering the plugin's render directory if given."""
+    global _render_env
+    with _render_env_lock:
+        if _render_env is None:
+            _render_env = Environment(
+                loader=ChoiceLoader([
+                    PrefixLoader(_plugin_render_loaders),
+                    FileSystemLoader(BASE_PLUGIN_RENDER_DIR)
+                ]),
+                autoescape=select_autoescape(['html', 'xml']),
+                # compiled templates are kept on disk so they are not recompiled in every process
+                bytecode_cache=FileSystemBytecodeCache(get_cache_dir("jinja"))
+            )
+        if plugin_id and render_dir:
+            _plugin_render_loaders[plugin_id] = FileSystemLoader(render_dir)
+        return _render_env
 
 FRAME_STYLES = [
     {
@@ -40,20 +71,55 @@ class BasePlugin:
         self.config = config
 
         # Initialize adaptive image loader for device-aware image processing
-        self.image_loader = AdaptiveImageLoader()
+        self.image_loader = AdaptiveImageLoader(plugin_id=config.get("id"))
 
         self.render_dir = self.get_plugin_dir("render")
         if os.path.exists(self.render_dir):
-            # instantiate jinja2 env with base plugin and current plugin render directories
-            loader = FileSystemLoader([self.render_dir, BASE_PLUGIN_RENDER_DIR])
-            self.env = Environment(
-                loader=loader,
-                autoescape=select_autoescape(['html', 'xml'])
-            )
+            # register the plugin render directory in the shared jinja2 env
+            self.env = get_render_environment(self.get_plugin_id(), self.render_dir)
+
+        # stylesheet lists by plugin css file, built on first render
+        self._style_sheets = {}
 
     def generate_image(self, settings, device_config):
         raise NotImplementedError("generate_image must be implemented by subclasses")
 
+    def compute_input_key(self, settings, device_config, now):
+        """Optional hook returning a cheap fingerprint of the inputs the next image depends on.
+
+        Playlist refreshes reuse the latest image of a plugin instance, skipping generate_image,
+        while the key is unchanged. The instance settings and the device resolution, orientation,
+        timezone and time format are already part of the fingerprint, so plugins only return what
+        else changes the image, e.g. the current date or the id of the latest feed entry.
+
+        Args:
+            settings: The plugin instance's settings dict
+            device_config: The device configuration
+            now: Current datetime in the device timezone
+
+        Returns:
+            A JSON serializable value, or None if the image must always be regenerated (default).
+        """
+        return None
+
+    def next_change_time(self, settings, now):
+        """Optional hook returning when the image generated now will next differ.
+
+        Only for plugins whose image depends on nothing but the time and the instance settings,
+        which know this exactly (the next minute, midnight). Until then the instance is not
+        regenerated, even when its interval is due. While it is displayed, the display wakes
+        up at the first change after its interval is due, the hint never refreshes an instance
+        more often than its interval.
+
+        Args:
+            settings: The plugin instance's settings dict
+            now: Current datetime in the device timezone
+
+        Returns:
+            A timezone aware datetime, or None if only the refresh interval applies (default).
+        """
+        return None
+
     def cleanup(self, settings):
         """Optional cleanup method that plugins can override to delete associated resources.
 
@@ -84,21 +150,32 @@ class BasePlugin:
         template_params['frame_styles'] = FRAME_STYLES
         return template_params
 
-    def render_image(self, dimensions, html_file, css_file=None, template_params={}):
+    def render_image(self, dimensions, html_file, css_file=None, template_params={}, asset_box=None):
+        """Renders a plugin template and screenshots it.
+
+        Remote images referenced by the page are downloaded into a local cache and
+        downsized to asset_box (the whole viewport by default) before the screenshot,
+        so the browser does not fetch anything.
+        """
         # load the base plugin and current plugin css files
-        css_files = [os.path.join(BASE_PLUGIN_RENDER_DIR, "plugin.css")]
-        if css_file:
-            plugin_css = os.path.join(self.render_dir, css_file)
-            css_files.append(plugin_css)
+        css_files = self._style_sheets.get(css_file)
+        if css_files is None:
+            css_files = [BASE_PLUGIN_CSS]
+            if css_file:
+                css_files.append(os.path.join(self.render_dir, css_file))
+            self._style_sheets[css_file] = css_files
 
         template_params["style_sheets"] = css_files
+        # stylesheets and the used fonts inlined in one minified block, rebuilt when a source changes
+        template_params["inline_style"] = get_style_bundle(self.get_plugin_id(), css_files, [self.render_dir])
         template_params["width"] = dimensions[0]
         template_params["height"] = dimensions[1]
-        template_params["font_faces"] = get_fonts()
+        template_params["font_faces"] = FONT_FACES
         template_params["static_dir"] = STATIC_DIR
 
-        # load and render the given html template
-        template = self.env.get_template(html_file)
+        # load and render the given html template from the plugin namespace
+        template = self.env.get_template(f"{self.get_plugin_id()}/{html_file}")
         rendered_html = template.render(template_params)
+        rendered_html = localize_remote_assets(rendered_html, asset_box or dimensions)
 
         return take_screenshot_html(rendered_html, dimensions)
@@ -2,12 +2,11 @@ import os
 from utils.app_utils import resolve_path, get_font
 from plugins.base_plugin.base_plugin import BasePlugin
 from plugins.calendar.constants import LOCALE_MAP, FONT_SIZES
+from plugins.calendar.layout import build_layout, supports_locale
+from plugins.calendar.ics_cache import get_ics_cache
 from PIL import Image, ImageColor, ImageDraw, ImageFont
-import icalendar
-import recurring_ical_events
 from io import BytesIO
 import logging
-import requests
 from datetime import datetime, timedelta
 import pytz
 
@@ -64,7 +63,15 @@ class Calendar(BasePlugin):
             "font_scale": FONT_SIZES.get(settings.get("fontSize", "normal"))
         }
 
-        image = self.render_image(dimensions, "calendar.html", "calendar.css", template_params)
+        if supports_locale(settings.get("language")):
+            # lay out the view in python and render static html, no javascript runs in the browser
+            template_params["layout"] = build_layout(
+                view, events, current_dt.replace(minute=0, second=0, microsecond=0), settings, time_format
+            )
+            image = self.render_image(dimensions, "calendar_static.html", "calendar_static.css", template_params)
+        else:
+            # locales other than english are formatted by FullCalendar
+            image = self.render_image(dimensions, "calendar.html", "calendar.css", template_params)
 
         if not image:
             raise RuntimeError("Failed to take screenshot, please check logs.")
@@ -73,9 +80,10 @@ class Calendar(BasePlugin):
     def fetch_ics_events(self, calendar_urls, colors, tz, start_range, end_range):
         parsed_events = []
 
+        ics_cache = get_ics_cache()
         for calendar_url, color in zip(calendar_urls, colors):
-            cal = self.fetch_calendar(calendar_url)
-            events = recurring_ical_events.of(cal).between(start_range, end_range)
+            # parsed calendars and expanded occurrences are reused until the feed changes
+            events = ics_cache.between(calendar_url, start_range, end_range, tz)
             contrast_color = self.get_contrast_color(color)
 
             for event in events:
@@ -137,17 +145,6 @@ class Calendar(BasePlugin):
             end = (dtstart + duration).isoformat()
         return start, end, all_day
 
-    def fetch_calendar(self, calendar_url):
-        # workaround for webcal urls
-        if calendar_url.startswith("webcal://"):
-            calendar_url = calendar_url.replace("webcal://", "https://")
-        try:
-            response = requests.get(calendar_url, timeout=30)
-            response.raise_for_status()
-            return icalendar.Calendar.from_ical(response.text)
-        except Exception as e:
-            raise RuntimeError(f"Failed to fetch iCalendar url: {str(e)}")
-
     def get_contrast_color(self, color):
         """
         Returns '#000000' (black) or '#ffffff' (white) depending on the contrast
@@ -0,0 +1,238 @@
+"""
+Incremental cache of iCalendar feeds for the calendar plugin.
+
+Every refresh used to download each calendar, parse it with icalendar and
+expand recurrences with recurring_ical_events, which takes seconds for large
+shared calendars with years of history. The cache keeps, per URL:
+
+- the ETag / Last-Modified validators, so unchanged feeds are answered by a
+  304 from the server without a body
+- a hash of the last body, so servers without validators still skip parsing
+  when the content did not change
+- the parsed calendar and an index of occurrences expanded for a window
+  around the requested range. The window grows only by the missing days as
+  time moves on and old occurrences are dropped, so most refreshes are served
+  from the index without expanding recurrences at all.
+"""
+
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+import icalendar
+import recurring_ical_events
+
+from utils.http_client import get_http_session
+
+logger = logging.getLogger(__name__)
+
+MAX_CALENDARS = 16
+# Expand this far past the requested end, so the following refreshes hit the index
+EXPAND_AHEAD = timedelta(days=35)
+# Occurrences ending this long before the requested start are dropped from the index
+KEEP_BEHIND = timedelta(days=7)
+REQUEST_TIMEOUT = 30
+
+
+def _as_datetime(value, tz):
+    """Converts an occurrence or range boundary to an aware datetime in tz."""
+    if isinstance(value, datetime):
+        return tz.localize(value) if value.tzinfo is None else value
+    return tz.localize(datetime(value.year, value.month, value.day))
+
+
+class Occurrence:
+    """One expanded event with its bounds as timestamps for range queries."""
+
+    __slots__ = ("event", "key", "start", "end")
+
+    def __init__(self, event, tz):
+        self.event = event
+        dtstart = event.decoded("dtstart")
+        if "dtend" in event:
+            dtend = event.decoded("dtend")
+        elif "duration" in event:
+            dtend = dtstart + event.decoded("duration")
+        elif isinstance(dtstart, datetime):
+            dtend = dtstart
+        else:
+            dtend = dtstart + timedelta(days=1)
+        self.start = _as_datetime(dtstart, tz).timestamp()
+        self.end = _as_datetime(dtend, tz).timestamp()
+        self.key = Occurrence.get_key(event, dtstart)
+
+    @staticmethod
+    def get_key(event, dtstart):
+        """Identity of an occurrence, the same occurrence expanded for overlapping windows is indexed once."""
+        uid = event.get("uid")
+        if uid:
+            recurrence_id = event.decoded("recurrence-id") if "recurrence-id" in event else dtstart
+            return str(uid), recurrence_id.isoformat()
+        # without a UID only the content tells events apart
+        return None, dtstart.isoformat(), hashlib.sha256(event.to_ical()).hexdigest()
+
+    def overlaps(self, start, end):
+        if self.start == self.end:
+            return start <= self.start < end
+        return self.start < end and self.end > start
+
+
+class CachedCalendar:
+    """Parsed state of one calendar URL."""
+
+    def __init__(self, url):
+        self.url = url
+        self.lock = threading.Lock()
+        self.etag = None
+        self.last_modified = None
+        self.body_hash = None
+        self.calendar = None
+        self.reset_index()
+
+    def reset_index(self, tz=None):
+        self.tz = tz
+        self.occurrences = {}
+        self.window_start = None
+        self.window_end = None
+
+    def update(self, response):
+        """Takes a 200 response, parsing the body only when it changed.
+
+        Returns:
+            bool: True if the calendar was parsed again.
+        """
+        self.etag = response.headers.get("ETag")
+        self.last_modified = response.headers.get("Last-Modified")
+
+        body_hash = hashlib.sha256(response.content).hexdigest()
+        if self.calendar is not None and body_hash == self.body_hash:
+            return False
+
+        self.calendar = icalendar.Calendar.from_ical(response.content)
+        self.body_hash = body_hash
+        self.reset_index(self.tz)
+        return True
+
+    def expand(self, start, end):
+        """Adds the occurrences between start and end to the index."""
+        added = 0
+        for event in recurring_ical_events.of(self.calendar).between(start, end):
+            occurrence = Occurrence(event, self.tz)
+            if occurrence.key not in self.occurrences:
+                self.occurrences[occurrence.key] = occurrence
+                added += 1
+        logger.debug(f"Expanded {added} occurrences for {start} - {end} of {self.url}")
+
+    def between(self, start, end, tz):
+        """Returns the events overlapping [start, end), extending the index as needed."""
+        start = _as_datetime(start, tz)
+        end = _as_datetime(end, tz)
+        if self.tz is None or self.tz.zone != tz.zone:
+            self.reset_index(tz)
+
+        if self.window_start is None or start < self.window_start or end > self.window_end:
+            if self.window_start is None or end <= self.window_start or start >= self.window_end:
+                # no overlap with the indexed window, start over
+                self.reset_index(tz)
+                self.expand(start, end + EXPAND_AHEAD)
+                self.window_start, self.window_end = start, end + EXPAND_AHEAD
+            else:
+                if start < self.window_start:
+                    self.expand(start, self.window_start)
+                    self.window_start = start
+                if end > self.window_end:
+                    self.expand(self.window_end, end + EXPAND_AHEAD)
+                    self.window_end = end + EXPAND_AHEAD
+
+        # slide the window forward, dropping occurrences that ended long ago
+        keep_after = start - KEEP_BEHIND
+        if keep_after > self.window_start:
+            cutoff = keep_after.timestamp()
+            self.occurrences = {key: item for key, item in self.occurrences.items() if item.end >= cutoff}
+            self.window_start = keep_after
+
+        start_ts, end_ts = start.timestamp(), end.timestamp()
+        matches = [item for item in self.occurrences.values() if item.overlaps(start_ts, end_ts)]
+        matches.sort(key=lambda item: item.start)
+        return [item.event for item in matches]
+
+
+class IcsCache:
+    """Bounded LRU of CachedCalendar by URL."""
+
+    def __init__(self, max_calendars=MAX_CALENDARS):
+        self.max_calendars = max_calendars
+        self._calendars = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get_state(self, url):
+        with self._lock:
+            state = self._calendars.get(url)
+            if state is None:
+                state = self._calendars[url] = CachedCalendar(url)
+            self._calendars.move_to_end(url)
+            while len(self._calendars) > self.max_calendars:
+                self._calendars.popitem(last=False)
+            return state
+
+    def fetch(self, state):
+        """Refreshes a calendar with a conditional GET.
+
+        Raises:
+            RuntimeError: If the calendar can't be downloaded or parsed.
+        """
+        url = state.url
+        # workaround for webcal urls
+        if url.startswith("webcal://"):
+            url = url.replace("webcal://", "https://")
+
+        headers = {}
+        if state.calendar is not None:
+            if state.etag:
+                headers["If-None-Match"] = state.etag
+            if state.last_modified:
+                headers["If-Modified-Since"] = state.last_modified
+
+        try:
+            response = get_http_session().get(url, headers=headers, timeout=REQUEST_TIMEOUT)
+            if response.status_code == 304 and state.calendar is not None:
+                logger.debug(f"Calendar not modified: {state.url}")
+                return
+            response.raise_for_status()
+            if state.update(response):
+                logger.info(f"Parsed calendar {state.url}")
+            else:
+                logger.debug(f"Calendar body unchanged: {state.url}")
+        except Exception as e:
+            raise RuntimeError(f"Failed to fetch iCalendar url: {str(e)}")
+
+    def between(self, url, start, end, tz):
+        """Returns the event occurrences of a calendar overlapping [start, end).
+
+        Args:
+            url: Calendar URL, http(s) or webcal.
+            start: Range start, a date, naive datetime (in tz) or aware datetime.
+            end: Range end, same types as start.
+            tz: pytz timezone of the display.
+
+        Returns:
+            list: icalendar event components, one per occurrence, sorted by start.
+        """
+        state = self._get_state(url)
+        with state.lock:
+            self.fetch(state)
+            return state.between(start, end, tz)
+
+    def clear(self):
+        with self._lock:
+            self._calendars.clear()
+
+
+_ICS_CACHE = IcsCache()
+
+
+def get_ics_cache():
+    """Returns the process wide calendar cache."""
+    return _ICS_CACHE
@@ -0,0 +1,369 @@
+"""
+Calendar layout engine.
+
+Lays out the calendar views (timeGridDay, timeGridWeek, timeGrid, dayGrid,
+dayGridMonth and listMonth) in Python so the calendar can be rendered as
+static HTML/CSS, without running FullCalendar in the headless browser.
+
+The layout follows FullCalendar's conventions: weeks start on the configured
+first day, all-day and multi-day events are stacked into rows spanning the
+days they cover, overlapping timed events share the width of a day column,
+and events without an end last one day (all-day) or one hour (timed).
+
+Only English date formatting is implemented, other locales keep using
+FullCalendar (see supports_locale).
+"""
+
+import calendar as pycalendar
+from datetime import date, datetime, timedelta
+
+DEFAULT_TIMED_DURATION = timedelta(hours=1)
+DEFAULT_ALL_DAY_DURATION = timedelta(days=1)
+
+
+class CalendarEvent:
+    """An event with naive local start/end datetimes, end is exclusive."""
+
+    def __init__(self, title, start, end, all_day, background_color, text_color):
+        self.title = title
+        self.start = start
+        self.end = end
+        self.all_day = all_day
+        self.background_color = background_color
+        self.text_color = text_color
+
+    @property
+    def first_day(self):
+        return self.start.date()
+
+    @property
+    def last_day(self):
+        """Last day the event is visible on (inclusive)."""
+        if self.end <= self.start:
+            return self.start.date()
+        return (self.end - timedelta(microseconds=1)).date()
+
+    @property
+    def multi_day(self):
+        return self.last_day > self.first_day
+
+    def sort_key(self):
+        # all-day events first, then earlier, then longer events, then by title
+        return (not self.all_day, self.start, -(self.end - self.start).total_seconds(), self.title)
+
+
+def supports_locale(language):
+    """Whether the layout engine can format dates for the given FullCalendar locale code."""
+    return (language or "en").lower().split("-")[0] == "en"
+
+
+def parse_events(events, tz):
+    """Converts the event dicts built by the calendar plugin to CalendarEvent objects."""
+    parsed = []
+    for event in events:
+        start = _parse_datetime(event["start"], tz)
+        end = _parse_datetime(event["end"], tz) if event.get("end") else None
+        all_day = event.get("allDay", False)
+        if end is None or end < start:
+            end = start + (DEFAULT_ALL_DAY_DURATION if all_day else DEFAULT_TIMED_DURATION)
+        parsed.append(CalendarEvent(event["title"], start, end, all_day,
+                                    event.get("backgroundColor"), event.get("textColor")))
+    return sorted(parsed, key=CalendarEvent.sort_key)
+
+
+def _parse_datetime(value, tz):
+    if len(value) == 10:
+        return datetime.combine(date.fromisoformat(value), datetime.min.time())
+    dt = datetime.fromisoformat(value)
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(tz).replace(tzinfo=None)
+    return dt
+
+
+def get_visible_days(view, today, first_day=0, display_weeks=4):
+    """
+    Returns the days shown by a view.
+
+    Args:
+        view: View name
+        today: Current date
+        first_day: First day of the week, 0 is Sunday (FullCalendar convention)
+        display_weeks: Number of weeks of the dayGrid view
+    """
+    week_start = today - timedelta(days=(today.isoweekday() - first_day) % 7)
+    if view == "timeGridDay":
+        start, count = today, 1
+    elif view == "timeGridWeek":
+        start, count = week_start, 7
+    elif view == "timeGrid":
+        start, count = today, 7
+    elif view == "dayGrid":
+        start, count = week_start, 7 * display_weeks
+    elif view == "dayGridMonth":
+        month_start = today.replace(day=1)
+        month_end = month_start.replace(day=pycalendar.monthrange(today.year, today.month)[1])
+        start = month_start - timedelta(days=(month_start.isoweekday() - first_day) % 7)
+        count = ((month_end - start).days // 7 + 1) * 7
+    elif view == "listMonth":
+        start = today.replace(day=1)
+        count = pycalendar.monthrange(today.year, today.month)[1]
+    else:
+        raise ValueError(f"Unsupported view {view}")
+    return [start + timedelta(days=offset) for offset in range(count)]
+
+
+def format_time(dt, time_format="12h", omit_zero_minute=True):
+    if time_format == "24h":
+        return dt.strftime("%H:%M")
+    hour = dt.hour % 12 or 12
+    meridiem = "am" if dt.hour < 12 else "pm"
+    if dt.minute == 0 and omit_zero_minute:
+        return f"{hour}{meridiem}"
+    return f"{hour}:{dt.minute:02d}{meridiem}"
+
+
+def format_time_range(start, end, time_format="12h"):
+    """Formats a time range, sharing the meridiem like FullCalendar does ("9 - 10am")."""
+    if time_format == "12h" and (start.hour < 12) == (end.hour < 12) and start.date() == end.date():
+        return f"{format_time(start, time_format)[:-2]} - {format_time(end, time_format)}"
+    return f"{format_time(start, time_format)} - {format_time(end, time_format)}"
+
+
+def format_title(view, days):
+    first, last = days[0], days[-1]
+    if view == "timeGridDay":
+        return first.strftime("%B %-d, %Y")
+    if view in ("dayGridMonth", "listMonth"):
+        # month views are titled after the month of their middle day
+        return days[len(days) // 2].strftime("%B %Y")
+    if first.year != last.year:
+        return f"{first.strftime('%b %-d, %Y')} – {last.strftime('%b %-d, %Y')}"
+    if first.month != last.month:
+        return f"{first.strftime('%b %-d')} – {last.strftime('%b %-d, %Y')}"
+    return f"{first.strftime('%b %-d')} – {last.strftime('%-d, %Y')}"
+
+
+def layout_segments(columns, events):
+    """
+    Places events spanning days into rows (levels) over the given day columns.
+
+    Each event gets the lowest level that is free over all the columns it covers.
+
+    Returns:
+        (segments, level_count) where each segment is a dict with the event,
+        its first column, span, level, and whether the event starts/ends in the row
+    """
+    column_index = {day: index for index, day in enumerate(columns)}
+    levels = []
+    segments = []
+    for event in events:
+        covered = [column_index[day] for day in _days_between(event.first_day, event.last_day) if day in column_index]
+        if not covered:
+            continue
+        first, last = covered[0], covered[-1]
+
+        level = 0
+        while level < len(levels) and any(levels[level][first:last + 1]):
+            level += 1
+        if level == len(levels):
+            levels.append([False] * len(columns))
+        for column in range(first, last + 1):
+            levels[level][column] = True
+
+        segments.append({
+            "event": event,
+            "column": first,
+            "span": last - first + 1,
+            "level": level,
+            "is_start": event.first_day == columns[first],
+            "is_end": event.last_day == columns[last],
+        })
+    return segments, len(levels)
+
+
+def _days_between(first, last):
+    day = first
+    while day <= last:
+        yield day
+        day += timedelta(days=1)
+
+
+def layout_day_grid(days, events, today, time_format="12h", weekends=True, month=None):
+    """
+    Lays out the dayGrid and dayGridMonth views as rows of weeks.
+
+    All-day and multi-day events are placed as segments spanning days, single day
+    timed events are listed in their day cell.
+    """
+    weeks = []
+    for week_start in range(0, len(days), 7):
+        columns = [day for day in days[week_start:week_start + 7] if weekends or day.isoweekday() < 6]
+        if not columns:
+            continue
+
+        block_events = [event for event in events if event.all_day or event.multi_day]
+        segments, level_count = layout_segments(columns, block_events)
+        for segment in segments:
+            event = segment["event"]
+            segment["time"] = format_time(event.start, time_format) if not event.all_day and segment["is_start"] else None
+
+        cells = []
+        for day in columns:
+            timed = [event for event in events
+                     if not event.all_day and not event.multi_day and event.first_day == day]
+            cells.append({
+                "date": day,
+                "number": day.day,
+                "today": day == today,
+                "other_month": month is not None and day.month != month,
+                "events": [{"event": event, "time": format_time(event.start, time_format)} for event in timed],
+            })
+        weeks.append({"cells": cells, "segments": segments, "levels": level_count})
+    return weeks
+
+
+def layout_time_grid(days, events, now, slot_min=0, slot_max=24, time_format="12h", weekends=True):
+    """
+    Lays out the timeGrid views: an all-day row and a column per day with timed
+    events positioned in percent of the visible hours.
+    """
+    columns = [day for day in days if weekends or day.isoweekday() < 6]
+    segments, level_count = layout_segments(columns, [event for event in events if event.all_day])
+
+    visible_minutes = max(slot_max - slot_min, 1) * 60
+    day_columns = []
+    for day in columns:
+        range_start = datetime.combine(day, datetime.min.time()) + timedelta(hours=slot_min)
+        range_end = datetime.combine(day, datetime.min.time()) + timedelta(hours=slot_max)
+
+        placed = []
+        for event in events:
+            if event.all_day or event.end <= range_start or event.start >= range_end:
+                continue
+            start = max(event.start, range_start)
+            end = min(event.end, range_end)
+            placed.append({
+                "event": event,
+                "start": start,
+                "end": end,
+                "top": (start - range_start).total_seconds() / 60 / visible_minutes * 100,
+                "height": max((end - start).total_seconds() / 60, 1) / visible_minutes * 100,
+                "time": format_time_range(event.start, event.end, time_format),
+            })
+        _place_overlapping(placed)
+
+        now_position = None
+        if now.date() == day and range_start <= now < range_end:
+            now_position = (now - range_start).total_seconds() / 60 / visible_minutes * 100
+
+        day_columns.append({
+            "date": day,
+            "today": day == now.date(),
+            "events": placed,
+            "now": now_position,
+        })
+
+    slots = [{"label": format_time(datetime(2000, 1, 1, hour), time_format)} for hour in range(slot_min, slot_max)]
+    return {"columns": day_columns, "segments": segments, "levels": level_count, "slots": slots}
+
+
+def _place_overlapping(placed):
+    """Splits the width of a day column between clusters of overlapping events."""
+    placed.sort(key=lambda item: (item["start"], item["start"] - item["end"]))
+    cluster = []
+    cluster_end = None
+    for item in placed + [None]:
+        if item is None or (cluster_end is not None and item["start"] >= cluster_end):
+            # assign each event of the finished cluster to the first free sub-column
+            column_ends = []
+            for member in cluster:
+                column = next((index for index, end in enumerate(column_ends) if end <= member["start"]), None)
+                if column is None:
+                    column = len(column_ends)
+                    column_ends.append(member["end"])
+                else:
+                    column_ends[column] = member["end"]
+                member["column"] = column
+            for member in cluster:
+                member["left"] = member["column"] / len(column_ends) * 100
+                member["width"] = 100 / len(column_ends)
+            cluster = []
+            cluster_end = None
+        if item is not None:
+            cluster.append(item)
+            cluster_end = item["end"] if cluster_end is None else max(cluster_end, item["end"])
+
+
+def layout_list(days, events, time_format="12h"):
+    """Lays out the listMonth view: days with events, each event listed on every day it covers."""
+    list_days = []
+    for day in days:
+        day_start = datetime.combine(day, datetime.min.time())
+        day_end = day_start + timedelta(days=1)
+        items = []
+        for event in events:
+            if not (event.first_day <= day <= event.last_day):
+                continue
+            if event.all_day or (event.start <= day_start and event.end >= day_end):
+                time = "all-day"
+            elif event.first_day == event.last_day:
+                time = format_time_range(event.start, event.end, time_format)
+            elif event.first_day == day:
+                time = format_time(event.start, time_format)
+            else:
+                time = f"- {format_time(event.end, time_format)}"
+            items.append({"event": event, "time": time})
+        if items:
+            list_days.append({
+                "date": day,
+                "weekday": day.strftime("%A"),
+                "label": day.strftime("%B %-d, %Y"),
+                "events": items,
+            })
+    return list_days
+
+
+def build_layout(view, events, now, settings, time_format="12h"):
+    """
+    Computes everything the static calendar template needs for a view.
+
+    Args:
+        view: View name, 'timeGrid' is the 7 day time grid starting today
+        events: Event dicts as built by the calendar plugin
+        now: Current time as a timezone aware datetime
+        settings: Plugin settings
+        time_format: '12h' or '24h'
+    """
+    events = parse_events(events, now.tzinfo)
+    local_now = now.replace(tzinfo=None)
+    today = local_now.date()
+    first_day = int(settings.get("weekStartDay") or 0)
+    weekends = settings.get("displayWeekends") == "true"
+    display_weeks = int(settings.get("displayWeeks") or 4)
+
+    days = get_visible_days(view, today, first_day, display_weeks)
+    layout = {
+        "view": view,
+        "title": format_title(view, days),
+        "display_event_time": settings.get("displayEventTime") == "true",
+        "display_now": settings.get("displayNowIndicator") == "true",
+    }
+
+    header_days = [day for day in days[:7] if weekends or day.isoweekday() < 6]
+    if view.startswith("timeGrid"):
+        slot_min = int(settings.get("startTimeInterval") or 0)
+        slot_max = int(settings.get("endTimeInterval") or 24)
+        if slot_max <= slot_min:
+            slot_min, slot_max = 0, 24
+        layout["time_grid"] = layout_time_grid(days, events, local_now, slot_min, slot_max, time_format, weekends)
+        layout["headers"] = [{
+            "label": day.strftime("%A") if view == "timeGridDay" else f"{day.strftime('%a')} {day.month}/{day.day}",
+            "today": day == today,
+        } for day in (day_column["date"] for day_column in layout["time_grid"]["columns"])]
+    elif view.startswith("dayGrid"):
+        month = today.month if view == "dayGridMonth" else None
+        layout["weeks"] = layout_day_grid(days, events, today, time_format, weekends, month)
+        layout["headers"] = [{"label": day.strftime("%a"), "today": False} for day in header_days]
+    else:
+        layout["list"] = layout_list(days, events, time_format)
+    return layout
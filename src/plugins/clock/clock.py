@@ -1,12 +1,17 @@
 import os
-from utils.app_utils import resolve_path, get_font
+from utils.app_utils import resolve_path, get_font, get_cache_dir
+from utils.image_writer import get_image_writer
 from plugins.base_plugin.base_plugin import BasePlugin
 from PIL import Image, ImageColor, ImageDraw, ImageFont
 from io import BytesIO
 import logging
 import numpy as np
 import math
-from datetime import datetime
+import functools
+import hashlib
+import shutil
+import threading
+from datetime import datetime, timedelta
 import pytz
 
 logger = logging.getLogger(__name__)
@@ -38,15 +43,64 @@ CLOCK_FACES = [
     }
 ]
 
+# Number of steps the full circle is quantized to in the cached angle field
+ANGLE_STEPS = 1 << 16
+
+# Rendered minute frames kept on disk per clock configuration, and configurations kept.
+# Small on purpose: a frame is mostly reused within its minute (previews, manual updates),
+# keeping a whole day of frames would mean a PNG write to the SD card every minute for hits
+# that come 12 hours later at best.
+FRAME_CACHE_DIR = "clock"
+MAX_CACHED_FRAMES = 16
+MAX_CACHED_CONFIGS = 2
+# Bump when the drawing code changes so stale frames are not reused
+FRAME_CACHE_VERSION = 1
+
+# Static layers (background, hour marks, word grid) kept in memory
+MAX_STATIC_LAYERS = 4
+
+WORD_CLOCK_GRID = [
+    ['I','T','L','I','S','A','S','A','M','P','M'],
+    ['A','C','Q','U','A','R','T','E','R','D','C'],
+    ['T','W','E','N','T','Y','F','I','V','E','X'],
+    ['H','A','L','F','S','T','E','N','F','T','O'],
+    ['P','A','S','T','E','R','U','N','I','N','E'],
+    ['O','N','E','S','I','X','T','H','R','E','E'],
+    ['F','O','U','R','F','I','V','E','T','W','O'],
+    ['E','I','G','H','T','E','L','E','V','E','N'],
+    ['S','E','V','E','N','T','W','E','L','V','E'],
+    ['T','E','N','S','E','O','C','L','O','C','K'],
+]
+
 DEFAULT_TIMEZONE = "US/Eastern"
 DEFAULT_CLOCK_FACE = "Gradient Clock"
 
 class Clock(BasePlugin):
+    def __init__(self, config, **dependencies):
+        super().__init__(config, **dependencies)
+        self._static_layers = {}
+        self._layers_lock = threading.Lock()
+
     def generate_settings_template(self):
         template_params = super().generate_settings_template()
         template_params['clock_faces'] = CLOCK_FACES
         return template_params
 
+    def next_change_time(self, settings, now):
+        clock_face = settings.get('selectedClockFace')
+        if not clock_face or clock_face not in [face['name'] for face in CLOCK_FACES]:
+            clock_face = DEFAULT_CLOCK_FACE
+
+        # the next minute that looks different, the word clock only changes every five minutes
+        current_minute = now.replace(second=0, microsecond=0)
+        current_key = Clock.frame_key(clock_face, current_minute)
+        next_minute = current_minute + timedelta(minutes=1)
+        for _ in range(60):
+            if Clock.frame_key(clock_face, next_minute) != current_key:
+                break
+            next_minute += timedelta(minutes=1)
+        return next_minute
+
     def generate_image(self, settings, device_config):
         clock_face = settings.get('selectedClockFace')
         primary_color = ImageColor.getcolor(settings.get('primaryColor') or "white", "RGB")
@@ -60,36 +114,125 @@ class Clock(BasePlugin):
 
         timezone_name = device_config.get_config("timezone") or DEFAULT_TIMEZONE
         tz = pytz.timezone(timezone_name)
-        current_time = datetime.now(tz)
+        # clock faces only show hours and minutes, so frames are rendered per minute
+        current_time = datetime.now(tz).replace(second=0, microsecond=0)
 
         img = None
         try:
-            if clock_face == "Gradient Clock":
-                img = self.draw_conic_clock(dimensions, current_time, primary_color, secondary_color)
-            elif clock_face == "Digital Clock":
-                img = self.draw_digital_clock(dimensions, current_time, primary_color, secondary_color)
-            elif clock_face == "Divided Clock":
-                img = self.draw_divided_clock(dimensions, current_time, primary_color, secondary_color)
-            elif clock_face == "Word Clock":
-                img = self.draw_word_clock(dimensions, current_time, primary_color, secondary_color)
+            img = self.get_frame(clock_face, dimensions, current_time, primary_color, secondary_color)
         except Exception as e:
             logger.error(f"Failed to draw clock image: {str(e)}")
             raise RuntimeError("Failed to display clock.")
+
         return img
+
+    def draw_clock_face(self, clock_face, dimensions, time, primary_color, secondary_color):
+        if clock_face == "Gradient Clock":
+            return self.draw_conic_clock(dimensions, time, primary_color, secondary_color)
+        elif clock_face == "Digital Clock":
+            return self.draw_digital_clock(dimensions, time, primary_color, secondary_color)
+        elif clock_face == "Divided Clock":
+            return self.draw_divided_clock(dimensions, time, primary_color, secondary_color)
+        elif clock_face == "Word Clock":
+            return self.draw_word_clock(dimensions, time, primary_color, secondary_color)
+
+    def get_frame(self, clock_face, dimensions, time, primary_color, secondary_color):
+        """
+        Returns the clock frame for the given minute, from the frame cache if it was rendered before.
+
+        Frames are stored as PNG files in a directory per configuration (face, colors,
+        resolution), named after what the face shows at that minute.
+        """
+        frame_dir = self.get_frame_dir(clock_face, dimensions, primary_color, secondary_color)
+        frame_path = os.path.join(frame_dir, f"{Clock.frame_key(clock_face, time)}.png")
+
+        if os.path.isfile(frame_path):
+            try:
+                with Image.open(frame_path) as frame:
+                    frame.load()
+                    logger.debug(f"Using cached clock frame {frame_path}")
+                    return frame.copy()
+            except Exception as e:
+                logger.warning(f"Could not read cached clock frame {frame_path}: {e}")
+
+        frame = self.draw_clock_face(clock_face, dimensions, time, primary_color, secondary_color).convert("RGB")
+        self.save_frame(frame, frame_dir, frame_path)
+        return frame
+
+    def get_frame_dir(self, clock_face, dimensions, primary_color, secondary_color):
+        config_key = f"{FRAME_CACHE_VERSION}|{clock_face}|{primary_color}|{secondary_color}|{dimensions[0]}x{dimensions[1]}"
+        config_hash = hashlib.sha1(config_key.encode()).hexdigest()[:16]
+        frame_dir = os.path.join(get_cache_dir(FRAME_CACHE_DIR), config_hash)
+        if not os.path.isdir(frame_dir):
+            os.makedirs(frame_dir, exist_ok=True)
+            Clock.prune_frame_dirs(os.path.dirname(frame_dir))
+        return frame_dir
+
+    @staticmethod
+    def frame_key(clock_face, time):
+        """Name of the frame showing the given time, frames that look the same share a key."""
+        if clock_face == "Digital Clock":
+            return f"{time.hour:02d}{time.minute:02d}"
+        if clock_face == "Word Clock":
+            letter_positions = Clock.translate_word_grid_positions(time.hour % 12, time.minute)
+            return hashlib.sha1(repr(sorted(set(map(tuple, letter_positions)))).encode()).hexdigest()[:16]
+        return f"{time.hour % 12:02d}{time.minute:02d}"
+
+    @staticmethod
+    def save_frame(frame, frame_dir, frame_path):
+        try:
+            tmp_path = f"{frame_path}.{threading.get_ident()}.tmp"
+            frame.save(tmp_path, format="PNG", compress_level=get_image_writer().compress_level)
+            os.replace(tmp_path, frame_path)
+        except OSError as e:
+            logger.warning(f"Could not cache clock frame {frame_path}: {e}")
+            return
+
+        frames = [os.path.join(frame_dir, name) for name in os.listdir(frame_dir) if name.endswith(".png")]
+        if len(frames) > MAX_CACHED_FRAMES:
+            frames.sort(key=os.path.getmtime)
+            for path in frames[:len(frames) - MAX_CACHED_FRAMES]:
+                os.remove(path)
+
+    @staticmethod
+    def prune_frame_dirs(cache_dir):
+        """Removes the least recently created frame directories beyond MAX_CACHED_CONFIGS."""
+        frame_dirs = [os.path.join(cache_dir, name) for name in os.listdir(cache_dir)]
+        frame_dirs = sorted((path for path in frame_dirs if os.path.isdir(path)), key=os.path.getmtime)
+        for path in frame_dirs[:max(len(frame_dirs) - MAX_CACHED_CONFIGS, 0)]:
+            logger.debug(f"Removing clock frame cache {path}")
+            shutil.rmtree(path, ignore_errors=True)
+
+    def get_static_layer(self, key, draw_layer):
+        """Returns a cached layer that does not depend on the time, drawing it on first use."""
+        with self._layers_lock:
+            layer = self._static_layers.get(key)
+            if layer is None:
+                if len(self._static_layers) >= MAX_STATIC_LAYERS:
+                    self._static_layers.pop(next(iter(self._static_layers)))
+                layer = draw_layer()
+                self._static_layers[key] = layer
+            return layer
     
     def draw_digital_clock(self, dimensions, time, primary_color=(255,255,255), secondary_color=(0,0,0)):
         w,h = dimensions
         time_str = Clock.format_time(time.hour, time.minute, zero_pad = True)
 
-        image = Image.new("RGBA", dimensions, secondary_color+(255,))
-        text = Image.new("RGBA", dimensions, (0, 0, 0, 0))
-
         font_size = w * 0.36
         fnt = get_font("DS-Digital", font_size)
-        text_draw = ImageDraw.Draw(text)
+
+        def draw_background():
+            image = Image.new("RGBA", dimensions, secondary_color+(255,))
+            text = Image.new("RGBA", dimensions, (0, 0, 0, 0))
+            ImageDraw.Draw(text).text((w/2, h/2), "00:00", font=fnt, anchor="mm", fill=primary_color +(30,))
+            return Image.alpha_composite(image, text)
+
+        # unlit segments
+        image = self.get_static_layer(("Digital Clock", dimensions, primary_color, secondary_color), draw_background)
 
         # time text
-        text_draw.text((w/2, h/2), "00:00", font=fnt, anchor="mm", fill=primary_color +(30,))
+        text = Image.new("RGBA", dimensions, (0, 0, 0, 0))
+        text_draw = ImageDraw.Draw(text)
         text_draw.text((w/2, h/2), time_str, font=fnt, anchor="mm", fill=primary_color +(255,))
 
         combined = Image.alpha_composite(image, text)    
@@ -100,17 +243,10 @@ class Clock(BasePlugin):
         width, height = dimensions
         hour_angle, minute_angle = Clock.calculate_clock_angles(time)
 
-        # Draw the hour hand gradient
-        image_hour = Clock.draw_gradient_image(
+        # Draw the hour and minute hand gradients combined using alpha blending
+        final_image = Clock.draw_conic_gradients(
             width, height, hour_angle, minute_angle, secondary_color, primary_color
         )
-        # Draw the minute hand gradient
-        image_minute = Clock.draw_gradient_image(
-            width, height, minute_angle, hour_angle, secondary_color, primary_color
-        )
-
-        # Combine the images using alpha blending
-        final_image = Image.alpha_composite(image_hour, image_minute)
 
         dim = min(width, height)
         minute_length = dim * 0.35
@@ -130,88 +266,88 @@ class Clock(BasePlugin):
 
     def draw_divided_clock(self, dimensions, time, primary_color=(32,183,174), secondary_color=(255,255,255)):
         w,h = dimensions
-        bg = Image.new("RGBA", dimensions, primary_color+(255,))
-        bg_draw = ImageDraw.Draw(bg)
 
         # used to calculate percentages of sizes
         dim = min(w,h)
 
-        corners = [(0, h/2), (w,h)]
-        bg_draw.rectangle(corners, fill=secondary_color +(255,))
+        def draw_face():
+            bg = Image.new("RGBA", dimensions, primary_color+(255,))
+            bg_draw = ImageDraw.Draw(bg)
 
-        canvas = Image.new("RGBA", dimensions, (0, 0, 0, 0))
-        image_draw = ImageDraw.Draw(canvas)
+            corners = [(0, h/2), (w,h)]
+            bg_draw.rectangle(corners, fill=secondary_color +(255,))
 
-        shadow_offset = max(int(dim * 0.0075), 1)
-        face_size = int(dim * 0.45)
+            canvas = Image.new("RGBA", dimensions, (0, 0, 0, 0))
+            image_draw = ImageDraw.Draw(canvas)
 
-        # clock shadow
-        image_draw.circle((w/2,h/2 + shadow_offset), face_size+2, fill=(0,0,0,50))
+            shadow_offset = max(int(dim * 0.0075), 1)
+            face_size = int(dim * 0.45)
 
-        # clock outline
-        image_draw.circle((w/2,h/2), face_size, fill=primary_color, outline=secondary_color, width=int(dim * 0.03125))
-        
-        Clock.draw_hour_marks(image_draw._image, face_size - int(w*0.04375))
+            # clock shadow
+            image_draw.circle((w/2,h/2 + shadow_offset), face_size+2, fill=(0,0,0,50))
+
+            # clock outline
+            image_draw.circle((w/2,h/2), face_size, fill=primary_color, outline=secondary_color, width=int(dim * 0.03125))
+
+            Clock.draw_hour_marks(image_draw._image, face_size - int(w*0.04375))
+
+            return Image.alpha_composite(bg, canvas)
+
+        # background, face and hour marks do not change, the opaque hands are drawn on a copy
+        combined = self.get_static_layer(("Divided Clock", dimensions, primary_color, secondary_color), draw_face).copy()
 
         hour_angle, minute_angle = Clock.calculate_clock_angles(time)
         hand_width = max(int(dim * 0.009), 1)
-        Clock.draw_clock_hand(image_draw._image, int(dim*0.3), minute_angle, secondary_color, hand_width=hand_width, border_color=secondary_color, round_corners=False)
-        Clock.draw_clock_hand(image_draw._image, int(dim*0.2), hour_angle, secondary_color, hand_width=hand_width, border_color=secondary_color, round_corners=False)
-
-        Clock.drew_clock_center(image_draw._image, max(int(dim*0.014), 1), primary_color, secondary_color, width=max(int(dim* 0.007), 1))
+        Clock.draw_clock_hand(combined, int(dim*0.3), minute_angle, secondary_color, hand_width=hand_width, border_color=secondary_color, round_corners=False)
+        Clock.draw_clock_hand(combined, int(dim*0.2), hour_angle, secondary_color, hand_width=hand_width, border_color=secondary_color, round_corners=False)
 
-        combined = Image.alpha_composite(bg, canvas)    
+        Clock.drew_clock_center(combined, max(int(dim*0.014), 1), primary_color, secondary_color, width=max(int(dim* 0.007), 1))
 
         return combined
 
     def draw_word_clock(self, dimensions, time, primary_color=(0,0,0), secondary_color=(255,255,255)):
         w,h = dimensions
 
-        bg = Image.new("RGBA", dimensions, primary_color+(255,))
-
         dim = min(w,h)
 
         font_size = dim*0.05
         fnt = get_font("Napoli", font_size)
 
-        canvas = Image.new("RGBA", dimensions, (0, 0, 0, 0))
-        image_draw = ImageDraw.Draw(canvas)
-
         border = [40, 40]
         if w > h:
             border[0] += (w-h)/2
         elif h > w:
             border[1] += (h-w)/2
 
-        letter_positions = Clock.translate_word_grid_positions(time.hour % 12, time.minute)
+        canvas_size = min(w,h) - min(border)*2
+        def letter_position(x, y):
+            x_pos = x*(canvas_size/(len(WORD_CLOCK_GRID[y])-1)) + border[0]
+            y_pos = y*(canvas_size/(len(WORD_CLOCK_GRID)-1)) + border[1]
+            return x_pos, y_pos
+
+        def draw_grid():
+            bg = Image.new("RGBA", dimensions, primary_color+(255,))
+            canvas = Image.new("RGBA", dimensions, (0, 0, 0, 0))
+            image_draw = ImageDraw.Draw(canvas)
+            for y, row in enumerate(WORD_CLOCK_GRID):
+                for x, letter in enumerate(row):
+                    image_draw.text(letter_position(x, y), letter, anchor="mm", fill=secondary_color+(50,), font=fnt)
+            return Image.alpha_composite(bg, canvas)
+
+        # the dimmed letter grid does not change, lit letters are drawn over it
+        grid = self.get_static_layer(("Word Clock", dimensions, primary_color, secondary_color), draw_grid)
 
-        letter_grid = [
-            ['I','T','L','I','S','A','S','A','M','P','M'],
-            ['A','C','Q','U','A','R','T','E','R','D','C'],
-            ['T','W','E','N','T','Y','F','I','V','E','X'],
-            ['H','A','L','F','S','T','E','N','F','T','O'],
-            ['P','A','S','T','E','R','U','N','I','N','E'],
-            ['O','N','E','S','I','X','T','H','R','E','E'],
-            ['F','O','U','R','F','I','V','E','T','W','O'],
-            ['E','I','G','H','T','E','L','E','V','E','N'],
-            ['S','E','V','E','N','T','W','E','L','V','E'],
-            ['T','E','N','S','E','O','C','L','O','C','K'],
-        ]
+        canvas = Image.new("RGBA", dimensions, (0, 0, 0, 0))
+        image_draw = ImageDraw.Draw(canvas)
 
-        canvas_size = min(w,h) - min(border)*2
-        for y, row in enumerate(letter_grid):
-            for x, letter in enumerate(row):
-                x_pos = x*(canvas_size/(len(row)-1)) + border[0] 
-                y_pos = y*(canvas_size/(len(letter_grid)-1)) + border[1]
-
-                fill=secondary_color+(50,)
-                if [y,x] in letter_positions:
-                    fill=secondary_color+(255,)
-                    image_draw.text((x_pos+2, y_pos+2), letter, anchor="mm", fill=secondary_color+(80,), font=fnt)
-                
-                image_draw.text((x_pos, y_pos), letter, anchor="mm", fill=fill, font=fnt)
-
-        combined = Image.alpha_composite(bg, canvas)
+        letter_positions = Clock.translate_word_grid_positions(time.hour % 12, time.minute)
+        for y, x in sorted(set(map(tuple, letter_positions))):
+            letter = WORD_CLOCK_GRID[y][x]
+            x_pos, y_pos = letter_position(x, y)
+            image_draw.text((x_pos+2, y_pos+2), letter, anchor="mm", fill=secondary_color+(80,), font=fnt)
+            image_draw.text((x_pos, y_pos), letter, anchor="mm", fill=secondary_color+(255,), font=fnt)
+
+        combined = Image.alpha_composite(grid, canvas)
         return combined
 
     @staticmethod
@@ -225,38 +361,89 @@ class Clock(BasePlugin):
         return f"{hour_str}:{minute_str}"
 
     @staticmethod
-    def draw_gradient_image(w, h, start_angle, end_angle, start_color, end_color):
+    @functools.lru_cache(maxsize=2)
+    def get_angle_field(w, h):
         """
-        Draw a gradient that starts at start_angle and ends at end_angle, using RGBA colors.
-        Angles are interpreted for a clock face (0 at 12 o'clock, increasing clockwise).
+        Clock angle of every pixel around the image center, computed once per resolution.
+
+        Angles are quantized to ANGLE_STEPS and stored as uint16, so rotating the field by
+        an angle is an integer add that wraps around the circle.
         """
         x,y = np.ogrid[:h,:w]
         cx,cy = h/2, w/2
 
-        start_angle = -start_angle
-        end_angle = -end_angle
+        theta = np.arctan2(x-cx,y-cy) % (2*np.pi)
+        field = np.rint(theta * (ANGLE_STEPS / (2*np.pi))).astype(np.uint32) % ANGLE_STEPS
+        return field.astype(np.uint16)
 
-        theta = (np.arctan2(x-cx,y-cy) - start_angle)  % (2*np.pi)
+    @staticmethod
+    def angle_to_steps(angle):
+        return int(round(angle * ANGLE_STEPS / (2*np.pi))) % ANGLE_STEPS
 
-        angle_range = ((end_angle-start_angle) % (2 * np.pi))
+    @staticmethod
+    def gradient_lut(start_angle, end_angle, start_color, end_color):
+        """
+        RGBA color for each quantized angle, relative to start_angle, of a gradient from
+        start_angle to end_angle. Angles outside of the gradient are transparent.
+        """
+        angle_range = ((start_angle - end_angle) % (2 * np.pi))
         if angle_range == 0:
             angle_range = 2*np.pi  # Special case: full circle gradient
 
+        theta = np.arange(ANGLE_STEPS, dtype=np.float32) * np.float32(2*np.pi / ANGLE_STEPS)
         anglemask = theta <= angle_range
-        theta = theta / angle_range  # Normalize to [0, 1] within range
+        theta = theta / np.float32(angle_range)  # Normalize to [0, 1] within range
 
         # Interpolate colors between start and end within the mask
-        gradient = np.zeros((h, w, 4), dtype=np.uint8)
-        start_color = Clock.pad_color(start_color)
-        end_color = Clock.pad_color(end_color)
-        for c in range(4):  # Iterate through RGBA channels
-            gradient[..., c] = (
-                start_color[c] * (1 - theta) + end_color[c] * (theta)
-            ).astype(np.uint8)
-        
+        start_color = np.array(Clock.pad_color(start_color), dtype=np.float32)
+        end_color = np.array(Clock.pad_color(end_color), dtype=np.float32)
+        lut = (start_color * (1 - theta[:, None]) + end_color * theta[:, None]).astype(np.uint8)
+
         # Fill with the specified solid color
-        gradient[~anglemask] = (0, 0, 0, 0)
-        return Image.fromarray(gradient, mode="RGBA")
+        lut[~anglemask] = (0, 0, 0, 0)
+        return lut
+
+    @staticmethod
+    def draw_gradient_image(w, h, start_angle, end_angle, start_color, end_color):
+        """
+        Draw a gradient that starts at start_angle and ends at end_angle, using RGBA colors.
+        Angles are interpreted for a clock face (0 at 12 o'clock, increasing clockwise).
+        """
+        lut = Clock.gradient_lut(start_angle, end_angle, start_color, end_color)
+        theta = Clock.get_angle_field(w, h) + np.uint16(Clock.angle_to_steps(start_angle))
+        return Image.fromarray(lut[theta], mode="RGBA")
+
+    @staticmethod
+    def draw_conic_gradients(w, h, hour_angle, minute_angle, start_color, end_color):
+        """
+        Draw the hour gradient (hour to minute hand) with the minute gradient (minute to hour
+        hand) alpha composited on top, in a single pass over the image.
+
+        Both gradients are functions of the same angle field, so they are blended per
+        quantized angle first and the frame is produced with one lookup.
+        """
+        hour_lut = Clock.gradient_lut(hour_angle, minute_angle, start_color, end_color)
+        minute_lut = Clock.gradient_lut(minute_angle, hour_angle, start_color, end_color)
+
+        # Align the minute gradient with the hour gradient's angle origin
+        shift = Clock.angle_to_steps(minute_angle) - Clock.angle_to_steps(hour_angle)
+        minute_lut = np.roll(minute_lut, -shift, axis=0)
+
+        minute_alpha = minute_lut[:, 3:]
+        if np.isin(minute_alpha, (0, 255)).all():
+            # Opaque colors: the minute gradient replaces the hour gradient wherever it is drawn
+            lut = np.where(minute_alpha == 255, minute_lut, hour_lut)
+        else:
+            # Porter-Duff "over" of the minute gradient on the hour gradient
+            dst = hour_lut.astype(np.float32) / 255
+            src = minute_lut.astype(np.float32) / 255
+            src_a = src[:, 3:]
+            out_a = src_a + dst[:, 3:] * (1 - src_a)
+            out_rgb = (src[:, :3] * src_a + dst[:, :3] * dst[:, 3:] * (1 - src_a)) / np.maximum(out_a, 1e-6)
+            lut = np.rint(np.concatenate([out_rgb, out_a], axis=1) * 255).astype(np.uint8)
+
+        theta = Clock.get_angle_field(w, h) + np.uint16(Clock.angle_to_steps(hour_angle))
+        return Image.fromarray(lut[theta], mode="RGBA")
 
     @staticmethod
     def pad_color(color):
@@ -1,18 +1,37 @@
 from plugins.base_plugin.base_plugin import BasePlugin
 from PIL import Image, ImageDraw, ImageFont
 import logging
+import time
 
 from .comic_parser import COMICS, get_panel
 from utils.app_utils import get_font
 
 logger = logging.getLogger(__name__)
 
+# A panel read by compute_input_key is only reused by a generate_image call this soon after,
+# when the key matched no image is generated and a later call must not get an outdated panel
+PREFETCH_MAX_AGE_SECONDS = 60
+
 class Comic(BasePlugin):
+    def __init__(self, config, **dependencies):
+        super().__init__(config, **dependencies)
+        # panel read by compute_input_key, reused by the generate_image call that follows
+        self._prefetched_panel = None
+
     def generate_settings_template(self):
         template_params = super().generate_settings_template()
         template_params['comics'] = list(COMICS)
         return template_params
 
+    def compute_input_key(self, settings, device_config, now):
+        comic = settings.get("comic")
+        if comic not in COMICS:
+            return None
+        # only the first feed entry is downloaded, the image only changes with a new panel
+        panel = get_panel(comic)
+        self._prefetched_panel = (comic, panel, time.monotonic())
+        return panel
+
     def generate_image(self, settings, device_config):
         logger.info("=== Comic Plugin: Starting image generation ===")
 
@@ -28,8 +47,12 @@ class Comic(BasePlugin):
 
         logger.debug(f"Settings: show_caption={is_caption}, font_size={caption_font_size}")
 
-        logger.debug("Parsing comic panel...")
-        comic_panel = get_panel(comic)
+        prefetched, self._prefetched_panel = self._prefetched_panel, None
+        if prefetched and prefetched[0] == comic and time.monotonic() - prefetched[2] <= PREFETCH_MAX_AGE_SECONDS:
+            comic_panel = prefetched[1]
+        else:
+            logger.debug("Parsing comic panel...")
+            comic_panel = get_panel(comic)
         logger.info(f"Comic panel URL: {comic_panel.get('image_url', 'Unknown')}")
 
         if comic_panel.get("title"):
@@ -1,7 +1,10 @@
-import feedparser
+from utils.feed_reader import read_feed
 import html
+import logging
 import re
 
+logger = logging.getLogger(__name__)
+
 
 COMICS = {
     "XKCD": {
@@ -64,7 +67,12 @@ COMICS = {
 
 
 def get_panel(comic_name):
-    feed = feedparser.parse(COMICS[comic_name]["feed"])
+    try:
+        # only the latest comic is needed, stop reading the feed after the first entry
+        feed = read_feed(COMICS[comic_name]["feed"], max_entries=1)
+    except Exception as e:
+        logger.error(f"Failed to read {comic_name} feed: {str(e)}")
+        raise RuntimeError("Failed to retrieve latest comic.")
     try:
         element = COMICS[comic_name]["element"](feed)
     except IndexError:
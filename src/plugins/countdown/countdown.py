@@ -3,6 +3,7 @@ from PIL import Image
 from datetime import datetime, timezone
 import logging
 import pytz
+from utils.time_utils import start_of_next_day
 
 logger = logging.getLogger(__name__)
 class Countdown(BasePlugin):
@@ -11,6 +12,13 @@ class Countdown(BasePlugin):
         template_params['style_settings'] = True
         return template_params
 
+    def compute_input_key(self, settings, device_config, now):
+        # the day count only changes with the date
+        return now.date().isoformat()
+
+    def next_change_time(self, settings, now):
+        return start_of_next_day(now)
+
     def generate_image(self, settings, device_config):
         title = settings.get('title')
         countdown_date_str = settings.get('date')
@@ -1,10 +1,11 @@
 import logging
 from random import choice
 
-from PIL import Image, ImageColor, ImageOps
+from PIL import Image
 from utils.http_client import get_http_session
+from utils.image_loader import ImageVariant
 from plugins.base_plugin.base_plugin import BasePlugin
-from utils.image_utils import pad_image_blur
+from utils.image_compositor import compose_image
 
 logger = logging.getLogger(__name__)
 
@@ -53,6 +54,20 @@ class ImmichProvider:
         logger.debug(f"Found {len(all_items)} total assets in album")
         return all_items
 
+    def get_variants(self, asset: dict) -> list[ImageVariant]:
+        """Immich serves a server-side resized preview, the original is only downloaded if the preview is too small."""
+        asset_url = f"{self.base_url}/api/assets/{asset['id']}"
+        exif = asset.get("exifInfo") or {}
+        return [
+            ImageVariant(f"{asset_url}/thumbnail?size=preview"),
+            ImageVariant(
+                f"{asset_url}/original",
+                exif.get("exifImageWidth"),
+                exif.get("exifImageHeight"),
+                exif.get("fileSizeInByte")
+            )
+        ]
+
     def get_image(self, album: str, dimensions: tuple[int, int], resize: bool = True) -> Image.Image | None:
         """
         Get a random image from the album.
@@ -82,19 +97,18 @@ class ImmichProvider:
         # Select random asset
         selected_asset = choice(assets)
         asset_id = selected_asset["id"]
-        asset_url = f"{self.base_url}/api/assets/{asset_id}/original"
 
         logger.info(f"Selected random asset: {asset_id}")
-        logger.debug(f"Downloading from: {asset_url}")
 
         # Use adaptive image loader for memory-efficient processing
         # Let loader resize when requested (when no padding will be applied)
-        img = self.image_loader.from_url(
-            asset_url,
+        img = self.image_loader.from_variants(
+            self.get_variants(selected_asset),
             dimensions,
             timeout_ms=40000,
             resize=resize,
-            headers=self.headers
+            headers=self.headers,
+            fit="cover" if resize else "contain"
         )
 
         if not img:
@@ -171,15 +185,7 @@ class ImageAlbum(BasePlugin):
 
         # Apply padding if requested (image was loaded at full size)
         if use_padding:
-            logger.debug(f"Applying padding with {background_option} background")
-            if background_option == "blur":
-                img = pad_image_blur(img, dimensions)
-            else:
-                background_color = ImageColor.getcolor(
-                    settings.get('backgroundColor') or "white",
-                    img.mode
-                )
-                img = ImageOps.pad(img, dimensions, color=background_color, method=Image.Resampling.LANCZOS)
+            img = compose_image(img, dimensions, settings)
         # else: loader already resized to fit with proper aspect ratio
 
         logger.info("=== Image Album Plugin: Image generation complete ===")
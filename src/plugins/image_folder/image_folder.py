@@ -1,10 +1,9 @@
 from plugins.base_plugin.base_plugin import BasePlugin
-from PIL import Image, ImageOps, ImageColor
 import logging
 import os
 import random
 
-from utils.image_utils import pad_image_blur
+from utils.image_compositor import open_image, compose_image
 
 logger = logging.getLogger(__name__)
 
@@ -59,27 +58,10 @@ class ImageFolder(BasePlugin):
         logger.debug(f"Settings: pad_image={use_padding}, background_option={background_option}")
 
         try:
-            # Use adaptive loader for memory-efficient processing
-            # Load without auto-resize first to handle padding options
-            # Note: Loader automatically handles EXIF orientation correction
-            img = self.image_loader.from_file(image_url, dimensions, resize=False)
-
-            if not img:
-                raise RuntimeError("Failed to load image from file")
-
-            if use_padding:
-                logger.debug(f"Applying padding with {background_option} background")
-                if background_option == "blur":
-                    img = pad_image_blur(img, dimensions)
-                else:
-                    background_color = ImageColor.getcolor(settings.get('backgroundColor') or "white", img.mode)
-                    img = ImageOps.pad(img, dimensions, color=background_color, method=Image.Resampling.LANCZOS)
-            else:
-                # No padding requested, scale to fit dimensions (crop to preserve aspect ratio)
-                logger.debug(f"Scaling to fit dimensions: {dimensions[0]}x{dimensions[1]}")
-                img = ImageOps.fit(img, dimensions, method=Image.LANCZOS)
-
-            return img
+            # Decode at the scale needed for the display, cropped to fill it or fitted for padding
+            # Note: EXIF orientation correction is applied while decoding
+            img = open_image(image_url, dimensions, fit="contain" if use_padding else "cover")
+            return compose_image(img, dimensions, settings)
         except Exception as e:
             logger.error(f"Error loading image from {image_url}: {e}")
             raise RuntimeError("Failed to load image, please check logs.")
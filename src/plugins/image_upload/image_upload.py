@@ -1,10 +1,11 @@
 from plugins.base_plugin.base_plugin import BasePlugin
-from PIL import Image, ImageOps, ImageColor
+from PIL import Image
 import logging
 import random
 import os
 
-from utils.image_utils import pad_image_blur
+from utils.image_compositor import open_image, compose_image
+from utils.upload_ingest import get_display_path, delete_upload
 
 logger = logging.getLogger(__name__)
 
@@ -12,7 +13,7 @@ logger = logging.getLogger(__name__)
 class ImageUpload(BasePlugin):
     def open_image(self, img_index: int, image_locations: list, dimensions: tuple, resize: bool = True) -> Image:
         """
-        Open image with adaptive loader for memory efficiency.
+        Open image decoded at the scale needed for the display.
 
         Args:
             img_index: Index of image to load
@@ -24,11 +25,10 @@ class ImageUpload(BasePlugin):
             raise RuntimeError("No images provided.")
 
         try:
-            # Use adaptive loader for memory-efficient processing
-            image = self.image_loader.from_file(image_locations[img_index], dimensions, resize=resize)
-            if not image:
-                raise RuntimeError("Failed to load image from file")
-            return image
+            # Display the pre-scaled derivative of the upload when it is ready, the original otherwise
+            image_path = get_display_path(image_locations[img_index], max(dimensions))
+            # Fit inside the display for padding, cropped to fill it otherwise
+            return open_image(image_path, dimensions, fit="cover" if resize else "contain")
         except Exception as e:
             logger.error(f"Failed to read image file: {str(e)}")
             raise RuntimeError("Failed to read image file.")
@@ -83,12 +83,7 @@ class ImageUpload(BasePlugin):
 
         # Apply padding if requested
         if needs_padding:
-            logger.debug(f"Applying padding with {background_option} background")
-            if background_option == "blur":
-                image = pad_image_blur(image, dimensions)
-            else:
-                background_color = ImageColor.getcolor(settings.get('backgroundColor') or "white", image.mode)
-                image = ImageOps.pad(image, dimensions, color=background_color, method=Image.Resampling.LANCZOS)
+            image = compose_image(image, dimensions, settings)
 
         logger.info("=== Image Upload Plugin: Image generation complete ===")
         return image
@@ -102,7 +97,7 @@ class ImageUpload(BasePlugin):
         for image_path in image_locations:
             if os.path.exists(image_path):
                 try:
-                    os.remove(image_path)
+                    delete_upload(image_path)
                     logger.info(f"Deleted uploaded image: {image_path}")
                 except Exception as e:
                     logger.warning(f"Failed to delete uploaded image {image_path}: {e}")
@@ -3,14 +3,24 @@
 import os
 import importlib
 import logging
+import threading
+import time
 from utils.app_utils import resolve_path
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
 PLUGINS_DIR = 'plugins'
+# Plugin configs registered at startup, plugin_id -> plugin config
+PLUGIN_SPECS = {}
+# Plugin instances, created on first use
 PLUGIN_CLASSES = {}
+# Plugin load timings in milliseconds, plugin_id -> {"import_ms", "init_ms"}
+PLUGIN_LOAD_TIMES = {}
+
+_registry_lock = threading.RLock()
 
 def load_plugins(plugins_config):
+    """Registers the plugins, modules are imported and instantiated on first use."""
     plugins_module_path = Path(resolve_path(PLUGINS_DIR))
     for plugin in plugins_config:
         plugin_id = plugin.get('id')
@@ -28,25 +38,90 @@ def load_plugins(plugins_config):
             logger.error(f"Could not find module path {module_path} for '{plugin_id}', skipping.")
             continue
 
-        module_name = f"plugins.{plugin_id}.{plugin_id}"
-        try:
-            module = importlib.import_module(module_name)
-            plugin_class = getattr(module, plugin.get("class"), None)
+        with _registry_lock:
+            PLUGIN_SPECS[plugin_id] = plugin
+            # A re-registered plugin is instantiated again with its new config
+            PLUGIN_CLASSES.pop(plugin_id, None)
+
+    logger.info(f"Registered {len(PLUGIN_SPECS)} plugins")
+
+def _load_plugin(plugin_id):
+    """Imports and instantiates a registered plugin. Returns None if it fails to load."""
+    plugin = PLUGIN_SPECS[plugin_id]
+    module_name = f"plugins.{plugin_id}.{plugin_id}"
+    try:
+        start = time.perf_counter()
+        module = importlib.import_module(module_name)
+        imported = time.perf_counter()
+        plugin_class = getattr(module, plugin.get("class"), None)
+        if not plugin_class:
+            logger.error(f"Plugin class {plugin.get('class')} not found in {module_name}")
+            return None
 
-            if plugin_class:
-                # Create an instance of the plugin class and add it to the plugin_classes dictionary
-                PLUGIN_CLASSES[plugin_id] = plugin_class(plugin)
+        # Create an instance of the plugin class and add it to the plugin_classes dictionary
+        instance = plugin_class(plugin)
+        initialized = time.perf_counter()
+    except Exception as e:
+        # any error raised by the plugin module or its constructor, not only missing imports
+        logger.exception(f"Failed to load plugin {plugin_id} from {module_name}: {e}")
+        return None
 
-        except ImportError as e:
-            logging.error(f"Failed to import plugin module {module_name}: {e}")
+    PLUGIN_LOAD_TIMES[plugin_id] = {
+        "import_ms": (imported - start) * 1000,
+        "init_ms": (initialized - imported) * 1000
+    }
+    logger.info(f"Loaded plugin {plugin_id} in {(initialized - start) * 1000:.0f} ms "
+                f"(import {(imported - start) * 1000:.0f} ms, init {(initialized - imported) * 1000:.0f} ms)")
+    return instance
 
 def get_plugin_instance(plugin_config):
     plugin_id = plugin_config.get("id")
-    # Retrieve the plugin class factory function
-    plugin_class = PLUGIN_CLASSES.get(plugin_id)
-    
-    if plugin_class:
-        # Initialize the plugin with its configuration
-        return plugin_class
+    plugin_instance = PLUGIN_CLASSES.get(plugin_id)
+    if plugin_instance:
+        return plugin_instance
+
+    with _registry_lock:
+        # Another thread may have loaded the plugin while we waited for the lock
+        plugin_instance = PLUGIN_CLASSES.get(plugin_id)
+        if not plugin_instance and plugin_id in PLUGIN_SPECS:
+            plugin_instance = _load_plugin(plugin_id)
+            if plugin_instance:
+                PLUGIN_CLASSES[plugin_id] = plugin_instance
+
+    if plugin_instance:
+        return plugin_instance
+    elif plugin_id in PLUGIN_SPECS:
+        raise ValueError(f"Plugin '{plugin_id}' failed to load.")
     else:
-        raise ValueError(f"Plugin '{plugin_id}' is not registered.")
\ No newline at end of file
+        raise ValueError(f"Plugin '{plugin_id}' is not registered.")
+
+def warm_up_plugins(delay=0):
+    """
+    Loads all registered plugins in a background thread.
+
+    Args:
+        delay: Seconds to wait before loading, so startup and the web server come first
+
+    Returns:
+        The started daemon thread
+    """
+    def warm_up():
+        time.sleep(delay)
+        start = time.perf_counter()
+        for plugin_id, plugin in list(PLUGIN_SPECS.items()):
+            try:
+                get_plugin_instance(plugin)
+            except Exception as e:
+                logger.warning(f"Could not warm up plugin {plugin_id}: {e}")
+        logger.info(f"Plugin warm-up finished in {(time.perf_counter() - start) * 1000:.0f} ms")
+        log_load_report()
+
+    thread = threading.Thread(target=warm_up, name="PluginWarmUp", daemon=True)
+    thread.start()
+    return thread
+
+def log_load_report():
+    """Logs the import and init time of every loaded plugin, slowest first."""
+    timings = sorted(PLUGIN_LOAD_TIMES.items(), key=lambda item: item[1]["import_ms"] + item[1]["init_ms"], reverse=True)
+    lines = [f"{plugin_id:<16} import {t['import_ms']:>7.0f} ms  init {t['init_ms']:>6.0f} ms" for plugin_id, t in timings]
+    logger.info("Plugin load times:\n" + "\n".join(lines))
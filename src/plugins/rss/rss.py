@@ -1,10 +1,10 @@
 from plugins.base_plugin.base_plugin import BasePlugin
+from utils.feed_reader import read_feed
 from PIL import Image
 from io import BytesIO
-import feedparser
-import requests
 import logging
 import html
+import math
 
 logger = logging.getLogger(__name__)
 
@@ -16,6 +16,8 @@ FONT_SIZES = {
     "x-large": 1.3
 }
 
+MAX_ITEMS = 10
+
 class Rss(BasePlugin):
     def generate_settings_template(self):
         template_params = super().generate_settings_template()
@@ -37,20 +39,19 @@ class Rss(BasePlugin):
         template_params = {
             "title": title,
             "include_images": settings.get("includeImages") == "true",
-            "items": items[:10],
+            "items": items[:MAX_ITEMS],
             "font_scale": FONT_SIZES.get(settings.get('fontSize', 'normal'), 1),
             "plugin_settings": settings
         }
 
-        image = self.render_image(dimensions, "rss.html", "rss.css", template_params)
+        # item images are at most 15% of the width wide (.item-image in rss.css)
+        image_box = (math.ceil(dimensions[0] * 0.15 * template_params["font_scale"]), dimensions[1])
+        image = self.render_image(dimensions, "rss.html", "rss.css", template_params, asset_box=image_box)
         return image
     
-    def parse_rss_feed(self, url, timeout=10):
-        resp = requests.get(url, timeout=timeout, headers={"User-Agent": "Mozilla/5.0"})
-        resp.raise_for_status()
-        
-        # Parse the feed content
-        feed = feedparser.parse(resp.content)
+    def parse_rss_feed(self, url, timeout=10, max_items=MAX_ITEMS):
+        # Stream the feed and stop reading once enough items are parsed
+        feed = read_feed(url, max_entries=max_items, timeout=timeout, headers={"User-Agent": "Mozilla/5.0"})
         items = []
 
         for entry in feed.entries:
@@ -20,6 +20,10 @@ class TodoList(BasePlugin):
         template_params['style_settings'] = True
         return template_params
 
+    def compute_input_key(self, settings, device_config, now):
+        # the lists only change with the settings, which are part of the key
+        return "todo_list"
+
     def generate_image(self, settings, device_config):
         dimensions = device_config.get_resolution()
         if device_config.get_config("orientation") == "vertical":
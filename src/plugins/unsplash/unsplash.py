@@ -1,8 +1,9 @@
 from plugins.base_plugin.base_plugin import BasePlugin
-from utils.image_loader import _is_low_resource_device
+from utils.image_loader import ImageVariant, with_query_params
 from utils.http_client import get_http_session
 import logging
 import random
+import requests
 
 logger = logging.getLogger(__name__)
 
@@ -21,12 +22,7 @@ class Unsplash(BasePlugin):
         color = settings.get('color')
         orientation = settings.get('orientation')
 
-        # Automatically determine image size based on device capabilities
-        is_low_resource = _is_low_resource_device()
-        image_size = 'regular' if is_low_resource else 'full'
-        logger.info(f"Device type: {'low-resource' if is_low_resource else 'standard'}, using image size: '{image_size}'")
-
-        logger.info(f"Settings: image_size='{image_size}', content_filter='{content_filter}'")
+        logger.info(f"Settings: content_filter='{content_filter}'")
         if search_query:
             logger.info(f"Search query: '{search_query}'")
         if collections:
@@ -70,14 +66,12 @@ class Unsplash(BasePlugin):
                     logger.warning(f"No images found for search query: '{search_query}'")
                     raise RuntimeError("No images found for the given search query.")
                 logger.info(f"Found {len(results)} images matching search query")
-                # Use selected image size (with automatic downgrade for low-RAM devices)
-                selected_photo = random.choice(results)
-                image_url = selected_photo["urls"][image_size]
+                photo = random.choice(results)
                 logger.debug(f"Selected random image from {len(results)} results")
             else:
-                # Use selected image size (with automatic downgrade for low-RAM devices)
-                image_url = data["urls"][image_size]
+                photo = data
                 logger.debug("Retrieved random image URL")
+            photo_urls = photo["urls"]
 
         except requests.exceptions.RequestException as e:
             logger.error(f"Error fetching image from Unsplash API: {e}")
@@ -92,10 +86,19 @@ class Unsplash(BasePlugin):
             dimensions = dimensions[::-1]
             logger.debug(f"Vertical orientation detected, dimensions: {dimensions[0]}x{dimensions[1]}")
 
-        logger.info(f"Fetching image (size: {image_size}): {image_url}")
+        # Let Unsplash resize the raw image to the display size, the full size image is the fallback
+        variants = [
+            ImageVariant(with_query_params(photo_urls["raw"], {
+                "w": dimensions[0],
+                "h": dimensions[1],
+                "fit": "crop"
+            }), dimensions[0], dimensions[1]),
+            ImageVariant(photo_urls["full"], photo.get("width"), photo.get("height"))
+        ]
+        logger.info(f"Fetching image: {variants[0].url}")
 
         # Use adaptive image loader for memory-efficient processing
-        image = self.image_loader.from_url(image_url, dimensions, timeout_ms=40000)
+        image = self.image_loader.from_variants(variants, dimensions, timeout_ms=40000)
 
         if not image:
             logger.error("Failed to load and process image")
@@ -0,0 +1,189 @@
+"""
+Hourly weather chart, laid out in Python and drawn as inline SVG.
+
+Replaces the chart.js canvas of weather.html: the temperature curve, the
+precipitation bars and the positions of every label are computed here, so the
+screenshot browser only paints static markup instead of loading chart.js and
+running it before the capture.
+
+The plot uses a viewBox of one unit per hour horizontally and 0-100
+vertically, stretched to the chart area with preserveAspectRatio="none".
+Label positions are returned as percentages of the plot area.
+"""
+
+import math
+
+# Matches the look of the previous chart.js chart
+CURVE_TENSION = 0.5
+PLOT_HEIGHT = 100
+# .chart-container is 24dvh tall, the plot takes most of it
+CHART_HEIGHT_RATIO = 0.24
+PLOT_WIDTH_RATIO = 0.9
+MIN_LABEL_WIDTH = 60  # pixels per x axis label before labels are skipped
+RAIN_LABEL_MIN_BAR = 25  # bars shorter than this (pixels) get the rain amount above them
+RAIN_UNITS = {
+    "imperial": (0.0035, "in"),
+}
+DEFAULT_RAIN_UNIT = (0.09, "mm")
+
+
+def _fmt(value):
+    return f"{value:.2f}".rstrip("0").rstrip(".")
+
+
+def _percent(index, count):
+    """Horizontal center of the hour at index, in percent of the plot width."""
+    return round((index + 0.5) / count * 100, 2)
+
+
+def spline_control_points(points, tension=CURVE_TENSION, bounds=None):
+    """Computes cubic bezier control points for a smooth curve through points.
+
+    Same construction as chart.js (splineCurve with capBezierPoints), so the
+    curve keeps the shape of the previous chart.
+
+    Args:
+        points: List of (x, y) tuples in pixels.
+        tension: Curve tension, 0 draws straight lines.
+        bounds: Optional (top, bottom) pixel range control points are capped to.
+
+    Returns:
+        list: A (previous, next) pair of control points for each point.
+    """
+    controls = []
+    for index, current in enumerate(points):
+        previous = points[index - 1] if index > 0 else current
+        following = points[index + 1] if index < len(points) - 1 else current
+
+        d01 = math.dist(previous, current)
+        d12 = math.dist(current, following)
+        total = d01 + d12
+        s01 = d01 / total if total else 0
+        s12 = d12 / total if total else 0
+
+        dx = following[0] - previous[0]
+        dy = following[1] - previous[1]
+        before = (current[0] - tension * s01 * dx, current[1] - tension * s01 * dy)
+        after = (current[0] + tension * s12 * dx, current[1] + tension * s12 * dy)
+        if bounds:
+            top, bottom = bounds
+            before = (before[0], min(max(before[1], top), bottom))
+            after = (after[0], min(max(after[1], top), bottom))
+        controls.append((before, after))
+    return controls
+
+
+def build_curve_path(points, tension=CURVE_TENSION, bounds=None, scale=(1, 1)):
+    """Builds SVG path data through points as a chain of cubic bezier segments.
+
+    Args:
+        points: List of (x, y) tuples in pixels.
+        tension: Curve tension, see spline_control_points.
+        bounds: Optional (top, bottom) pixel range control points are capped to.
+        scale: (x, y) pixels per path unit, coordinates are divided by it.
+
+    Returns:
+        str: The path data, empty when there are no points.
+    """
+    if not points:
+        return ""
+    x_scale, y_scale = scale
+
+    def point(xy):
+        return f"{_fmt(xy[0] / x_scale)},{_fmt(xy[1] / y_scale)}"
+
+    controls = spline_control_points(points, tension, bounds)
+    commands = [f"M{point(points[0])}"]
+    for index in range(1, len(points)):
+        commands.append(f"C{point(controls[index - 1][1])} {point(controls[index][0])} {point(points[index])}")
+    return " ".join(commands)
+
+
+def build_hourly_chart(hourly_forecast, units, settings, dimensions):
+    """Lays out the hourly temperature and precipitation chart.
+
+    Args:
+        hourly_forecast: List of hour dicts with time, temperature, precipitation (0-1),
+            rain and icon, as returned by parse_hourly and parse_open_meteo_hourly.
+        units: Weather units, "standard", "metric" or "imperial".
+        settings: Plugin settings (displayRain, displayGraphIcons, graphIconStep).
+        dimensions: (width, height) of the rendered image.
+
+    Returns:
+        dict: SVG paths in plot units and label positions in percent, or None
+            when there is no hourly forecast.
+    """
+    if not hourly_forecast:
+        return None
+
+    count = len(hourly_forecast)
+    width, height = dimensions
+    plot_width = width * PLOT_WIDTH_RATIO
+    plot_height = height * CHART_HEIGHT_RATIO
+    # convert between plot units and pixels so the curve is smoothed at the display aspect ratio
+    x_scale = plot_width / count
+    y_scale = plot_height / PLOT_HEIGHT
+
+    temperatures = [hour["temperature"] for hour in hourly_forecast]
+    min_temp, max_temp = min(temperatures), max(temperatures)
+    temp_range = max_temp - min_temp
+
+    def temperature_y(value):
+        if not temp_range:
+            return PLOT_HEIGHT / 2
+        return (max_temp - value) / temp_range * PLOT_HEIGHT
+
+    # points sit at the center of each hour, like a chart.js category axis with offset
+    pixels = [((index + 0.5) * x_scale, temperature_y(value) * y_scale) for index, value in enumerate(temperatures)]
+    temperature_line = build_curve_path(pixels, bounds=(0, plot_height), scale=(x_scale, y_scale))
+    temperature_area = f"{temperature_line} L{_fmt(count - 0.5)},{PLOT_HEIGHT} L0.5,{PLOT_HEIGHT} Z"
+
+    bars, tops, rain = [], [], []
+    threshold, rain_unit = RAIN_UNITS.get(units, DEFAULT_RAIN_UNIT)
+    for index, hour in enumerate(hourly_forecast):
+        probability = min(max(hour.get("precipitation") or 0, 0), 1)
+        top = PLOT_HEIGHT - probability * PLOT_HEIGHT
+        if probability:
+            bars.append(f"M{index},{_fmt(top)}H{index + 1}V{PLOT_HEIGHT}H{index}Z")
+            tops.append(f"M{index},{_fmt(top)}H{index + 1}")
+
+        amount = hour.get("rain") or 0
+        if settings.get("displayRain") == "true" and amount > threshold:
+            rain.append({
+                "amount": f"{amount:.2f}",
+                "unit": rain_unit,
+                "left": _percent(index, count),
+                "top": round(top, 2),
+                "inside": probability * plot_height >= RAIN_LABEL_MIN_BAR,
+            })
+
+    label_step = max(1, math.ceil(count * MIN_LABEL_WIDTH / plot_width)) if plot_width else 1
+    labels = [
+        {"text": hour["time"], "left": _percent(index, count)}
+        for index, hour in enumerate(hourly_forecast) if index % label_step == 0
+    ]
+
+    icons = []
+    if settings.get("displayGraphIcons") == "true":
+        icon_step = max(1, int(settings.get("graphIconStep") or 2))
+        icons = [
+            {"src": hour["icon"].replace("\\", "/"), "left": _percent(index, count)}
+            for index, hour in enumerate(hourly_forecast) if index % icon_step == 0
+        ]
+
+    return {
+        "columns": count,
+        "height": PLOT_HEIGHT,
+        "temperature_line": temperature_line,
+        "temperature_area": temperature_area,
+        # the area gradient fades out 10px below the lowest temperature
+        "temperature_gradient_end": _fmt(PLOT_HEIGHT + 10 / y_scale),
+        "precipitation_bars": "".join(bars),
+        "precipitation_tops": "".join(tops),
+        "min_temperature": min_temp,
+        "max_temperature": max_temp,
+        "degrees": units != "standard",
+        "labels": labels,
+        "rain": rain,
+        "icons": icons,
+    }
@@ -1,4 +1,6 @@
 from plugins.base_plugin.base_plugin import BasePlugin
+from plugins.weather.chart import build_hourly_chart
+from utils.asset_bundle import bundle_icon
 from PIL import Image
 import os
 import requests
@@ -10,6 +12,10 @@ from io import BytesIO
 import math
 
 logger = logging.getLogger(__name__)
+
+# Largest displayed icon sizes relative to the shorter panel side
+CURRENT_ICON_RATIO = 0.4
+ICON_RATIO = 0.2
         
 def get_moon_phase_name(phase_age: float) -> str:
     """Determines the name of the lunar phase based on the age of the moon."""
@@ -122,6 +128,9 @@ class Weather(BasePlugin):
             dimensions = dimensions[::-1]
 
         template_params["plugin_settings"] = settings
+        self.bundle_icons(template_params, dimensions)
+        if settings.get("displayGraph") == "true":
+            template_params["chart"] = build_hourly_chart(template_params.get("hourly_forecast"), units, settings, dimensions)
 
         # Add last refresh time
         now = datetime.now(tz)
@@ -137,6 +146,20 @@ class Weather(BasePlugin):
             raise RuntimeError("Failed to take screenshot, please check logs.")
         return image
 
+    def bundle_icons(self, template_params, dimensions):
+        """Replaces the 512px icons with copies downscaled to the size they are displayed at."""
+        panel_size = min(dimensions)
+        current_icon = template_params.get("current_day_icon")
+        if current_icon:
+            template_params["current_day_icon"] = bundle_icon(current_icon, panel_size * CURRENT_ICON_RATIO)
+
+        icon_size = panel_size * ICON_RATIO
+        items = template_params.get("data_points", []) + template_params.get("forecast", []) + template_params.get("hourly_forecast", [])
+        for item in items:
+            for key in ("icon", "moon_phase_icon"):
+                if item.get(key):
+                    item[key] = bundle_icon(item[key], icon_size)
+
     def parse_weather_data(self, weather_data, aqi_data, tz, units, time_format, lat):
         current = weather_data.get("current")
         daily_forecast = weather_data.get("daily", [])
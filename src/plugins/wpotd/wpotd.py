@@ -16,16 +16,17 @@ Flow:
 1. Fetch the date to use for the Picture of the Day (POTD) based on settings. (_determine_date)
 2. Make an API request to fetch the POTD data for that date. (_fetch_potd)
 3. Extract the image filename from the response. (_fetch_potd)
-4. Make another API request to get the image URL. (_fetch_image_src)
-5. Download the image from the URL. (_download_image)
-6. Optionally resize the image to fit the device dimensions. (_shrink_to_fit))
+4. Make another API request to get the image URL and a thumbnail sized for the display. (_fetch_image_variants)
+5. Download the smallest variant covering the display. (_download_image)
+6. Optionally resize the image to fit the device dimensions.
 """
 
 from plugins.base_plugin.base_plugin import BasePlugin
-from PIL import Image, UnidentifiedImageError
-from io import BytesIO
+from PIL import Image
 from utils.http_client import get_http_session
+from utils.image_loader import ImageVariant
 import logging
+import math
 from random import randint
 from datetime import datetime, timedelta, date
 from functools import lru_cache
@@ -49,11 +50,6 @@ class Wpotd(BasePlugin):
         logger.info(f"Fetching Wikipedia Picture of the Day for: {datetofetch}")
         logger.debug(f"Settings: shrink_to_fit={settings.get('shrinkToFitWpotd', 'false')}, randomize={settings.get('randomizeWpotd', 'false')}")
 
-        data = self._fetch_potd(datetofetch)
-        picurl = data["image_src"]
-        logger.info(f"Image URL: {picurl}")
-        logger.debug(f"Image filename: {data.get('filename', 'Unknown')}")
-
         # Get dimensions
         max_width, max_height = device_config.get_resolution()
         if device_config.get_config("orientation") == "vertical":
@@ -62,15 +58,20 @@ class Wpotd(BasePlugin):
 
         dimensions = (max_width, max_height)
 
+        data = self._fetch_potd(datetofetch, dimensions)
+        picurl = data["image_src"]
+        logger.info(f"Image URL: {picurl}")
+        logger.debug(f"Image filename: {data.get('filename', 'Unknown')}")
+
         # Use adaptive loader if shrink-to-fit is enabled
         shrink_to_fit = settings.get("shrinkToFitWpotd") == "true"
         logger.debug(
             f"Shrink-to-fit={'enabled' if shrink_to_fit else 'disabled'}; "
-            f"{'using adaptive loader' if shrink_to_fit else 'downloading original size'}"
+            f"{'resizing to display' if shrink_to_fit else 'keeping downloaded size'}"
         )
 
         image = self._download_image(
-            picurl,
+            data["variants"],
             dimensions=dimensions,
             resize=shrink_to_fit,
         )
@@ -83,6 +84,11 @@ class Wpotd(BasePlugin):
         logger.info("=== Wikipedia POTD Plugin: Image generation complete ===")
         return image
 
+    def compute_input_key(self, settings: Dict[str, Any], device_config, now) -> Any:
+        if settings.get("randomizeWpotd") == "true":
+            return None
+        return self._determine_date(settings).isoformat()
+
     def _determine_date(self, settings: Dict[str, Any]) -> date:
         if settings.get("randomizeWpotd") == "true":
             start = datetime(2015, 1, 1)
@@ -93,38 +99,32 @@ class Wpotd(BasePlugin):
         else:
             return datetime.today().date()
 
-    def _download_image(self, url: str, dimensions: tuple = None, resize: bool = False) -> Image.Image:
+    def _download_image(self, variants: list, dimensions: tuple, resize: bool = False) -> Image.Image:
         """
-        Download image from URL, optionally resizing with adaptive loader.
+        Download the smallest image variant covering the dimensions, optionally resizing with adaptive loader.
 
         Args:
-            url: Image URL
-            dimensions: Target dimensions if resizing
+            variants: Image variants ordered from smallest to largest
+            dimensions: Target dimensions
             resize: Whether to use adaptive resizing
         """
-        try:
-            if url.lower().endswith(".svg"):
-                logger.warning("SVG format is not supported by Pillow. Skipping image download.")
-                raise RuntimeError("Unsupported image format: SVG.")
-
-            if resize and dimensions:
-                # Use adaptive loader for memory-efficient processing
-                return self.image_loader.from_url(url, dimensions, timeout_ms=10000, headers=self.HEADERS)
-            else:
-                # Original behavior: download without resizing
-                session = get_http_session()
-                response = session.get(url, headers=self.HEADERS, timeout=10)
-            response.raise_for_status()
-            return Image.open(BytesIO(response.content))
+        variants = [variant for variant in variants if not variant.url.lower().endswith(".svg")]
+        if not variants:
+            logger.warning("SVG format is not supported by Pillow. Skipping image download.")
+            raise RuntimeError("Unsupported image format: SVG.")
 
-        except UnidentifiedImageError as e:
-            logger.error(f"Unsupported image format at {url}: {str(e)}")
-            raise RuntimeError("Unsupported image format.")
+        try:
+            image = self.image_loader.from_variants(variants, dimensions, timeout_ms=10000, resize=resize, headers=self.HEADERS)
         except Exception as e:
-            logger.error(f"Failed to load WPOTD image from {url}: {str(e)}")
+            logger.error(f"Failed to load WPOTD image from {variants[-1].url}: {str(e)}")
+            raise RuntimeError("Failed to load WPOTD image.")
+
+        if image is None:
+            logger.error(f"Unsupported image format or download failure at {variants[-1].url}")
             raise RuntimeError("Failed to load WPOTD image.")
+        return image
 
-    def _fetch_potd(self, cur_date: date) -> Dict[str, Any]:
+    def _fetch_potd(self, cur_date: date, dimensions: tuple) -> Dict[str, Any]:
         title = f"Template:POTD/{cur_date.isoformat()}"
         params = {
             "action": "query",
@@ -141,31 +141,59 @@ class Wpotd(BasePlugin):
             logger.error(f"Failed to retrieve POTD filename for {cur_date}: {e}")
             raise RuntimeError("Failed to retrieve POTD filename.")
 
-        image_src = self._fetch_image_src(filename)
+        variants = self._fetch_image_variants(filename, dimensions)
 
         return {
             "filename": filename,
-            "image_src": image_src,
+            "image_src": variants[-1].url,
+            "variants": variants,
             "image_page_url": f"https://en.wikipedia.org/wiki/{title}",
             "date": cur_date
         }
 
-    def _fetch_image_src(self, filename: str) -> str:
+    def _fetch_image_variants(self, filename: str, dimensions: tuple) -> list:
+        """
+        Returns the image variants for the file: a thumbnail rendered by Wikimedia at the display
+        width (widened if needed to cover the display height) and the original file.
+        """
+        info = self._fetch_image_info(filename, dimensions[0])
+        original = ImageVariant(info["url"], info.get("width"), info.get("height"), info.get("size"))
+        variants = [original]
+
+        thumb = self._thumbnail_variant(info)
+        if thumb and thumb.height and thumb.height < dimensions[1] and original.get_size():
+            # thumbnails are scaled by width, request a wider one so that the height is covered as well
+            width, height = original.get_size()
+            thumb_width = math.ceil(dimensions[1] * width / height)
+            if thumb_width < width:
+                thumb = self._thumbnail_variant(self._fetch_image_info(filename, thumb_width))
+        if thumb and thumb.url != original.url:
+            variants.insert(0, thumb)
+        return variants
+
+    def _fetch_image_info(self, filename: str, thumb_width: int) -> Dict[str, Any]:
         params = {
             "action": "query",
             "format": "json",
             "prop": "imageinfo",
-            "iiprop": "url",
+            "iiprop": "url|size",
+            "iiurlwidth": thumb_width,
             "titles": filename
         }
         data = self._make_request(params)
         try:
             page = next(iter(data["query"]["pages"].values()))
-            return page["imageinfo"][0]["url"]
+            return page["imageinfo"][0]
         except (KeyError, IndexError, StopIteration) as e:
             logger.error(f"Failed to retrieve image URL for {filename}: {e}")
             raise RuntimeError("Failed to retrieve image URL.")
 
+    @staticmethod
+    def _thumbnail_variant(info: Dict[str, Any]):
+        if not info.get("thumburl"):
+            return None
+        return ImageVariant(info["thumburl"], info.get("thumbwidth"), info.get("thumbheight"))
+
     def _make_request(self, params: Dict[str, Any]) -> Dict[str, Any]:
         try:
             session = get_http_session()
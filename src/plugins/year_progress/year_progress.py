@@ -1,8 +1,9 @@
 from plugins.base_plugin.base_plugin import BasePlugin
 from PIL import Image
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 import logging
 import pytz
+from utils.time_utils import localize
 
 logger = logging.getLogger(__name__)
 class YearProgress(BasePlugin):
@@ -11,6 +12,37 @@ class YearProgress(BasePlugin):
         template_params['style_settings'] = True
         return template_params
 
+    def compute_input_key(self, settings, device_config, now):
+        # the image only changes when the rounded percentage or days left do
+        return self.get_progress(now)
+
+    def next_change_time(self, settings, now):
+        # the first time the rounded percentage or days left change, or the new year
+        start_of_year = localize(datetime(now.year, 1, 1), now.tzinfo)
+        start_of_next_year = localize(datetime(now.year + 1, 1, 1), now.tzinfo)
+        progress = self.get_progress(now)
+        day = timedelta(days=1)
+
+        percent_change = start_of_year + (start_of_next_year - start_of_year) * (progress["year_percent"] + 0.5) / 100
+        days_left_change = start_of_next_year - day * (progress["days_left"] - 0.5)
+        candidates = [change for change in (percent_change, days_left_change) if change > now]
+        # a second past the boundary, so rounding has moved on
+        return min(candidates + [start_of_next_year]) + timedelta(seconds=1)
+
+    def get_progress(self, current_time):
+        start_of_year = localize(datetime(current_time.year, 1, 1), current_time.tzinfo)
+        start_of_next_year = localize(datetime(current_time.year + 1, 1, 1), current_time.tzinfo)
+
+        total_days = (start_of_next_year - start_of_year).days
+        days_left = (start_of_next_year - current_time).total_seconds() / (24 * 3600)
+        elapsed_days = (current_time - start_of_year).total_seconds() / (24 * 3600)
+
+        return {
+            "year": current_time.year,
+            "year_percent": round((elapsed_days / total_days) * 100),
+            "days_left": round(days_left),
+        }
+
     def generate_image(self, settings, device_config):
         dimensions = device_config.get_resolution()
         if device_config.get_config("orientation") == "vertical":
@@ -20,17 +52,8 @@ class YearProgress(BasePlugin):
         tz = pytz.timezone(timezone)
         current_time = datetime.now(tz)
 
-        start_of_year = datetime(current_time.year, 1, 1, tzinfo=tz)
-        start_of_next_year = datetime(current_time.year + 1, 1, 1, tzinfo=tz)
-
-        total_days = (start_of_next_year - start_of_year).days
-        days_left = (start_of_next_year - current_time).total_seconds() / (24 * 3600)
-        elapsed_days = (current_time - start_of_year).total_seconds() / (24 * 3600)
-
         template_params = {
-            "year": current_time.year,
-            "year_percent": round((elapsed_days / total_days) * 100),
-            "days_left": round(days_left),
+            **self.get_progress(current_time),
             "plugin_settings": settings
         }
         
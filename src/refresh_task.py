@@ -1,17 +1,103 @@
 import threading
 import time
 import os
+import json
+import hashlib
 import logging
+import uuid
 import psutil
 import pytz
+from collections import OrderedDict
 from datetime import datetime, timezone
 from plugins.plugin_registry import get_plugin_instance
 from utils.image_utils import compute_image_hash
+from utils.image_writer import get_image_writer
+from utils.image_memory_cache import get_image_memory_cache
+from utils.event_stream import get_event_stream
 from model import RefreshInfo, PlaylistManager
-from PIL import Image
 
 logger = logging.getLogger(__name__)
 
+# Shortest wait before refreshing a displayed plugin instance whose image went stale
+MIN_SLEEP_SECONDS = 1
+
+# Manual update jobs waiting to run, and finished jobs kept for status requests
+MAX_PENDING_JOBS = 8
+MAX_FINISHED_JOBS = 32
+
+
+class JobQueueFull(RuntimeError):
+    """Raised when too many manual updates are already waiting."""
+
+
+class RefreshJob:
+    """A manual update queued on the refresh task.
+
+    Attributes:
+        id (str): Job id.
+        key (tuple): Coalescing key, a newer job with the same key supersedes this one while queued.
+        refresh_action (RefreshAction): The refresh to run.
+        status (str): 'queued', 'running', 'displayed', 'skipped', 'failed' or 'superseded'.
+        refresh_info (dict): Refresh metadata once the job ran.
+        error (Exception): The exception if the job failed.
+    """
+
+    DONE_STATUSES = ("displayed", "skipped", "failed", "superseded")
+
+    def __init__(self, refresh_action):
+        self.id = uuid.uuid4().hex
+        self.key = refresh_action.get_job_key()
+        self.refresh_action = refresh_action
+        self.status = "queued"
+        self.refresh_info = None
+        self.error = None
+        self.superseded_by = None
+        self.created_time = datetime.now(timezone.utc).isoformat()
+        self.started_time = None
+        self.finished_time = None
+        self._done = threading.Event()
+
+    def start(self):
+        self.status = "running"
+        self.started_time = datetime.now(timezone.utc).isoformat()
+
+    def finish(self, status, refresh_info):
+        self.refresh_info = refresh_info
+        self._complete(status)
+
+    def fail(self, error):
+        self.error = error
+        self._complete("failed")
+
+    def supersede(self, job):
+        self.superseded_by = job.id
+        self._complete("superseded")
+
+    def _complete(self, status):
+        self.status = status
+        self.finished_time = datetime.now(timezone.utc).isoformat()
+        self._done.set()
+
+    def is_done(self):
+        return self._done.is_set()
+
+    def wait(self, timeout=None):
+        """Blocks until the job finished, returns False on timeout."""
+        return self._done.wait(timeout)
+
+    def to_dict(self):
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "done": self.is_done(),
+            "refresh_info": self.refresh_info or self.refresh_action.get_refresh_info(),
+            "error": str(self.error) if self.error else None,
+            "superseded_by": self.superseded_by,
+            "created_time": self.created_time,
+            "started_time": self.started_time,
+            "finished_time": self.finished_time,
+        }
+
 class RefreshTask:
     """Handles the logic for refreshing the display using a background thread."""
 
@@ -23,11 +109,12 @@ class RefreshTask:
         self.lock = threading.Lock()
         self.condition = threading.Condition(self.lock)
         self.running = False
-        self.manual_update_request = ()
+        # set by stop(), jobs queued before start() still run once the thread starts
+        self.stopped = False
 
-        self.refresh_event = threading.Event()
-        self.refresh_event.set()
-        self.refresh_result = {}
+        # manual update jobs waiting to run by coalescing key, and recent jobs by id
+        self.pending_jobs = OrderedDict()
+        self.jobs = OrderedDict()
 
     def start(self):
         """Starts the background thread for refreshing the display."""
@@ -35,12 +122,20 @@ class RefreshTask:
             logger.info("Starting refresh task")
             self.thread = threading.Thread(target=self._run, daemon=True)
             self.running = True
+            self.stopped = False
             self.thread.start()
 
     def stop(self):
-        """Stops the refresh task by notifying the background thread to exit."""
+        """Stops the refresh task by notifying the background thread to exit.
+
+        Queued jobs fail, so nothing waits for them forever. A running job still finishes.
+        """
         with self.condition:
             self.running = False
+            self.stopped = True
+            for job in self.pending_jobs.values():
+                job.fail(RuntimeError("Refresh task stopped before the update ran"))
+            self.pending_jobs.clear()
             self.condition.notify_all()  # Wake the thread to let it exit
         if self.thread:
             logger.info("Stopping refresh task")
@@ -50,14 +145,16 @@ class RefreshTask:
         """Background task that manages the periodic refresh of the display.
 
         This function runs in a loop, sleeping for a configured duration (`plugin_cycle_interval_seconds`) or until
-        manually triggered via `manual_update()`. Determines the next plugin to refresh based on active playlists and
+        manually triggered via `submit()`. Determines the next plugin to refresh based on active playlists and
         updates the display accordingly.
 
         Workflow:
-        1. Waits for the configured sleep duration or until notified of a manual update.
-        2. Checks if a manual update has been requested:
-        - If so, refreshes the specified plugin immediately.
+        1. Waits for the configured sleep duration, until the displayed plugin instance's image goes stale
+           (see `BasePlugin.next_change_time`), or until notified of a manual update.
+        2. Checks if a manual update job is queued (see `submit()`):
+        - If so, runs the oldest one immediately and records its result on the job.
         3. Otherwise, determines the next plugin to refresh based on the active playlist and generates an image.
+        - If it is not time to cycle the playlist, refreshes the displayed plugin instance if its image went stale.
         4. Compares the image hash with the last displayed image hash.
         - If the image has changed, updates the display.
         - If the image is the same, skips the refresh.
@@ -67,88 +164,154 @@ class RefreshTask:
         Handles any exceptions that occur during the refresh process and ensures the refresh event is set 
         to indicate completion.
 
+        Each step is published to the web UI's event stream (scheduled, generating, displayed, skipped, error).
+
         Exceptions:
         - Captures and logs any unexpected errors during execution to prevent the thread from exiting.
         """
         while True:
+            refresh_action = None
+            job = None
             try:
                 with self.condition:
                     sleep_time = self.device_config.get_config("plugin_cycle_interval_seconds", default=60*60)
+                    sleep_time = self._get_sleep_time(sleep_time)
 
-                    # Wait for sleep_time or until notified
-                    self.condition.wait(timeout=sleep_time)
-                    self.refresh_result = {}
-                    self.refresh_event.clear()
+                    # Wait for sleep_time or until notified, queued jobs are run right away
+                    if not self.pending_jobs:
+                        self.condition.wait(timeout=sleep_time)
 
                     # Exit if `stop()` is called
                     if not self.running:
                         break
 
-                    playlist_manager = self.device_config.get_playlist_manager()
-                    latest_refresh = self.device_config.get_refresh_info()
-                    current_dt = self._get_current_datetime()
+                    if self.pending_jobs:
+                        # handle the oldest manual update request, the lock is released while it runs
+                        _, job = self.pending_jobs.popitem(last=False)
+                        job.start()
 
-                    refresh_action = None
-                    if self.manual_update_request:
-                        # handle immediate update request
-                        logger.info("Manual update requested")
-                        refresh_action = self.manual_update_request
-                        self.manual_update_request = ()
-                    else:
+                playlist_manager = self.device_config.get_playlist_manager()
+                latest_refresh = self.device_config.get_refresh_info()
+                current_dt = self._get_current_datetime()
 
-                        if self.device_config.get_config("log_system_stats"):
-                            self.log_system_stats()
+                if job:
+                    logger.info(f"Manual update requested | job_id: {job.id}")
+                    refresh_action = job.refresh_action
+                else:
 
-                        # handle refresh based on playlists
-                        logger.info(f"Running interval refresh check. | current_time: {current_dt.strftime('%Y-%m-%d %H:%M:%S')}")
-                        playlist, plugin_instance = self._determine_next_plugin(playlist_manager, latest_refresh, current_dt)
-                        if plugin_instance:
-                            refresh_action = PlaylistRefresh(playlist, plugin_instance)
+                    if self.device_config.get_config("log_system_stats"):
+                        self.log_system_stats()
 
+                    # handle refresh based on playlists
+                    logger.info(f"Running interval refresh check. | current_time: {current_dt.strftime('%Y-%m-%d %H:%M:%S')}")
+                    playlist, plugin_instance = self._determine_next_plugin(playlist_manager, latest_refresh, current_dt)
+                    if plugin_instance:
+                        refresh_action = PlaylistRefresh(playlist, plugin_instance)
+                    else:
+                        playlist, plugin_instance = self._determine_stale_plugin(playlist_manager, latest_refresh, current_dt)
+                        if plugin_instance:
+                            # keep the cycle's refresh time so the playlist still advances on schedule
+                            refresh_action = PlaylistRefresh(playlist, plugin_instance, cycle_time=latest_refresh.refresh_time)
                     if refresh_action:
-                        plugin_config = self.device_config.get_plugin(refresh_action.get_plugin_id())
-                        if plugin_config is None:
-                            logger.error(f"Plugin config not found for '{refresh_action.get_plugin_id()}'.")
-                            continue
-                        plugin = get_plugin_instance(plugin_config)
-                        image = refresh_action.execute(plugin, self.device_config, current_dt)
-                        image_hash = compute_image_hash(image)
-
-                        refresh_info = refresh_action.get_refresh_info()
-                        refresh_info.update({"refresh_time": current_dt.isoformat(), "image_hash": image_hash})
-                        # check if image is the same as current image
-                        if image_hash != latest_refresh.image_hash:
-                            logger.info(f"Updating display. | refresh_info: {refresh_info}")
-                            self.display_manager.display_image(image, image_settings=plugin.config.get("image_settings", []))
-                        else:
-                            logger.info(f"Image already displayed, skipping refresh. | refresh_info: {refresh_info}")
-
-                        # update latest refresh data in the device config
-                        self.device_config.refresh_info = RefreshInfo(**refresh_info)
-                        self.device_config.write_config()
+                        self.publish_event("scheduled", refresh_action)
+
+                if refresh_action:
+                    plugin_config = self.device_config.get_plugin(refresh_action.get_plugin_id())
+                    if plugin_config is None:
+                        raise RuntimeError(f"Plugin config not found for '{refresh_action.get_plugin_id()}'.")
+                    plugin = get_plugin_instance(plugin_config)
+                    self.publish_event("generating", refresh_action, job_id=job.id if job else None)
+                    image = refresh_action.execute(plugin, self.device_config, current_dt)
+                    # playlist refreshes know the hash of images they did not regenerate
+                    image_hash = refresh_action.image_hash or compute_image_hash(image)
+
+                    refresh_info = refresh_action.get_refresh_info()
+                    refresh_info.setdefault("refresh_time", current_dt.isoformat())
+                    refresh_info["image_hash"] = image_hash
+                    # check if image is the same as current image
+                    if image_hash != latest_refresh.image_hash:
+                        logger.info(f"Updating display. | refresh_info: {refresh_info}")
+                        self.display_manager.display_image(image, image_settings=plugin.config.get("image_settings", []),
+                                                          image_hash=image_hash)
+                        event_type = "displayed"
+                    else:
+                        logger.info(f"Image already displayed, skipping refresh. | refresh_info: {refresh_info}")
+                        event_type = "skipped"
+
+                    # the web UI loads the new images once it is notified
+                    get_image_writer().flush()
+
+                    # update latest refresh data in the device config
+                    self.device_config.refresh_info = RefreshInfo(**refresh_info)
+                    self.device_config.write_config()
+
+                    get_event_stream().publish(event_type, {"refresh_info": refresh_info, "image_hash": image_hash,
+                                                            "job_id": job.id if job else None})
+                    if job:
+                        job.finish(event_type, refresh_info)
 
             except Exception as e:
                 logger.exception('Exception during refresh')
-                self.refresh_result["exception"] = e  # Capture exception
-            finally:
-                self.refresh_event.set()
+                self.publish_event("error", refresh_action, error=str(e), job_id=job.id if job else None)
+                if job:
+                    job.fail(e)
 
-    def manual_update(self, refresh_action):
-        """Manually triggers an update for the specified plugin id and plugin settings by notifying the background process."""
-        if self.running:
-            with self.condition:
-                self.manual_update_request = refresh_action
-                self.refresh_result = {}
-                self.refresh_event.clear()
+    def submit(self, refresh_action):
+        """Queues a manual update and returns its job right away.
 
-                self.condition.notify_all()  # Wake the thread to process manual update
+        A queued job for the same plugin instance (or plugin settings page) is superseded by
+        the new one, only the latest request is run.
 
-            self.refresh_event.wait()
-            if self.refresh_result.get("exception"):
-                raise self.refresh_result.get("exception")
+        Raises:
+            JobQueueFull: If MAX_PENDING_JOBS other jobs are already waiting.
+            RuntimeError: If the refresh task was stopped.
+        """
+        job = RefreshJob(refresh_action)
+        with self.condition:
+            if self.stopped:
+                raise RuntimeError("Refresh task is stopped")
+            superseded = self.pending_jobs.pop(job.key, None)
+            if superseded is None and len(self.pending_jobs) >= MAX_PENDING_JOBS:
+                raise JobQueueFull("Too many pending updates, try again once the display has refreshed.")
+            if superseded:
+                logger.info(f"Superseding queued update | job_id: {superseded.id} | new_job_id: {job.id}")
+                superseded.supersede(job)
+
+            self.pending_jobs[job.key] = job
+            self.jobs[job.id] = job
+            self._prune_jobs()
+            self.publish_event("scheduled", refresh_action, job_id=job.id)
+            self.condition.notify_all()  # Wake the thread to process the job
+        return job
+
+    def get_job(self, job_id):
+        """Returns a queued, running or recently finished job by id, or None."""
+        with self.condition:
+            return self.jobs.get(job_id)
+
+    def _prune_jobs(self):
+        """Forgets the oldest finished jobs beyond MAX_FINISHED_JOBS."""
+        finished = [job_id for job_id, job in self.jobs.items() if job.is_done()]
+        for job_id in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+            del self.jobs[job_id]
+
+    def manual_update(self, refresh_action):
+        """Manually triggers an update for the specified plugin id and plugin settings and waits for it to finish."""
+        if self.running:
+            job = self.submit(refresh_action)
+            job.wait()
+            if job.error:
+                raise job.error
         else:
             logger.warning("Background refresh task is not running, unable to do a manual update")
 
+    @staticmethod
+    def publish_event(event_type, refresh_action=None, **data):
+        """Publishes a refresh lifecycle event for the web UI."""
+        if refresh_action:
+            data["refresh_info"] = refresh_action.get_refresh_info()
+        get_event_stream().publish(event_type, data)
+
     def signal_config_change(self):
         """Notify the background thread that config has changed (e.g., interval updated)."""
         if self.running:
@@ -186,7 +349,42 @@ class RefreshTask:
         logger.info(f"Determined next plugin. | active_playlist: {playlist.name} | plugin_instance: {plugin.name}")
 
         return playlist, plugin
-    
+
+    def _get_displayed_plugin(self, playlist_manager, latest_refresh_info):
+        """Returns the playlist and plugin instance currently on display, if the latest refresh was a playlist refresh."""
+        if latest_refresh_info.refresh_type != "Playlist":
+            return None, None
+        playlist = playlist_manager.get_playlist(latest_refresh_info.playlist)
+        if not playlist:
+            return None, None
+        return playlist, playlist.find_plugin(latest_refresh_info.plugin_id, latest_refresh_info.plugin_instance)
+
+    def _determine_stale_plugin(self, playlist_manager, latest_refresh_info, current_dt):
+        """Returns the displayed plugin instance if its image went stale before the next playlist cycle."""
+        playlist, plugin_instance = self._get_displayed_plugin(playlist_manager, latest_refresh_info)
+        if not plugin_instance or playlist.name != playlist_manager.active_playlist:
+            return None, None
+
+        stale_dt = plugin_instance.get_stale_dt()
+        if not stale_dt or current_dt < stale_dt:
+            return None, None
+
+        logger.info(f"Displayed plugin instance changed. | plugin_instance: {plugin_instance.name} | next_change_time: {plugin_instance.next_change_time}")
+        return playlist, plugin_instance
+
+    def _get_sleep_time(self, sleep_time):
+        """Shortens sleep_time to wake up when the displayed plugin instance's image goes stale."""
+        playlist_manager = self.device_config.get_playlist_manager()
+        playlist, plugin_instance = self._get_displayed_plugin(playlist_manager, self.device_config.get_refresh_info())
+        if not plugin_instance or playlist.name != playlist_manager.active_playlist:
+            return sleep_time
+        stale_dt = plugin_instance.get_stale_dt()
+        if not stale_dt:
+            return sleep_time
+
+        seconds_to_change = (stale_dt - self._get_current_datetime()).total_seconds()
+        return max(MIN_SLEEP_SECONDS, min(sleep_time, seconds_to_change))
+
     def log_system_stats(self):
         metrics = {
             'cpu_percent': psutil.cpu_percent(interval=1),
@@ -204,7 +402,10 @@ class RefreshTask:
 
 class RefreshAction:
     """Base class for a refresh action. Subclasses should override the methods below."""
-    
+
+    # Hash of the image returned by the last execute, when already known
+    image_hash = None
+
     def refresh(self, plugin, device_config, current_dt):
         """Perform a refresh operation and return the updated image."""
         raise NotImplementedError("Subclasses must implement the refresh method.")
@@ -217,6 +418,10 @@ class RefreshAction:
         """Return the plugin ID associated with this refresh."""
         raise NotImplementedError("Subclasses must implement the get_plugin_id method.")
 
+    def get_job_key(self):
+        """Return the key queued jobs are coalesced by, a newer job with the same key replaces a queued one."""
+        return (type(self).__name__, self.get_plugin_id())
+
 class ManualRefresh(RefreshAction):
     """Performs a manual refresh based on a plugin's ID and its associated settings.
     
@@ -249,40 +454,120 @@ class PlaylistRefresh(RefreshAction):
         plugin_instance: The plugin instance to refresh.
     """
 
-    def __init__(self, playlist, plugin_instance, force=False):
+    def __init__(self, playlist, plugin_instance, force=False, cycle_time=None):
         self.playlist = playlist
         self.plugin_instance = plugin_instance
         self.force = force
+        # refresh time of the playlist cycle, kept when refreshing the displayed instance in between
+        self.cycle_time = cycle_time
 
     def get_refresh_info(self):
         """Return refresh metadata as a dictionary."""
-        return {
+        refresh_info = {
             "refresh_type": "Playlist",
             "playlist": self.playlist.name,
             "plugin_id": self.plugin_instance.plugin_id,
             "plugin_instance": self.plugin_instance.name
         }
+        if self.cycle_time:
+            refresh_info["refresh_time"] = self.cycle_time
+        return refresh_info
 
     def get_plugin_id(self):
         """Return the plugin ID associated with this refresh."""
         return self.plugin_instance.plugin_id
 
+    def get_job_key(self):
+        """Return the key queued jobs are coalesced by, the plugin instance."""
+        return (type(self).__name__, self.playlist.name, self.plugin_instance.plugin_id, self.plugin_instance.name)
+
     def execute(self, plugin, device_config, current_dt: datetime):
         """Performs a refresh for the specified plugin instance within its playlist context."""
         # Determine the file path for the plugin's image
         plugin_image_path = os.path.join(device_config.plugin_image_dir, self.plugin_instance.get_image_path())
+        has_image = os.path.exists(plugin_image_path) or get_image_writer().get_pending(plugin_image_path) is not None
 
         # Check if a refresh is needed based on the plugin instance's criteria
-        if self.plugin_instance.should_refresh(current_dt) or self.force:
+        if self.plugin_instance.should_refresh(current_dt) or self.force or not has_image:
+            input_key = self.get_input_key(plugin, self.plugin_instance.settings, device_config, current_dt)
+            if input_key and input_key == self.plugin_instance.input_key and has_image and not self.force:
+                # the inputs did not change since the latest image, skip generating it again
+                logger.info(f"Plugin inputs unchanged, using latest image. | plugin_instance: '{self.plugin_instance.name}'")
+                self.plugin_instance.update({
+                    "latest_refresh_time": current_dt.isoformat(),
+                    "next_change_time": self.get_next_change_time(plugin, self.plugin_instance.settings, current_dt)
+                })
+                return self.load_image(plugin_image_path)
+
             logger.info(f"Refreshing plugin instance. | plugin_instance: '{self.plugin_instance.name}'") 
+            # Clear the hint first, a failing plugin must not wake the refresh task over and over
+            self.plugin_instance.next_change_time = None
             # Generate a new image
             image = plugin.generate_image(self.plugin_instance.settings, device_config)
-            image.save(plugin_image_path)
-            self.plugin_instance.latest_refresh_time = current_dt.isoformat()
+            # written in the background while the display updates
+            get_image_writer().write(image, plugin_image_path)
+            self.image_hash = compute_image_hash(image)
+            get_image_memory_cache().put(plugin_image_path, image, self.image_hash)
+            self.plugin_instance.update({
+                "latest_refresh_time": current_dt.isoformat(),
+                "input_key": input_key,
+                "image_hash": self.image_hash,
+                "next_change_time": self.get_next_change_time(plugin, self.plugin_instance.settings, current_dt)
+            })
         else:
             logger.info(f"Not time to refresh plugin instance, using latest image. | plugin_instance: {self.plugin_instance.name}.")
-            # Load the existing image from disk
-            with Image.open(plugin_image_path) as img:
-                image = img.copy()
-
-        return image
\ No newline at end of file
+            image = self.load_image(plugin_image_path)
+
+        return image
+
+    def load_image(self, plugin_image_path):
+        """Loads the latest image of the plugin instance, from memory if cached, else from disk."""
+        image_hash = self.plugin_instance.image_hash
+        cached = get_image_memory_cache().get(plugin_image_path, image_hash)
+        if cached:
+            image, self.image_hash = cached
+            return image
+
+        image = get_image_writer().load(plugin_image_path)
+        self.image_hash = image_hash
+        if image_hash:
+            get_image_memory_cache().put(plugin_image_path, image, image_hash)
+        return image
+
+    @staticmethod
+    def get_input_key(plugin, settings, device_config, current_dt):
+        """Fingerprint of everything a plugin instance's image depends on.
+
+        Combines the plugin's compute_input_key with the instance settings and the device
+        settings every render depends on. Returns None when the plugin can't tell, in which
+        case the image is always regenerated.
+        """
+        try:
+            plugin_key = plugin.compute_input_key(settings, device_config, current_dt)
+        except Exception as e:
+            logger.warning(f"Failed to compute input key, regenerating image. | plugin_id: {plugin.get_plugin_id()} | error: {str(e)}")
+            return None
+        if plugin_key is None:
+            return None
+
+        inputs = {
+            "plugin": plugin_key,
+            "settings": settings,
+            "resolution": device_config.get_resolution(),
+            "orientation": device_config.get_config("orientation"),
+            "timezone": device_config.get_config("timezone"),
+            "time_format": device_config.get_config("time_format"),
+        }
+        return hashlib.sha256(json.dumps(inputs, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def get_next_change_time(plugin, settings, current_dt):
+        """ISO-formatted time the plugin's new image goes stale, or None if the plugin can't tell."""
+        try:
+            next_change_dt = plugin.next_change_time(settings, current_dt)
+        except Exception as e:
+            logger.warning(f"Failed to compute next change time. | plugin_id: {plugin.get_plugin_id()} | error: {str(e)}")
+            return None
+        if not next_change_dt or next_change_dt <= current_dt:
+            return None
+        return next_change_dt.isoformat()
\ No newline at end of file
@@ -33,6 +33,7 @@ document.addEventListener('DOMContentLoaded', function() {
         });
         
         observer.observe(img, { attributes: true, attributeFilter: ['src'] });
+        reloadImage();
     });
 
     // Handle click on overlay to close modal
@@ -47,6 +48,14 @@ document.addEventListener('DOMContentLoaded', function() {
             modalImg = null;
             imageContainer.classList.remove('maximized');
             document.body.style.overflow = '';
+            reloadImage();
         }
     });
+
+    // Pages sizing the image to its container load the variant for the new size
+    function reloadImage() {
+        if (typeof refreshImage === 'function') {
+            refreshImage();
+        }
+    }
 });
@@ -0,0 +1,35 @@
+// Waits for a queued display update to finish by polling its status endpoint.
+// Superseded jobs are followed to the newer job that replaced them.
+// Gives up after timeoutMs, the update may still finish in the background.
+async function waitForRefreshJob(statusUrl, pollIntervalMs = 1000, timeoutMs = 180000) {
+    const deadline = Date.now() + timeoutMs;
+    while (true) {
+        if (Date.now() > deadline) {
+            throw new Error('Timed out waiting for the display update');
+        }
+        const response = await fetch(statusUrl, { cache: 'no-store' });
+        const job = await response.json();
+        if (!response.ok) {
+            throw new Error(job.error || 'Failed to get the update status');
+        }
+        if (job.status === 'superseded' && job.superseded_by) {
+            statusUrl = statusUrl.replace(job.job_id, job.superseded_by);
+            continue;
+        }
+        if (job.done) {
+            return job;
+        }
+        await new Promise(resolve => setTimeout(resolve, pollIntervalMs));
+    }
+}
+
+// Result message for a finished job
+function refreshJobMessage(job) {
+    if (job.status === 'failed') {
+        return `Error!  ${job.error}`;
+    }
+    if (job.status === 'skipped') {
+        return 'Success! Display already up to date';
+    }
+    return 'Success! Display updated';
+}
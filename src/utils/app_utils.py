@@ -2,9 +2,12 @@ import logging
 import os
 import socket
 import subprocess
+import threading
 
+from collections import OrderedDict
+from io import BytesIO
 from pathlib import Path
-from PIL import Image, ImageDraw, ImageFont, ImageOps
+from PIL import Image, ImageDraw, ImageFont
 
 logger = logging.getLogger(__name__)
 
@@ -40,6 +43,15 @@ FONTS = {
     "jost-semibold": "Jost-SemiBold.ttf"
 }
 
+# Maximum number of sized font faces kept by get_font
+FONT_CACHE_SIZE = 32
+
+# Font file contents by path, faces are parsed from memory instead of reopening the file
+_font_data = {}
+# Sized faces by (font_name, font_weight, font_size), least recently used first
+_font_cache = OrderedDict()
+_font_lock = threading.Lock()
+
 def resolve_path(file_path):
     src_dir = os.getenv("SRC_DIR")
     if src_dir is None:
@@ -49,6 +61,12 @@ def resolve_path(file_path):
     src_path = Path(src_dir)
     return str(src_path / file_path)
 
+def get_cache_dir(*subdirs):
+    """Returns a directory under src/cache for generated, disposable files, creating it if needed."""
+    cache_dir = resolve_path(os.path.join("cache", *subdirs))
+    os.makedirs(cache_dir, exist_ok=True)
+    return cache_dir
+
 def get_ip_address():
     with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
         s.connect(("8.8.8.8", 80))
@@ -81,7 +99,18 @@ def get_font(font_name, font_size=50, font_weight="normal"):
 
         if font_entry:
             font_path = resolve_path(os.path.join("static", "fonts", font_entry["file"]))
-            return ImageFont.truetype(font_path, font_size)
+            key = (font_name, font_weight, font_size)
+            with _font_lock:
+                font = _font_cache.get(key)
+                if font is not None:
+                    _font_cache.move_to_end(key)
+                    return font
+
+                font = ImageFont.truetype(BytesIO(_read_font_data(font_path)), font_size)
+                _font_cache[key] = font
+                if len(_font_cache) > FONT_CACHE_SIZE:
+                    _font_cache.popitem(last=False)
+            return font
         else:
             logger.warning(f"Requested font weight not found: font_name={font_name}, font_weight={font_weight}")
     else:
@@ -89,6 +118,26 @@ def get_font(font_name, font_size=50, font_weight="normal"):
 
     return None
 
+def preload_fonts(font_names=None):
+    """Reads the font files of the given families (all by default) into memory once."""
+    for font_name in font_names or FONT_FAMILIES.keys():
+        for variant in FONT_FAMILIES.get(font_name, []):
+            font_path = resolve_path(os.path.join("static", "fonts", variant["file"]))
+            try:
+                with _font_lock:
+                    _read_font_data(font_path)
+            except OSError as e:
+                logger.warning(f"Could not preload font {font_path}: {e}")
+    logger.debug(f"Preloaded {len(_font_data)} font files")
+
+def _read_font_data(font_path):
+    font_data = _font_data.get(font_path)
+    if font_data is None:
+        with open(font_path, "rb") as f:
+            font_data = f.read()
+        _font_data[font_path] = font_data
+    return font_data
+
 def get_fonts():
     fonts_list = []
     for font_family, variants in FONT_FAMILIES.items():
@@ -142,7 +191,16 @@ def parse_form(request_form):
             request_dict[key] = request_form.getlist(key)
     return request_dict
 
-def handle_request_files(request_files, form_data={}):
+def handle_request_files(request_files, form_data={}, derivative_size=None):
+    """Stores the uploaded files of a request and maps form keys to their paths.
+
+    Uploads are streamed to disk and deduplicated by content, see utils.upload_ingest.
+    If derivative_size is given, display sized derivatives of uploaded images are built
+    in the background.
+    """
+    # imported here, upload_ingest uses this module's cache helpers
+    from utils.upload_ingest import ingest_upload
+
     allowed_file_extensions = {'pdf', 'png', 'avif', 'jpg', 'jpeg', 'gif', 'webp', 'heif', 'heic'}
     file_location_map = {}
     # handle existing file locations being provided as part of the form data
@@ -161,27 +219,14 @@ def handle_request_files(request_files, form_data={}):
         if not extension or extension.lower() not in allowed_file_extensions:
             continue
 
-        file_name = os.path.basename(file_name)
-
         file_save_dir = resolve_path(os.path.join("static", "images", "saved"))
-        file_path = os.path.join(file_save_dir, file_name)
-
-        # Open the image and apply EXIF transformation before saving
-        if extension in {'jpg', 'jpeg'}:
-            try:
-                with Image.open(file) as img:
-                    img = ImageOps.exif_transpose(img)
-                    img.save(file_path)
-            except Exception as e:
-                logger.warning(f"EXIF processing error for {file_name}: {e}")
-                file.save(file_path)
-        else:
-            # Directly save non-JPEG files
-            file.save(file_path)
+        # the original bytes are kept, the EXIF orientation is applied when the image is displayed
+        file_path = ingest_upload(file, file_save_dir, derivative_size=derivative_size)
 
         if is_list:
             file_location_map.setdefault(key, [])
-            file_location_map[key].append(file_path)
+            if file_path not in file_location_map[key]:
+                file_location_map[key].append(file_path)
         else:
             file_location_map[key] = file_path
     return file_location_map
@@ -0,0 +1,246 @@
+"""
+Pre-bundled render assets for plugin templates.
+
+Every render used to make Chromium load plugin.css, the plugin stylesheet and
+an @font-face rule for every font in FONT_FAMILIES as separate file:// requests,
+and decode full size icons (the weather icons are 512x512 PNGs shown a few
+dozen pixels wide). This module builds, per plugin stylesheet:
+
+- one minified stylesheet with the base and plugin CSS, inlined into the page
+- @font-face rules only for the font families the plugin's CSS and templates
+  use, pointing to subsetted copies of the fonts when fontTools is installed
+- downscaled copies of icons, sized for the panel (bundle_icon)
+
+Bundles are fingerprinted by the path, mtime and size of their sources and are
+rebuilt automatically when a source changes. Generated files live under
+src/cache/bundles.
+"""
+
+import hashlib
+import logging
+import os
+import re
+import threading
+from pathlib import Path
+
+from PIL import Image
+
+from utils.app_utils import FONT_FAMILIES, get_cache_dir, resolve_path
+
+try:
+    from fontTools import subset as font_subset
+except ImportError:
+    font_subset = None
+
+logger = logging.getLogger(__name__)
+
+BUNDLE_DIR = "bundles"
+# Part of the bundle fingerprint, bump when the bundling output changes
+BUNDLE_VERSION = 2
+# Characters kept when subsetting fonts: latin, greek and cyrillic scripts,
+# punctuation, currency, arrows (wind direction) and common symbols
+SUBSET_UNICODES = [
+    *range(0x0020, 0x0250),  # Basic Latin to Latin Extended-B
+    *range(0x0370, 0x0500),  # Greek and Cyrillic
+    *range(0x1E00, 0x1F00),  # Latin Extended Additional
+    *range(0x2000, 0x2300),  # Punctuation, super/subscripts, currency, letterlike, arrows, math
+    *range(0x25A0, 0x2600),  # Geometric shapes
+]
+
+# Minified stylesheets by (plugin id, css files), with the fingerprint they were built from
+_style_bundles = {}
+_bundle_lock = threading.Lock()
+
+
+def _fingerprint(paths):
+    """Hash of the path, mtime and size of each existing file."""
+    digest = hashlib.sha256(str(BUNDLE_VERSION).encode())
+    for path in paths:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        digest.update(f"{path}|{stat.st_mtime_ns}|{stat.st_size}".encode())
+    return digest.hexdigest()
+
+
+# Quoted strings, kept as written, and comments, removed; whichever starts first wins
+CSS_STRING_OR_COMMENT_PATTERN = re.compile(r"""("(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*')|/\*.*?\*/""", re.DOTALL)
+
+
+def minify_css(css):
+    """Removes comments and redundant whitespace from a stylesheet, leaving quoted strings untouched."""
+    strings = []
+
+    def protect(match):
+        if match.group(1) is None:
+            return ""
+        strings.append(match.group(1))
+        return f"\0{len(strings) - 1}\0"
+
+    css = CSS_STRING_OR_COMMENT_PATTERN.sub(protect, css)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{};,>])\s*", r"\1", css)
+    # keep the space in "a :hover" selectors, only drop it around declarations
+    css = re.sub(r"\s*:\s*(?=[^{}]*[;}])", ":", css)
+    css = css.replace(";}", "}")
+    return re.sub(r"\0(\d+)\0", lambda match: strings[int(match.group(1))], css.strip())
+
+
+def _absolute_urls(css, css_path):
+    """Rewrites relative url() references, the inlined css no longer sits next to its files."""
+    base_dir = os.path.dirname(css_path)
+
+    def rewrite(match):
+        quote, url = match.group(1), match.group(2)
+        if re.match(r"^(?:[a-z]+:|/|#)", url, re.IGNORECASE):
+            return match.group(0)
+        return f"url({quote}{Path(base_dir, url).resolve().as_uri()}{quote})"
+
+    return re.sub(r"""url\(\s*(["']?)([^"')]+)\1\s*\)""", rewrite, css)
+
+
+def used_font_families(sources):
+    """Returns the FONT_FAMILIES names used by font-family declarations in the given css/html.
+
+    If a declaration is filled in by the template (font-family: {{ ... }}), every family is
+    returned since the font is only known at render time.
+    """
+    declarations = []
+    for text in sources:
+        declarations.extend(re.findall(r"font-family\s*:([^;}<]*)", text, re.IGNORECASE))
+    if any("{{" in declaration for declaration in declarations):
+        return list(FONT_FAMILIES)
+    text = " ".join(declarations).lower()
+    return [family for family in FONT_FAMILIES if family.lower() in text]
+
+
+def subset_font(font_path):
+    """Returns the path of a copy of a font reduced to SUBSET_UNICODES.
+
+    Falls back to the original font when fontTools is not installed or subsetting fails.
+    """
+    if font_subset is None:
+        return font_path
+
+    fonts_dir = get_cache_dir(BUNDLE_DIR, "fonts")
+    stem, extension = os.path.splitext(os.path.basename(font_path))
+    subset_path = os.path.join(fonts_dir, f"{stem}-{_fingerprint([font_path])[:12]}{extension}")
+    if os.path.exists(subset_path):
+        return subset_path
+
+    try:
+        options = font_subset.Options()
+        options.hinting = False
+        options.name_IDs = ["*"]
+        options.layout_features = ["*"]
+        font = font_subset.load_font(font_path, options)
+        subsetter = font_subset.Subsetter(options)
+        subsetter.populate(unicodes=SUBSET_UNICODES)
+        subsetter.subset(font)
+        tmp_path = subset_path + ".tmp"
+        font_subset.save_font(font, tmp_path, options)
+        os.replace(tmp_path, subset_path)
+        logger.debug(f"Subsetted {font_path}: {os.path.getsize(font_path)} -> {os.path.getsize(subset_path)} bytes")
+        return subset_path
+    except Exception as e:
+        logger.warning(f"Failed to subset font {font_path}: {str(e)}")
+        return font_path
+
+
+def _font_files(families):
+    fonts = []
+    for family in families:
+        for variant in FONT_FAMILIES[family]:
+            fonts.append((family, variant, resolve_path(os.path.join("static", "fonts", variant["file"]))))
+    return fonts
+
+
+def _template_files(render_dirs):
+    templates = []
+    for render_dir in render_dirs:
+        if render_dir and os.path.isdir(render_dir):
+            templates.extend(os.path.join(render_dir, name) for name in sorted(os.listdir(render_dir))
+                             if name.endswith(".html"))
+    return templates
+
+
+def build_style_bundle(css_files, render_dirs):
+    """Builds the inline stylesheet for a plugin render.
+
+    Args:
+        css_files: Stylesheets in cascade order.
+        render_dirs: Directories whose html templates are scanned for font usage.
+
+    Returns:
+        str: Minified @font-face rules for the used fonts followed by the stylesheets.
+    """
+    sources = []
+    for css_file in css_files:
+        with open(css_file, encoding="utf-8") as f:
+            sources.append(_absolute_urls(f.read(), css_file))
+    templates = []
+    for template_file in _template_files(render_dirs):
+        with open(template_file, encoding="utf-8") as f:
+            templates.append(f.read())
+
+    font_faces = []
+    for family, variant, font_path in _font_files(used_font_families(sources + templates)):
+        font_faces.append(
+            f'@font-face{{font-family:"{family}";font-weight:{variant.get("font-weight", "normal")};'
+            f'font-style:{variant.get("font-style", "normal")};'
+            f'src:url("{Path(subset_font(font_path)).as_uri()}") format("truetype")}}'
+        )
+    return "".join(font_faces) + minify_css("\n".join(sources))
+
+
+def get_style_bundle(plugin_id, css_files, render_dirs):
+    """Returns the inline stylesheet for a plugin render, rebuilding it when a source changed.
+
+    Args:
+        plugin_id: Plugin the bundle belongs to.
+        css_files: Stylesheets in cascade order.
+        render_dirs: Directories whose html templates are scanned for font usage.
+    """
+    key = (plugin_id, tuple(css_files))
+    sources = list(css_files) + _template_files(render_dirs)
+    fingerprint = _fingerprint(sources + [path for _, _, path in _font_files(FONT_FAMILIES)])
+
+    bundle = _style_bundles.get(key)
+    if bundle and bundle[0] == fingerprint:
+        return bundle[1]
+
+    with _bundle_lock:
+        bundle = _style_bundles.get(key)
+        if not bundle or bundle[0] != fingerprint:
+            logger.debug(f"Building style bundle for {plugin_id}: {', '.join(map(os.path.basename, css_files))}")
+            bundle = (fingerprint, build_style_bundle(css_files, render_dirs))
+            _style_bundles[key] = bundle
+    return bundle[1]
+
+
+def bundle_icon(icon_path, size):
+    """Returns the path of a copy of an icon downscaled to fit size x size pixels.
+
+    Icons already small enough are returned as is. Copies are keyed by the source
+    fingerprint, so they are regenerated when the icon changes.
+    """
+    size = max(1, int(size))
+    try:
+        with Image.open(icon_path) as icon:
+            if icon.width <= size and icon.height <= size:
+                return icon_path
+            icons_dir = get_cache_dir(BUNDLE_DIR, "icons", str(size))
+            stem = os.path.splitext(os.path.basename(icon_path))[0]
+            bundled_path = os.path.join(icons_dir, f"{stem}-{_fingerprint([icon_path])[:12]}.png")
+            if os.path.exists(bundled_path):
+                return bundled_path
+
+            icon.thumbnail((size, size), Image.LANCZOS)
+            tmp_path = bundled_path + ".tmp"
+            icon.save(tmp_path, format="PNG", optimize=True)
+            os.replace(tmp_path, bundled_path)
+            return bundled_path
+    except Exception as e:
+        logger.warning(f"Failed to bundle icon {icon_path}: {str(e)}")
+        return icon_path
@@ -0,0 +1,222 @@
+"""
+Local cache for remote assets referenced by rendered plugin pages.
+
+Templates like rss.html reference remote images, which headless Chromium
+would fetch one by one during the screenshot, uncached and counted against
+the screenshot timeout. Before the screenshot, localize_remote_assets finds
+the remote URLs the page loads (src attributes and CSS url()), downloads them
+concurrently through the shared HTTP session, downsizes images to the box
+they are rendered in and rewrites the references to file:// URIs of the
+cached copies, so the browser never touches the network.
+
+Cached files are keyed by URL and box size and the cache is pruned to
+MAX_CACHE_BYTES, least recently used first. Downloads larger than
+MAX_ASSET_BYTES are abandoned and shown as a placeholder.
+
+Usage:
+    from utils.asset_cache import localize_remote_assets
+
+    html_str = localize_remote_assets(html_str, max_size=(800, 480))
+"""
+
+import hashlib
+import html
+import logging
+import mimetypes
+import os
+import re
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from pathlib import Path
+
+from PIL import Image, UnidentifiedImageError
+
+from utils.app_utils import get_cache_dir
+from utils.http_client import get_http_session
+
+logger = logging.getLogger(__name__)
+
+ASSET_CACHE_DIR = "assets"
+MAX_CACHE_BYTES = 64 * 1024 * 1024
+MAX_WORKERS = 4
+DOWNLOAD_TIMEOUT = 10
+# Largest asset downloaded, larger ones are replaced by the placeholder
+MAX_ASSET_BYTES = 16 * 1024 * 1024
+CHUNK_SIZE = 64 * 1024
+JPEG_QUALITY = 90
+# Shown instead of assets that can't be downloaded, a transparent 1x1 gif
+PLACEHOLDER_URI = "data:image/gif;base64,R0lGODlhAQABAIAAAAAAAP///yH5BAEAAAAALAAAAAABAAEAAAIBRAA7"
+EXTENSIONS = (".png", ".jpg", ".gif", ".webp", ".svg", ".bin")
+
+# src="..." / src='...' attributes and css url(...) pointing to http(s) URLs. Quoted URLs
+# end at the closing quote only, they may contain parentheses; unquoted url(...) ends at ")".
+REMOTE_URL_PATTERN = re.compile(
+    r"""(?:\bsrc\s*=\s*|\burl\(\s*)(["'])(https?://(?:(?!\1)[^\s<>])+)|\burl\(\s*(https?://[^"'()\s<>]+)""",
+    re.IGNORECASE)
+
+
+def _matched_url(match):
+    return match.group(2) or match.group(3)
+
+
+def find_remote_assets(html_str):
+    """Returns the remote URLs loaded by a page, as they appear in the markup."""
+    return {_matched_url(match) for match in REMOTE_URL_PATTERN.finditer(html_str)}
+
+
+def _asset_key(url, max_size):
+    return hashlib.sha256(f"{url}|{max_size[0]}x{max_size[1]}".encode("utf-8")).hexdigest()
+
+
+def _cached_asset(cache_dir, key):
+    for extension in EXTENSIONS:
+        path = os.path.join(cache_dir, key + extension)
+        if os.path.exists(path):
+            # mark as recently used for pruning
+            os.utime(path)
+            return path
+    return None
+
+
+def _downsize(content, max_size):
+    """Downsizes image bytes to fit max_size.
+
+    Returns:
+        tuple: (bytes, extension), or None if the content is not an image PIL can read.
+    """
+    try:
+        image = Image.open(BytesIO(content))
+        image_format = image.format
+    except (UnidentifiedImageError, OSError):
+        return None
+
+    if image.width <= max_size[0] and image.height <= max_size[1]:
+        # small enough already, keep the original encoding
+        extension = mimetypes.guess_extension(Image.MIME.get(image_format, "")) or ".bin"
+        return content, ".jpg" if extension in (".jpe", ".jpeg") else extension
+
+    image.draft("RGB", max_size)
+    image.thumbnail(max_size, Image.LANCZOS)
+    output = BytesIO()
+    if image.mode in ("RGBA", "LA", "P"):
+        image.save(output, format="PNG")
+        return output.getvalue(), ".png"
+    image.convert("RGB").save(output, format="JPEG", quality=JPEG_QUALITY)
+    return output.getvalue(), ".jpg"
+
+
+def fetch_asset(url, max_size, session=None, cache_dir=None):
+    """Returns the local path of a remote asset, downloading it into the cache if needed.
+
+    Args:
+        url: http(s) URL of the asset.
+        max_size: (width, height) box images are downsized to fit.
+        session: Optional requests session, defaults to the shared session.
+        cache_dir: Optional cache directory, defaults to the asset cache.
+
+    Returns:
+        str: Path of the cached file, or None if the download failed.
+    """
+    cache_dir = cache_dir or get_cache_dir(ASSET_CACHE_DIR)
+    key = _asset_key(url, max_size)
+    cached = _cached_asset(cache_dir, key)
+    if cached:
+        return cached
+
+    try:
+        downloaded, content_type = _download(url, session or get_http_session())
+    except Exception as e:
+        logger.warning(f"Failed to download asset {url}: {str(e)}")
+        return None
+
+    asset = _downsize(downloaded, max_size)
+    if asset is None:
+        # not a raster image (svg, fonts, ...), keep it as served
+        extension = ".svg" if content_type == "image/svg+xml" else ".bin"
+        asset = downloaded, extension
+    content, extension = asset
+
+    path = os.path.join(cache_dir, key + extension)
+    with tempfile.NamedTemporaryFile(dir=cache_dir, suffix=".tmp", delete=False) as tmp_file:
+        tmp_file.write(content)
+    os.replace(tmp_file.name, path)
+    logger.debug(f"Cached asset {url} ({len(downloaded)} -> {len(content)} bytes)")
+    return path
+
+
+def _download(url, session):
+    """Downloads an asset of at most MAX_ASSET_BYTES.
+
+    Returns:
+        tuple: (bytes, content type)
+
+    Raises:
+        ValueError: If the asset is larger than MAX_ASSET_BYTES.
+    """
+    with session.get(url, timeout=DOWNLOAD_TIMEOUT, stream=True) as response:
+        response.raise_for_status()
+        content_length = response.headers.get("Content-Length")
+        if content_length and content_length.isdigit() and int(content_length) > MAX_ASSET_BYTES:
+            raise ValueError(f"asset of {content_length} bytes exceeds {MAX_ASSET_BYTES} bytes")
+
+        received = bytearray()
+        for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+            received.extend(chunk)
+            if len(received) > MAX_ASSET_BYTES:
+                raise ValueError(f"asset exceeds {MAX_ASSET_BYTES} bytes")
+        content_type = response.headers.get("Content-Type", "").split(";")[0].strip()
+        return bytes(received), content_type
+
+
+def prune_asset_cache(max_bytes=MAX_CACHE_BYTES, cache_dir=None):
+    """Deletes the least recently used assets until the cache fits max_bytes."""
+    cache_dir = cache_dir or get_cache_dir(ASSET_CACHE_DIR)
+    entries = []
+    for entry in os.scandir(cache_dir):
+        if entry.is_file() and not entry.name.startswith("."):
+            stat = entry.stat()
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+            total -= size
+        except OSError:
+            pass
+
+
+def localize_remote_assets(html_str, max_size, session=None, cache_dir=None):
+    """Replaces the remote assets loaded by a page with file:// URIs of local copies.
+
+    Args:
+        html_str: Rendered page.
+        max_size: (width, height) box images are downsized to fit, the viewport
+            or the largest box the template renders images in.
+        session: Optional requests session, defaults to the shared session.
+        cache_dir: Optional cache directory, defaults to the asset cache.
+
+    Returns:
+        str: The page with remote references rewritten. Assets that could not be
+            downloaded are replaced by a transparent placeholder.
+    """
+    urls = find_remote_assets(html_str)
+    if not urls:
+        return html_str
+
+    cache_dir = cache_dir or get_cache_dir(ASSET_CACHE_DIR)
+    max_size = (max(1, int(max_size[0])), max(1, int(max_size[1])))
+
+    def localize(url):
+        path = fetch_asset(html.unescape(url), max_size, session, cache_dir)
+        return url, Path(path).as_uri() if path else PLACEHOLDER_URI
+
+    with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(urls))) as executor:
+        local_uris = dict(executor.map(localize, urls))
+
+    prune_asset_cache(cache_dir=cache_dir)
+    return REMOTE_URL_PATTERN.sub(
+        lambda match: match.group(0).replace(_matched_url(match), local_uris[_matched_url(match)]), html_str)
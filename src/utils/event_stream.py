@@ -0,0 +1,188 @@
+"""
+Refresh lifecycle events for the web UI, pushed as Server-Sent Events.
+
+RefreshTask publishes events (scheduled, generating, displayed, skipped,
+error) into a bounded ring buffer. Subscribers don't get a queue each: every
+browser tab keeps its own cursor, the id of the last event it received, which
+EventSource sends back as Last-Event-ID when it reconnects.
+
+/api/events holds the stream open and waits on a condition for new events,
+writing a keep-alive comment every KEEPALIVE_SECONDS so dead connections are
+noticed. Each open stream occupies a server thread: at most MAX_SUBSCRIBERS
+streams are held open, and the server runs that many threads on top of the
+ones answering regular requests. Streams are closed after STREAM_SECONDS and
+EventSource reconnects after RETRY_MS, picking up from its cursor. Tabs over
+the limit get the events so far and reconnect after POLL_RETRY_MS, as often
+as the page used to poll the image. A tab that fell behind the buffer, or
+whose id comes from a previous process, gets a reset event telling it to
+reload its state.
+
+Usage:
+    from utils.event_stream import get_event_stream
+
+    get_event_stream().publish("displayed", {"image_hash": image_hash})
+    body = get_event_stream().stream(last_event_id)
+"""
+
+import json
+import logging
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+
+logger = logging.getLogger(__name__)
+
+MAX_EVENTS = 64
+# Streams held open at once, each one occupies a server thread
+MAX_SUBSCRIBERS = 3
+# Interval of keep-alive comments on an idle stream
+KEEPALIVE_SECONDS = 15
+# Streams are closed after this long and reopened by the browser
+STREAM_SECONDS = 300
+# Reconnect delay after a stream is closed
+RETRY_MS = 1000
+# Reconnect delay of tabs over MAX_SUBSCRIBERS, the 3 second image polling it replaced
+POLL_RETRY_MS = 3000
+
+
+class EventStream:
+    """Bounded, thread safe buffer of events with increasing ids."""
+
+    def __init__(self, max_events=MAX_EVENTS, max_subscribers=MAX_SUBSCRIBERS):
+        self._events = deque(maxlen=max_events)
+        self._condition = threading.Condition()
+        self.max_subscribers = max_subscribers
+        self.subscribers = 0
+        # ids start from the current time so they keep increasing across restarts
+        self._last_id = int(time.time() * 1000)
+
+    @property
+    def last_id(self):
+        return self._last_id
+
+    def publish(self, event_type, data=None):
+        """Appends an event, dropping the oldest one when the buffer is full.
+
+        Args:
+            event_type: Event name, e.g. "displayed".
+            data: JSON serializable payload.
+
+        Returns:
+            int: The event id.
+        """
+        with self._condition:
+            self._last_id += 1
+            event = {
+                "id": self._last_id,
+                "event": event_type,
+                "data": {**(data or {}), "time": datetime.now(timezone.utc).isoformat()},
+            }
+            self._events.append(event)
+            self._condition.notify_all()
+        logger.debug(f"Published {event_type} event {event['id']}")
+        return event["id"]
+
+    def events_since(self, last_event_id):
+        """Returns the events after last_event_id.
+
+        Returns:
+            tuple: (events, complete). complete is False if events were missed, because
+                they fell out of the buffer or the id is not from this process.
+        """
+        events, complete, _ = self._events_since(last_event_id)
+        return events, complete
+
+    def _events_since(self, last_event_id):
+        """events_since, with the id of the latest event at the time, which the caller has now seen."""
+        with self._condition:
+            events = list(self._events)
+            last_id = self._last_id
+        if last_event_id is None:
+            return [], True, last_id
+        try:
+            last_event_id = int(last_event_id)
+        except (TypeError, ValueError):
+            return [], False, last_id
+        if last_event_id > last_id:
+            return [], False, last_id
+
+        newer = [event for event in events if event["id"] > last_event_id]
+        # the event right after the cursor must still be buffered, otherwise some were dropped
+        oldest_id = events[0]["id"] if events else last_id + 1
+        complete = last_event_id >= oldest_id - 1 or last_event_id == last_id
+        return newer, complete, last_id
+
+    def render(self, last_event_id, retry_ms=RETRY_MS):
+        """Formats the events after last_event_id as a text/event-stream body."""
+        return f"retry: {retry_ms}\n\n" + self._render_since(last_event_id)[0]
+
+    def _render_since(self, last_event_id):
+        """Formats the events after last_event_id.
+
+        Returns:
+            tuple: (body, cursor), cursor is the id of the latest event covered by the body.
+        """
+        events, complete, last_id = self._events_since(last_event_id)
+        lines = []
+        if not complete:
+            lines.append(format_event({"id": last_id, "event": "reset", "data": {}}))
+        lines.extend(format_event(event) for event in events)
+        if last_event_id is None:
+            # an id without data moves the new subscriber's cursor to the latest event
+            lines.append(f"id: {last_id}\n\n")
+        return "".join(lines), last_id
+
+    def wait(self, last_event_id, timeout):
+        """Blocks until an event after last_event_id is published or timeout seconds passed.
+
+        Returns:
+            bool: True if there are newer events.
+        """
+        with self._condition:
+            return self._condition.wait_for(lambda: self._last_id > last_event_id, timeout)
+
+    def stream(self, last_event_id, keepalive_seconds=None, max_seconds=None):
+        """Yields a text/event-stream body with the events after last_event_id, then new ones as published.
+
+        Up to max_subscribers streams are held open for max_seconds (STREAM_SECONDS), with a
+        keep-alive comment every keepalive_seconds (KEEPALIVE_SECONDS) without events. Other
+        subscribers only get the events so far and reconnect after POLL_RETRY_MS.
+        """
+        keepalive_seconds = KEEPALIVE_SECONDS if keepalive_seconds is None else keepalive_seconds
+        max_seconds = STREAM_SECONDS if max_seconds is None else max_seconds
+        with self._condition:
+            held = self.subscribers < self.max_subscribers
+            if held:
+                self.subscribers += 1
+        if not held:
+            logger.debug(f"{self.subscribers} event streams open, answering with a poll")
+            yield self.render(last_event_id, retry_ms=POLL_RETRY_MS)
+            return
+
+        try:
+            body, cursor = self._render_since(last_event_id)
+            yield f"retry: {RETRY_MS}\n\n" + body
+            deadline = time.monotonic() + max_seconds
+            while (remaining := deadline - time.monotonic()) > 0:
+                if self.wait(cursor, min(keepalive_seconds, remaining)):
+                    body, cursor = self._render_since(cursor)
+                    yield body
+                else:
+                    yield ": keep-alive\n\n"
+        finally:
+            with self._condition:
+                self.subscribers -= 1
+
+
+def format_event(event):
+    """Formats one event in the Server-Sent Events wire format."""
+    return f"id: {event['id']}\nevent: {event['event']}\ndata: {json.dumps(event['data'], default=str)}\n\n"
+
+
+_event_stream = EventStream()
+
+
+def get_event_stream():
+    """Returns the process wide event stream."""
+    return _event_stream
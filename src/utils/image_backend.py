@@ -0,0 +1,206 @@
+"""
+Image Processing Backends for InkyPi
+
+Wraps the operations whose engine can be swapped behind a common interface.
+
+- PillowBackend (default): rotate and enhance. It has no thumbnail or pad,
+  callers use their own Pillow code (JPEG draft mode decoding, the fast
+  compositor) when the backend is not streaming.
+- VipsBackend (optional, requires pyvips/libvips): demand-driven, tiled
+  processing spread across cores. thumbnail() streams from the file or bytes
+  with shrink-on-load, so memory stays roughly constant regardless of the
+  input size.
+
+vips is used on these paths only, when the backend is streaming:
+
+- utils.image_compositor.open_image: decoding image files to the display size
+  (image_upload, image_folder), through thumbnail()
+- utils.image_compositor.pad_blur: padding over a blurred background (the
+  image plugins and the display's padding), through pad(); the image is copied
+  into vips and back, this is not streaming
+- AdaptiveImageLoader: decoding and resizing downloaded images (from_url,
+  from_variants), through thumbnail()
+
+rotate and enhance run in Pillow with either backend. All operations return
+PIL images, so plugins and displays keep working with PIL.
+
+The backend is selected with the "image_backend" device config key
+("pillow" or "vips"). If pyvips is not installed the Pillow backend is used.
+"""
+
+from PIL import Image, ImageEnhance
+import logging
+
+logger = logging.getLogger(__name__)
+
+try:
+    import pyvips
+except (ImportError, OSError):
+    # pyvips raises OSError when the libvips shared library is missing
+    pyvips = None
+
+DEFAULT_BACKEND = "pillow"
+
+_backend = None
+
+
+class PillowBackend:
+    """Backend built on Pillow, used by default."""
+
+    name = "pillow"
+    # Whether the backend has thumbnail() and pad(), shrinking huge inputs without decoding the full frame
+    streaming = False
+
+    def enhance(self, img, image_settings={}):
+        """Apply brightness, contrast, saturation and sharpness factors."""
+        # Convert image to RGB mode if necessary for enhancement operations
+        # ImageEnhance requires RGB mode for operations like blend
+        if img.mode not in ('RGB', 'L'):
+            img = img.convert('RGB')
+
+        # Apply Brightness
+        img = ImageEnhance.Brightness(img).enhance(image_settings.get("brightness", 1.0))
+
+        # Apply Contrast
+        img = ImageEnhance.Contrast(img).enhance(image_settings.get("contrast", 1.0))
+
+        # Apply Saturation (Color)
+        img = ImageEnhance.Color(img).enhance(image_settings.get("saturation", 1.0))
+
+        # Apply Sharpness
+        img = ImageEnhance.Sharpness(img).enhance(image_settings.get("sharpness", 1.0))
+        return img
+
+    def rotate(self, img, angle):
+        """Rotate counter-clockwise by the given angle, expanding the canvas."""
+        return img.rotate(angle, expand=1)
+
+
+class VipsBackend(PillowBackend):
+    """
+    libvips backend, pipelines are evaluated lazily in tiles across threads.
+
+    Enhancement is inherited from the Pillow backend: it runs on display-sized
+    frames only, and Pillow's enhancement math is what users tuned their
+    settings against. So is rotate, Pillow transposes right angles without
+    resampling and a copy into vips would only add work.
+    """
+
+    name = "vips"
+    streaming = True
+
+    # Pillow modes that map directly onto an 8-bit vips image, and back by band count
+    BANDS = {'L': 1, 'LA': 2, 'RGB': 3, 'RGBA': 4}
+    MODES = {bands: mode for mode, bands in BANDS.items()}
+
+    def thumbnail(self, source, dimensions, fit="cover"):
+        """
+        Decode and shrink an image to the target dimensions.
+
+        Args:
+            source: File path or encoded image bytes
+            dimensions: Target dimensions as (width, height)
+            fit: 'cover' to crop to the exact dimensions, 'contain' to fit inside them
+
+        Returns:
+            RGB PIL Image
+        """
+        width, height = dimensions
+        options = {"height": height, "size": "down"}
+        if fit != "contain":
+            options["crop"] = "centre"
+
+        # Shrink-on-load: JPEG/WebP/HEIC are decoded at reduced size, and the
+        # remaining resample streams over the file instead of materializing it
+        if isinstance(source, (bytes, bytearray)):
+            vimg = pyvips.Image.thumbnail_buffer(source, width, **options)
+        else:
+            vimg = pyvips.Image.thumbnail(source, width, **options)
+        return self.to_pil(self._to_rgb(vimg))
+
+    def pad(self, img, dimensions, blur_radius=8):
+        """Fit an image inside the target dimensions over a blurred, cropped copy of itself."""
+        vimg = self.from_pil(img)
+        width, height = dimensions
+        bkg = vimg.thumbnail_image(width, height=height, crop="centre")
+        # BoxBlur(r) is close to a gaussian with sigma ~ r / sqrt(3)
+        bkg = bkg.gaussblur(max(blur_radius / 1.7, 0.1)).cast("uchar")
+        fg = vimg.thumbnail_image(width, height=height)
+        left = (width - fg.width) // 2
+        top = (height - fg.height) // 2
+        return self.to_pil(bkg.insert(fg, left, top))
+
+    def from_pil(self, img):
+        """Wrap a PIL image as a vips image."""
+        if img.mode not in self.BANDS:
+            img = img.convert('RGB')
+        vimg = pyvips.Image.new_from_memory(img.tobytes(), img.width, img.height, self.BANDS[img.mode], "uchar")
+        return vimg.copy(interpretation="b-w" if img.mode in ('L', 'LA') else "srgb")
+
+    def to_pil(self, vimg):
+        """Evaluate a vips pipeline into a PIL image."""
+        vimg = self._to_8bit(vimg)
+        if vimg.bands not in self.MODES:
+            # e.g. CMYK with alpha, or extra bands, keep the first three as RGB
+            vimg = vimg.extract_band(0, n=3)
+        mode = self.MODES[vimg.bands]
+        return Image.frombytes(mode, (vimg.width, vimg.height), vimg.write_to_memory())
+
+    def _to_rgb(self, vimg):
+        vimg = self._to_8bit(vimg)
+        if vimg.bands == 4:
+            vimg = vimg.flatten(background=255)
+        elif vimg.bands == 2:
+            vimg = vimg.extract_band(0)
+        if vimg.bands == 1:
+            vimg = vimg.bandjoin([vimg, vimg])
+        return vimg.cast("uchar")
+
+    def _to_8bit(self, vimg):
+        if vimg.interpretation not in ("srgb", "b-w"):
+            vimg = vimg.colourspace("srgb")
+        if vimg.format != "uchar":
+            vimg = vimg.cast("uchar")
+        return vimg
+
+
+BACKENDS = {
+    PillowBackend.name: PillowBackend,
+    VipsBackend.name: VipsBackend,
+}
+
+
+def create_image_backend(name):
+    """
+    Create an image backend by name, falling back to Pillow if it is unavailable.
+
+    Args:
+        name: Backend name, 'pillow' or 'vips'
+
+    Returns:
+        Backend instance
+    """
+    name = (name or DEFAULT_BACKEND).lower()
+    if name not in BACKENDS:
+        logger.warning(f"Unknown image backend '{name}', using {DEFAULT_BACKEND}")
+        name = DEFAULT_BACKEND
+    if name == VipsBackend.name and pyvips is None:
+        logger.warning("pyvips is not available, using Pillow image backend")
+        name = DEFAULT_BACKEND
+    return BACKENDS[name]()
+
+
+def set_image_backend(name):
+    """Select the process-wide image backend."""
+    global _backend
+    _backend = create_image_backend(name)
+    logger.info(f"Using {_backend.name} image backend")
+    return _backend
+
+
+def get_image_backend():
+    """Returns the process-wide image backend, Pillow unless configured otherwise."""
+    global _backend
+    if _backend is None:
+        _backend = create_image_backend(DEFAULT_BACKEND)
+    return _backend
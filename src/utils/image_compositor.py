@@ -0,0 +1,163 @@
+"""
+Fit, pad and blur compositing shared by the image plugins.
+
+image_folder, image_upload and image_album offer the same options: scale the
+image to fill the display (cropping), or pad it to fit, over a blurred copy
+of itself or a solid colour. Compositing used to resize the source twice at
+full size (ImageOps.fit for the background, ImageOps.contain for the
+foreground) and blur the background at display resolution. Here:
+
+- the foreground is resized once, and images already sized by the loader are
+  not resized again
+- the background is cropped out of the resized foreground and shrunk by
+  BLUR_SCALE in the same resize, blurred at that scale and upsampled, the
+  blur hides the missing detail
+- open_image decodes files with JPEG draft mode at the smallest scale that
+  still covers the target, so large photos are never decoded at full size
+
+The streaming vips backend keeps its own pipeline (see utils.image_backend).
+
+Usage:
+    from utils.image_compositor import compose_image, open_image
+
+    img = open_image(path, dimensions, fit="contain")
+    img = compose_image(img, dimensions, settings)
+"""
+
+import logging
+
+from PIL import Image, ImageColor, ImageFilter, ImageOps
+
+from utils.image_backend import get_image_backend
+
+logger = logging.getLogger(__name__)
+
+BLUR_RADIUS = 8
+# The background is blurred at 1/BLUR_SCALE of the display resolution
+BLUR_SCALE = 4
+ORIENTATION_TAG = 0x0112
+# EXIF orientations that swap width and height
+TRANSPOSED_ORIENTATIONS = {5, 6, 7, 8}
+
+
+def contain_size(size, dimensions):
+    """Size of an image scaled to fit inside dimensions, keeping its aspect ratio."""
+    scale = min(dimensions[0] / size[0], dimensions[1] / size[1])
+    return max(1, round(size[0] * scale)), max(1, round(size[1] * scale))
+
+
+def cover_box(size, dimensions):
+    """Centered crop box of an image with the aspect ratio of dimensions."""
+    width, height = size
+    target_ratio = dimensions[0] / dimensions[1]
+    if width / height > target_ratio:
+        crop_width = height * target_ratio
+        left = (width - crop_width) / 2
+        return left, 0, left + crop_width, height
+    crop_height = width / target_ratio
+    top = (height - crop_height) / 2
+    return 0, top, width, top + crop_height
+
+
+def open_image(source, dimensions, fit="contain"):
+    """Decodes an image scaled for the display, with EXIF orientation applied.
+
+    JPEGs are draft-decoded at the smallest scale that still covers the target size.
+
+    Args:
+        source: File path or file object.
+        dimensions: Target dimensions as (width, height).
+        fit: 'contain' to scale the image to fit inside dimensions (for padding),
+            'cover' to crop it to fill them.
+
+    Returns:
+        RGB PIL Image, dimensions sized for 'cover' and fitting inside them for 'contain'.
+    """
+    backend = get_image_backend()
+    if backend.streaming:
+        return backend.thumbnail(source, dimensions, fit=fit)
+
+    with Image.open(source) as img:
+        size = img.size
+        if img.getexif().get(ORIENTATION_TAG, 1) in TRANSPOSED_ORIENTATIONS:
+            size = size[::-1]
+        if fit == "contain":
+            target = contain_size(size, dimensions)
+        else:
+            scale = max(dimensions[0] / size[0], dimensions[1] / size[1])
+            target = (max(1, round(size[0] * scale)), max(1, round(size[1] * scale)))
+        # draft sizes are in the stored orientation
+        img.draft('RGB', target[::-1] if size != img.size else target)
+        img = ImageOps.exif_transpose(img)
+    if img.mode != 'RGB':
+        img = img.convert('RGB')
+
+    if fit == "contain":
+        return img if img.size == target else img.resize(target, Image.LANCZOS)
+    return fit_image(img, dimensions)
+
+
+def fit_image(img, dimensions):
+    """Crops and resizes an image to fill dimensions."""
+    if img.size == tuple(dimensions):
+        return img
+    return img.resize(tuple(dimensions), Image.LANCZOS, box=cover_box(img.size, dimensions))
+
+
+def _foreground(img, dimensions):
+    size = contain_size(img.size, dimensions)
+    if img.size == size:
+        return img
+    return img.resize(size, Image.LANCZOS)
+
+
+def pad_blur(img, dimensions, blur_radius=BLUR_RADIUS):
+    """Fits an image inside dimensions over a blurred, cropped copy of itself."""
+    backend = get_image_backend()
+    if backend.streaming:
+        return backend.pad(img, dimensions, blur_radius)
+
+    if img.mode not in ('RGB', 'L'):
+        img = img.convert('RGB')
+    fg = _foreground(img, dimensions)
+
+    # crop and shrink in one resize, blur small and upsample
+    small_size = (max(1, dimensions[0] // BLUR_SCALE), max(1, dimensions[1] // BLUR_SCALE))
+    bkg = fg.resize(small_size, Image.BILINEAR, box=cover_box(fg.size, dimensions))
+    bkg = bkg.filter(ImageFilter.BoxBlur(blur_radius / BLUR_SCALE))
+    bkg = bkg.resize(tuple(dimensions), Image.BILINEAR)
+
+    bkg.paste(fg, ((dimensions[0] - fg.width) // 2, (dimensions[1] - fg.height) // 2))
+    return bkg
+
+
+def pad_color(img, dimensions, color="white"):
+    """Fits an image inside dimensions over a solid colour."""
+    if img.mode not in ('RGB', 'L'):
+        img = img.convert('RGB')
+    fg = _foreground(img, dimensions)
+    bkg = Image.new(img.mode, tuple(dimensions), ImageColor.getcolor(color, img.mode))
+    bkg.paste(fg, ((dimensions[0] - fg.width) // 2, (dimensions[1] - fg.height) // 2))
+    return bkg
+
+
+def compose_image(img, dimensions, settings):
+    """Applies the image plugins' fit options to an image.
+
+    Args:
+        img: PIL Image, any size.
+        dimensions: Display dimensions as (width, height).
+        settings: Plugin settings, 'padImage' ("true" to pad instead of crop),
+            'backgroundOption' ('blur' or 'color') and 'backgroundColor'.
+
+    Returns:
+        PIL Image of the given dimensions.
+    """
+    if settings.get('padImage') != "true":
+        return fit_image(img, dimensions)
+
+    background_option = settings.get('backgroundOption', 'blur')
+    logger.debug(f"Applying padding with {background_option} background")
+    if background_option == "blur":
+        return pad_blur(img, dimensions)
+    return pad_color(img, dimensions, settings.get('backgroundColor') or "white")
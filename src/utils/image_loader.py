@@ -4,24 +4,46 @@ Centralized image loading and processing with device-aware optimizations.
 
 Automatically uses memory-efficient strategies on low-RAM devices (Pi Zero)
 and high-performance strategies on capable devices (Pi 3/4).
+
+When a streaming image backend (libvips) is configured, decode and resize are
+delegated to it so huge inputs are shrunk without materializing the full frame.
+
+Remote providers that can resize on the server side declare their renditions
+as ImageVariant objects, and the loader downloads the smallest rendition that
+still covers the target dimensions.
 """
 
 from PIL import Image, ImageOps
 from io import BytesIO
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
 from utils.http_client import get_http_session
+from utils.image_backend import get_image_backend
 import logging
+import functools
 import gc
 import psutil
+import requests
 import tempfile
+import threading
 import os
 
 logger = logging.getLogger(__name__)
 
+# Bytes read when probing the header of a variant with unknown dimensions
+PROBE_BYTES = 64 * 1024
+
+# Per-plugin download statistics: plugin_id -> {"downloads", "bytes_downloaded", "bytes_saved"}
+_TRANSFER_STATS = {}
+_TRANSFER_STATS_LOCK = threading.Lock()
 
+
+@functools.lru_cache(maxsize=None)
 def _is_low_resource_device():
     """
     Detect if running on a low-resource device (e.g., Raspberry Pi Zero).
     Returns True if device has less than 1GB RAM, False otherwise.
+
+    The result is cached, total RAM does not change while the process runs.
     """
     try:
         total_memory_gb = psutil.virtual_memory().total / (1024 ** 3)
@@ -34,6 +56,80 @@ def _is_low_resource_device():
         return True
 
 
+def covers(size, dimensions, fit="cover"):
+    """
+    Check whether an image of the given size can produce the target dimensions without upscaling.
+
+    Args:
+        size: Image size as (width, height)
+        dimensions: Target dimensions as (width, height)
+        fit: 'cover' when the image is cropped to fill the target (ImageOps.fit),
+             'contain' when it is scaled to fit inside the target (ImageOps.pad/contain)
+    """
+    width, height = size
+    target_width, target_height = dimensions
+    if fit == "contain":
+        return width >= target_width or height >= target_height
+    return width >= target_width and height >= target_height
+
+
+def with_query_params(url, params):
+    """Return the URL with the given query parameters added or replaced."""
+    parts = urlsplit(url)
+    query = dict(parse_qsl(parts.query, keep_blank_values=True))
+    query.update({key: str(value) for key, value in params.items()})
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+def get_transfer_stats():
+    """Returns a copy of the per-plugin image download statistics."""
+    with _TRANSFER_STATS_LOCK:
+        return {plugin_id: dict(stats) for plugin_id, stats in _TRANSFER_STATS.items()}
+
+
+def _record_transfer(plugin_id, downloaded_bytes, saved_bytes):
+    with _TRANSFER_STATS_LOCK:
+        stats = _TRANSFER_STATS.setdefault(plugin_id or "unknown", {
+            "downloads": 0,
+            "bytes_downloaded": 0,
+            "bytes_saved": 0
+        })
+        stats["downloads"] += 1
+        stats["bytes_downloaded"] += downloaded_bytes
+        stats["bytes_saved"] += saved_bytes
+
+
+class ImageVariant:
+    """
+    A downloadable rendition of a remote image.
+
+    Providers declare the renditions they can serve (a CDN resize URL, an API
+    thumbnail, the original file, ...) ordered from smallest to largest. The last
+    variant is treated as the original.
+
+    Attributes:
+        url: Download URL of the rendition
+        width: Pixel width if known, None to probe the image header on demand
+        height: Pixel height if known, None to probe the image header on demand
+        size_bytes: Encoded file size if known, used to report bytes saved
+    """
+
+    def __init__(self, url, width=None, height=None, size_bytes=None):
+        self.url = url
+        self.width = width
+        self.height = height
+        self.size_bytes = size_bytes
+
+    def get_size(self):
+        """Returns (width, height) if both are known, None otherwise."""
+        if self.width and self.height:
+            return (int(self.width), int(self.height))
+        return None
+
+    def __repr__(self):
+        return f"ImageVariant({self.url!r}, width={self.width}, height={self.height})"
+
+
 class AdaptiveImageLoader:
     """
     Centralized image loading with device-adaptive optimizations.
@@ -44,12 +140,13 @@ class AdaptiveImageLoader:
     - Fast in-memory loading on powerful devices
     - Automatic resizing with quality-appropriate filters
     - RGB conversion for e-ink compatibility
+    - Shrink-on-load through the configured streaming image backend
     - Comprehensive error handling and logging
 
     Usage:
         loader = AdaptiveImageLoader()
         image = loader.from_url("https://...", (800, 480))
-        image = loader.from_file("/path/to/image.jpg", (800, 480))
+        image = loader.from_variants([ImageVariant(thumb_url, 1024, 768), ImageVariant(url)], (800, 480))
     """
 
     # Default headers to avoid 403 errors from sites that block requests without User-Agent
@@ -57,8 +154,34 @@ class AdaptiveImageLoader:
         'User-Agent': 'InkyPi/1.0 (https://github.com/fatihak/InkyPi/) Python-requests'
     }
 
-    def __init__(self):
+    def __init__(self, plugin_id=None, backend=None):
         self.is_low_resource = _is_low_resource_device()
+        self.plugin_id = plugin_id
+        self.last_download_bytes = 0
+        self._backend = backend
+
+    @property
+    def backend(self):
+        """Image backend used for decoding, the process-wide one unless set explicitly."""
+        return self._backend or get_image_backend()
+
+    def _thumbnail_streaming(self, source, dimensions):
+        """
+        Decode and resize with a streaming backend.
+
+        Returns:
+            PIL Image, or None if the backend does not stream or failed to decode the source
+        """
+        backend = self.backend
+        if not backend.streaming:
+            return None
+        try:
+            img = backend.thumbnail(source, dimensions)
+            logger.info(f"Image processing complete with {backend.name} backend: {img.size[0]}x{img.size[1]}")
+            return img
+        except Exception as e:
+            logger.warning(f"{backend.name} backend could not process image, falling back to Pillow: {e}")
+            return None
 
     def from_url(self, url, dimensions, timeout_ms=40000, resize=True, headers=None):
         """
@@ -81,66 +204,87 @@ class AdaptiveImageLoader:
         else:
             return self._load_from_url_fast(url, dimensions, timeout_ms, resize, headers)
 
-    def from_file(self, path, dimensions, resize=True):
+    def from_variants(self, variants, dimensions, timeout_ms=40000, resize=True, headers=None, fit="cover"):
         """
-        Load an image from a local file and optionally resize it.
+        Load the smallest variant of a remote image that covers the target dimensions.
 
         Args:
-            path: Path to local image file
+            variants: List of ImageVariant ordered from smallest to largest, the last one being the original
             dimensions: Target dimensions as (width, height)
+            timeout_ms: Request timeout in milliseconds
             resize: Whether to resize the image (default True)
+            headers: Optional dict of HTTP headers to include in requests
+            fit: 'cover' if the image will be cropped to the target, 'contain' if it will be padded
 
         Returns:
-            PIL Image object resized to dimensions, or None on error
+            PIL Image object, or None on error
         """
-        logger.debug(f"Loading image from file: {path}")
-
-        if not os.path.exists(path):
-            logger.error(f"File not found: {path}")
+        if not variants:
+            logger.error("No image variants provided")
             return None
 
-        try:
-            if self.is_low_resource:
-                return self._load_from_file_lowmem(path, dimensions, resize)
-            else:
-                return self._load_from_file_fast(path, dimensions, resize)
-        except Exception as e:
-            logger.error(f"Error loading image from {path}: {e}")
+        variant = self.select_variant(variants, dimensions, fit=fit, headers=headers)
+        logger.info(f"Selected image variant: {variant}")
+
+        self.last_download_bytes = 0
+        img = self.from_url(variant.url, dimensions, timeout_ms=timeout_ms, resize=resize, headers=headers)
+        if img is None:
             return None
 
-    def from_bytesio(self, data, dimensions, resize=True):
-        """
-        Load an image from BytesIO object and optionally resize it.
+        # savings are only counted when the original's size is known from the provider or a probe,
+        # an extra request just for the statistics would slow down the load it measures
+        downloaded_bytes = self.last_download_bytes
+        saved_bytes = 0
+        original = variants[-1]
+        if variant is not original and original.size_bytes:
+            saved_bytes = max(original.size_bytes - downloaded_bytes, 0)
+        _record_transfer(self.plugin_id, downloaded_bytes, saved_bytes)
+        logger.info(f"Image transfer: {downloaded_bytes / 1024:.1f}KB downloaded, {saved_bytes / 1024:.1f}KB saved compared to original")
 
-        Args:
-            data: BytesIO object containing image data
-            dimensions: Target dimensions as (width, height)
-            resize: Whether to resize the image (default True)
+        return img
 
-        Returns:
-            PIL Image object resized to dimensions, or None on error
+    def select_variant(self, variants, dimensions, fit="cover", headers=None):
         """
-        logger.debug("Loading image from BytesIO")
+        Pick the smallest variant that covers the target dimensions.
 
+        Variants without known dimensions are probed by downloading the first bytes of the
+        image. Falls back to the last (original) variant if no smaller variant is large enough.
+        """
+        for variant in variants[:-1]:
+            size = variant.get_size() or self._probe_variant(variant, headers)
+            if size and covers(size, dimensions, fit):
+                return variant
+            logger.debug(f"Variant too small or unknown for {dimensions[0]}x{dimensions[1]}: {variant}")
+        return variants[-1]
+
+    def _probe_variant(self, variant, headers=None):
+        """Read the image header of a variant to determine its dimensions."""
+        request_headers = {**self.DEFAULT_HEADERS, **(headers or {}), 'Range': f'bytes=0-{PROBE_BYTES - 1}'}
         try:
-            img = Image.open(data)
-            original_size = img.size
-            original_pixels = original_size[0] * original_size[1]
-            logger.info(f"Loaded image: {original_size[0]}x{original_size[1]} ({img.mode} mode, {original_pixels/1_000_000:.1f}MP)")
-
-            if resize:
-                img = self._process_and_resize(img, dimensions, original_size)
-            else:
-                # Even without resizing, apply EXIF orientation correction
-                img = ImageOps.exif_transpose(img)
-                if img.size != original_size:
-                    logger.debug(f"EXIF orientation applied: {original_size[0]}x{original_size[1]} -> {img.size[0]}x{img.size[1]}")
-
-            return img
+            session = get_http_session()
+            with session.get(variant.url, timeout=10, stream=True, headers=request_headers) as response:
+                response.raise_for_status()
+                data = b''
+                for chunk in response.iter_content(chunk_size=8192):
+                    data += chunk
+                    if len(data) >= PROBE_BYTES:
+                        break
+
+                content_range = response.headers.get('Content-Range', '')
+                if '/' in content_range and content_range.rsplit('/', 1)[1].isdigit():
+                    variant.size_bytes = int(content_range.rsplit('/', 1)[1])
+                elif response.status_code == 200 and response.headers.get('Content-Length', '').isdigit():
+                    variant.size_bytes = int(response.headers['Content-Length'])
+
+            with Image.open(BytesIO(data)) as img:
+                variant.width, variant.height = img.size
+            logger.debug(f"Probed variant size: {variant.width}x{variant.height} ({variant.url})")
+            return variant.get_size()
         except Exception as e:
-            logger.error(f"Error loading image from BytesIO: {e}")
+            logger.debug(f"Could not probe image variant {variant.url}: {e}")
             return None
 
+
     # ========== LOW-RESOURCE IMPLEMENTATIONS ==========
 
     def _load_from_url_lowmem(self, url, dimensions, timeout_ms, resize, headers=None):
@@ -168,6 +312,7 @@ class AdaptiveImageLoader:
                         downloaded_bytes += len(chunk)
 
                 logger.debug(f"Downloaded {downloaded_bytes / 1024:.1f}KB to temp file")
+                self.last_download_bytes = downloaded_bytes
 
             # Load from temp file with draft mode
             return self._load_from_file_lowmem(tmp_path, dimensions, resize)
@@ -189,6 +334,11 @@ class AdaptiveImageLoader:
 
     def _load_from_file_lowmem(self, path, dimensions, resize):
         """Low-memory file loading using draft mode."""
+        if resize:
+            img = self._thumbnail_streaming(path, dimensions)
+            if img is not None:
+                return img
+
         try:
             img = Image.open(path)
             original_size = img.size
@@ -236,6 +386,12 @@ class AdaptiveImageLoader:
             response = session.get(url, timeout=timeout_ms / 1000, stream=True, headers=request_headers)
             response.raise_for_status()
 
+            self.last_download_bytes = len(response.content)
+            if resize:
+                img = self._thumbnail_streaming(response.content, dimensions)
+                if img is not None:
+                    return img
+
             img = Image.open(BytesIO(response.content))
             original_size = img.size
             original_pixels = original_size[0] * original_size[1]
@@ -260,6 +416,11 @@ class AdaptiveImageLoader:
 
     def _load_from_file_fast(self, path, dimensions, resize):
         """High-performance file loading using in-memory processing."""
+        if resize:
+            img = self._thumbnail_streaming(path, dimensions)
+            if img is not None:
+                return img
+
         try:
             img = Image.open(path)
             original_size = img.size
@@ -0,0 +1,110 @@
+"""
+In-memory cache of the latest generated image of each plugin instance.
+
+Between refreshes of a plugin instance the playlist shows its latest image
+again, which used to be decoded from the PNG on disk and hashed over the
+full frame on every cycle. ImageMemoryCache keeps the most recent images
+with their hashes instead, least recently used first out:
+
+- the budget is a fraction of the memory available at startup, capped, so a
+  Pi Zero keeps a handful of frames and larger boards a whole playlist
+- an entry is only used while its hash matches the instance's image_hash,
+  an image regenerated or replaced elsewhere falls back to the disk
+- images are shared, callers must not modify them in place
+- deleting a plugin instance discards its entry
+
+Usage:
+    from utils.image_memory_cache import get_image_memory_cache
+
+    entry = get_image_memory_cache().get(plugin_image_path, plugin_instance.image_hash)
+    if entry is None:
+        ...
+    get_image_memory_cache().put(plugin_image_path, image, image_hash)
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+
+import psutil
+
+logger = logging.getLogger(__name__)
+
+# Share of the available memory the cache may use, and its bounds in bytes
+MEMORY_FRACTION = 0.05
+MIN_BUDGET_BYTES = 8 * 1024 * 1024
+MAX_BUDGET_BYTES = 128 * 1024 * 1024
+
+
+def get_memory_budget():
+    """Returns the cache budget in bytes, sized from the available memory."""
+    try:
+        available = psutil.virtual_memory().available
+    except Exception as e:
+        logger.warning(f"Could not detect available memory: {e}. Using the minimum image cache budget.")
+        return MIN_BUDGET_BYTES
+    return int(min(max(available * MEMORY_FRACTION, MIN_BUDGET_BYTES), MAX_BUDGET_BYTES))
+
+
+def get_image_size(image):
+    """Approximate memory used by the pixels of a PIL image, in bytes."""
+    return image.width * image.height * len(image.getbands())
+
+
+class ImageMemoryCache:
+    """Memory budgeted LRU of (image, image_hash) by plugin image path."""
+
+    def __init__(self, budget=None):
+        self.budget = get_memory_budget() if budget is None else budget
+        self.size = 0
+        # path -> (image, image_hash, size), least recently used first
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, path, image_hash):
+        """Returns (image, image_hash) cached for path if it still has image_hash, else None."""
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is None or not image_hash or entry[1] != image_hash:
+                return None
+            self._entries.move_to_end(path)
+            return entry[0], entry[1]
+
+    def put(self, path, image, image_hash):
+        """Caches the latest image of path, evicting least recently used images over the budget."""
+        size = get_image_size(image)
+        with self._lock:
+            self._remove(path)
+            if size > self.budget:
+                logger.debug(f"Image of {size} bytes exceeds the cache budget, not cached | path: {path}")
+                return
+            self._entries[path] = (image, image_hash, size)
+            self.size += size
+            while self.size > self.budget:
+                evicted, (_, _, evicted_size) = self._entries.popitem(last=False)
+                self.size -= evicted_size
+                logger.debug(f"Evicted cached image | path: {evicted}")
+
+    def discard(self, path):
+        """Drops the image cached for path, if any."""
+        with self._lock:
+            self._remove(path)
+
+    def _remove(self, path):
+        entry = self._entries.pop(path, None)
+        if entry is not None:
+            self.size -= entry[2]
+
+
+_image_memory_cache = None
+_image_memory_cache_lock = threading.Lock()
+
+
+def get_image_memory_cache():
+    """Returns the process wide image cache, created on first use."""
+    global _image_memory_cache
+    with _image_memory_cache_lock:
+        if _image_memory_cache is None:
+            _image_memory_cache = ImageMemoryCache()
+            logger.info(f"Image memory cache budget: {_image_memory_cache.budget // (1024 * 1024)} MB")
+        return _image_memory_cache
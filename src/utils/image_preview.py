@@ -0,0 +1,144 @@
+"""
+Resized previews of generated images for the web UI.
+
+The main page polls the current image and the playlist page shows the latest
+image of every plugin instance, all full resolution PNGs of a few hundred KB.
+get_preview returns a copy scaled down to a requested width, encoded as WebP
+when the browser accepts it and JPEG otherwise. Requested widths are snapped
+up to PREVIEW_WIDTHS, so only a handful of sizes are ever encoded per image,
+and encoded previews are cached on disk until the image changes.
+
+HTTP validators and cached previews are keyed by image_etag, which combines
+the stored image hash with the file's mtime and size, so they change whenever
+the image file is rewritten.
+
+Usage:
+    from utils.image_preview import image_etag, get_preview
+
+    etag = image_etag(image_path, image_hash)
+    preview = get_preview(image_path, etag, 320, "webp")
+"""
+
+import hashlib
+import logging
+import os
+import tempfile
+
+from PIL import Image, features
+
+from utils.app_utils import get_cache_dir
+
+logger = logging.getLogger(__name__)
+
+PREVIEW_CACHE_DIR = "previews"
+PREVIEW_WIDTHS = (160, 320, 640, 800, 1280)
+MAX_CACHE_BYTES = 32 * 1024 * 1024
+WEBP_QUALITY = 80
+JPEG_QUALITY = 85
+
+PREVIEW_FORMATS = {
+    "webp": ("WEBP", "image/webp", ".webp"),
+    "jpeg": ("JPEG", "image/jpeg", ".jpg"),
+}
+
+
+def image_etag(image_path, image_hash=None):
+    """Returns a strong validator for an image file, or None if it does not exist.
+
+    Args:
+        image_path: Path of the image.
+        image_hash: Hash of the image content as stored in the config, if known.
+    """
+    try:
+        stat = os.stat(image_path)
+    except OSError:
+        return None
+    # the file identity guards against images written without updating the stored hash
+    return f"{(image_hash or 'file')[:16]}-{stat.st_mtime_ns:x}-{stat.st_size:x}"
+
+
+def snap_width(width, image_width):
+    """Snaps a requested width up to one of PREVIEW_WIDTHS.
+
+    Returns:
+        int: The preview width, or None if the full size image should be served.
+    """
+    for preview_width in PREVIEW_WIDTHS:
+        if preview_width >= width:
+            return preview_width if preview_width < image_width else None
+    return None
+
+
+def preferred_format(accept_header):
+    """Returns the preview format for a request's Accept header, webp when supported."""
+    if "image/webp" in (accept_header or "") and features.check("webp"):
+        return "webp"
+    return "jpeg"
+
+
+def _encode_preview(image_path, width, image_format, path):
+    with Image.open(image_path) as image:
+        height = max(1, round(image.height * width / image.width))
+        preview = image.convert("RGB").resize((width, height), Image.LANCZOS)
+
+    pil_format, _, _ = PREVIEW_FORMATS[image_format]
+    options = {"quality": WEBP_QUALITY, "method": 4} if pil_format == "WEBP" else {"quality": JPEG_QUALITY, "optimize": True}
+    cache_dir = os.path.dirname(path)
+    with tempfile.NamedTemporaryFile(dir=cache_dir, suffix=".tmp", delete=False) as tmp_file:
+        preview.save(tmp_file, format=pil_format, **options)
+    os.replace(tmp_file.name, path)
+
+
+def get_preview(image_path, etag, width, image_format, cache_dir=None):
+    """Returns a preview of an image at about the requested width, encoding it if not cached.
+
+    Args:
+        image_path: Path of the full size image.
+        etag: image_etag of the image, previews are cached per etag.
+        width: Requested width in pixels, snapped up to PREVIEW_WIDTHS.
+        image_format: "webp" or "jpeg".
+        cache_dir: Optional cache directory, defaults to the preview cache.
+
+    Returns:
+        tuple: (path, mimetype, width) of the preview, or None if the full size image
+            is not wider than the preview would be.
+    """
+    with Image.open(image_path) as image:
+        image_width = image.width
+    width = snap_width(width, image_width)
+    if width is None:
+        return None
+
+    cache_dir = cache_dir or get_cache_dir(PREVIEW_CACHE_DIR)
+    _, mimetype, extension = PREVIEW_FORMATS[image_format]
+    key = hashlib.sha256(f"{image_path}|{etag}".encode("utf-8")).hexdigest()[:32]
+    path = os.path.join(cache_dir, f"{key}-{width}{extension}")
+
+    if os.path.exists(path):
+        # mark as recently used for pruning
+        os.utime(path)
+    else:
+        _encode_preview(image_path, width, image_format, path)
+        logger.debug(f"Encoded {width}px {image_format} preview of {image_path}")
+        prune_preview_cache(cache_dir=cache_dir)
+    return path, mimetype, width
+
+
+def prune_preview_cache(max_bytes=MAX_CACHE_BYTES, cache_dir=None):
+    """Deletes the least recently used previews until the cache fits max_bytes."""
+    cache_dir = cache_dir or get_cache_dir(PREVIEW_CACHE_DIR)
+    entries = []
+    for entry in os.scandir(cache_dir):
+        if entry.is_file() and not entry.name.endswith(".tmp"):
+            stat = entry.stat()
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+            total -= size
+        except OSError:
+            pass
@@ -1,6 +1,8 @@
 import requests
-from PIL import Image, ImageEnhance, ImageOps, ImageFilter
+from PIL import Image
 from io import BytesIO
+from utils.image_backend import get_image_backend
+from utils.image_compositor import pad_blur
 import os
 import logging
 import hashlib
@@ -28,13 +30,20 @@ def change_orientation(image, orientation, inverted=False):
     if inverted:
         angle = (angle + 180) % 360
 
-    return image.rotate(angle, expand=1)
+    if angle == 0:
+        # nothing to rotate, avoid copying the frame
+        return image
+    return get_image_backend().rotate(image, angle)
 
 def resize_image(image, desired_size, image_settings=[]):
     img_width, img_height = image.size
     desired_width, desired_height = desired_size
     desired_width, desired_height = int(desired_width), int(desired_height)
 
+    if (img_width, img_height) == (desired_width, desired_height):
+        # already the desired size, cropping and resampling would return the same pixels
+        return image
+
     img_ratio = img_width / img_height
     desired_ratio = desired_width / desired_height
 
@@ -55,32 +64,20 @@ def resize_image(image, desired_size, image_settings=[]):
         if not keep_width:
             y_offset = (img_height - new_height) // 2
 
-    # Step 2: Crop the image
-    image = image.crop((x_offset, y_offset, x_offset + new_width, y_offset + new_height))
+    # Step 2: Crop the image (if the aspect ratio differs)
+    if (new_width, new_height) != (img_width, img_height):
+        image = image.crop((x_offset, y_offset, x_offset + new_width, y_offset + new_height))
 
     # Step 3: Resize to the exact desired dimensions (if necessary)
     return image.resize((desired_width, desired_height), Image.LANCZOS)
 
-def apply_image_enhancement(img, image_settings={}):
-    # Convert image to RGB mode if necessary for enhancement operations
-    # ImageEnhance requires RGB mode for operations like blend
-    if img.mode not in ('RGB', 'L'):
-        img = img.convert('RGB')
-        
-
-    # Apply Brightness
-    img = ImageEnhance.Brightness(img).enhance(image_settings.get("brightness", 1.0))
-
-    # Apply Contrast
-    img = ImageEnhance.Contrast(img).enhance(image_settings.get("contrast", 1.0))
-
-    # Apply Saturation (Color)
-    img = ImageEnhance.Color(img).enhance(image_settings.get("saturation", 1.0))
+ENHANCEMENT_SETTINGS = ("brightness", "contrast", "saturation", "sharpness")
 
-    # Apply Sharpness
-    img = ImageEnhance.Sharpness(img).enhance(image_settings.get("sharpness", 1.0))
-
-    return img
+def apply_image_enhancement(img, image_settings={}):
+    if all(float((image_settings or {}).get(key, 1.0)) == 1.0 for key in ENHANCEMENT_SETTINGS):
+        # every factor is neutral, only the mode conversion of the enhancement is needed
+        return img if img.mode in ('RGB', 'L') else img.convert('RGB')
+    return get_image_backend().enhance(img, image_settings)
 
 def compute_image_hash(image):
     """Compute SHA-256 hash of an image."""
@@ -173,10 +170,4 @@ def take_screenshot(target, dimensions, timeout_ms=None):
     return image
 
 def pad_image_blur(img: Image, dimensions: tuple[int, int]) -> Image:
-    bkg = ImageOps.fit(img, dimensions)
-    bkg = bkg.filter(ImageFilter.BoxBlur(8))
-    img = ImageOps.contain(img, dimensions)
-
-    img_size = img.size
-    bkg.paste(img, ((dimensions[0] - img_size[0]) // 2, (dimensions[1] - img_size[1]) // 2))
-    return bkg
+    return pad_blur(img, dimensions)
@@ -0,0 +1,187 @@
+"""
+Background persistence of generated images.
+
+Every refresh used to write PNGs synchronously with the default zlib level,
+the plugin instance image and the current image, on an SD card that takes
+hundreds of milliseconds before the display is even updated. ImageWriter
+encodes and writes images on a background thread instead:
+
+- files are written to a temporary file and renamed, readers never see a
+  partial image
+- a newer write to the same path replaces a queued one, and an image written
+  to several paths is encoded once
+- PNGs use a fast compress_level (1 by default), the files are a bit larger
+- images still queued are returned by load(), so the latest image can be read
+  back before it reached the disk; flush() waits for queued writes
+
+Internal caches can pass image_format="raw", the pixels behind a small
+header, which costs no encoding at all. It is much larger than a PNG, so it
+is meant for small caches on fast storage; load_image reads both formats.
+
+Usage:
+    from utils.image_writer import get_image_writer
+
+    get_image_writer().write(image, plugin_image_path)
+    image = get_image_writer().load(plugin_image_path)
+"""
+
+import atexit
+import io
+import logging
+import os
+import struct
+import tempfile
+import threading
+from collections import OrderedDict
+
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_COMPRESS_LEVEL = 1
+FLUSH_TIMEOUT_SECONDS = 10
+RAW_MAGIC = b"IKRW"
+# magic, mode (padded), width, height
+RAW_HEADER = struct.Struct("<4s4sII")
+
+
+def encode_image(image, image_format="png", compress_level=DEFAULT_COMPRESS_LEVEL):
+    """Encodes an image as PNG or raw pixels with a header.
+
+    Returns:
+        bytes: The encoded image.
+    """
+    if image_format.lower() == "raw":
+        if len(image.mode) > 4:
+            raise ValueError(f"Image mode {image.mode} can't be stored as raw")
+        return RAW_HEADER.pack(RAW_MAGIC, image.mode.encode("ascii"), image.width, image.height) + image.tobytes()
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG", compress_level=compress_level)
+    return buffer.getvalue()
+
+
+def write_file_atomic(path, data):
+    """Writes data to a temporary file next to path and renames it into place."""
+    with tempfile.NamedTemporaryFile(dir=os.path.dirname(path) or ".", suffix=".tmp", delete=False) as tmp_file:
+        try:
+            tmp_file.write(data)
+        except Exception:
+            tmp_file.close()
+            os.remove(tmp_file.name)
+            raise
+    os.replace(tmp_file.name, path)
+
+
+def save_image(image, path, image_format="png", compress_level=DEFAULT_COMPRESS_LEVEL):
+    """Encodes and writes an image atomically on the calling thread."""
+    write_file_atomic(path, encode_image(image, image_format, compress_level))
+
+
+def load_image(path):
+    """Loads an image written in any supported format, fully read into memory."""
+    with open(path, "rb") as f:
+        header = f.read(RAW_HEADER.size)
+        if header[:len(RAW_MAGIC)] == RAW_MAGIC:
+            _, mode, width, height = RAW_HEADER.unpack(header)
+            return Image.frombytes(mode.rstrip(b"\0").decode("ascii"), (width, height), f.read())
+        f.seek(0)
+        with Image.open(f) as image:
+            return image.copy()
+
+
+class ImageWriter:
+    """Writes images on a background thread, the latest write per path wins."""
+
+    def __init__(self, compress_level=DEFAULT_COMPRESS_LEVEL):
+        self.compress_level = compress_level
+        # path -> (image, image_format), oldest first; entries stay until written
+        self._pending = OrderedDict()
+        self._condition = threading.Condition()
+        self._thread = None
+
+    def write(self, image, paths, image_format="png"):
+        """Queues writing an image to one or more paths.
+
+        The image must not be modified afterwards, it is encoded later.
+        """
+        paths = [paths] if isinstance(paths, (str, os.PathLike)) else list(paths)
+        entry = (image, image_format)
+        with self._condition:
+            for path in paths:
+                self._pending.pop(str(path), None)
+                self._pending[str(path)] = entry
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="ImageWriter", daemon=True)
+                self._thread.start()
+            self._condition.notify_all()
+
+    def get_pending(self, path):
+        """Returns the image queued for path, or None if nothing is queued."""
+        with self._condition:
+            entry = self._pending.get(str(path))
+        return entry[0] if entry else None
+
+    def load(self, path):
+        """Loads the latest image of a path, the queued one if it was not written yet."""
+        image = self.get_pending(path)
+        if image is not None:
+            return image.copy()
+        return load_image(path)
+
+    def flush(self, paths=None, timeout=FLUSH_TIMEOUT_SECONDS):
+        """Waits until the given paths, or all queued images, are written.
+
+        Returns:
+            bool: False if the timeout expired first.
+        """
+        paths = None if paths is None else {str(path) for path in ([paths] if isinstance(paths, str) else paths)}
+        with self._condition:
+            return self._condition.wait_for(
+                lambda: not (self._pending.keys() if paths is None else paths & self._pending.keys()),
+                timeout=timeout)
+
+    def _run(self):
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._pending)
+                image, image_format = next(iter(self._pending.values()))
+                # the same image queued for several paths is encoded once
+                batch = [(path, entry) for path, entry in self._pending.items()
+                         if entry[0] is image and entry[1] == image_format]
+            paths = [path for path, _ in batch]
+
+            try:
+                data = encode_image(image, image_format, self.compress_level)
+                for path in paths:
+                    write_file_atomic(path, data)
+                logger.debug(f"Wrote {len(data)} bytes to {', '.join(paths)}")
+            except Exception as e:
+                logger.error(f"Failed to write image to {', '.join(paths)}: {e}")
+
+            with self._condition:
+                for path, entry in batch:
+                    # a newer write queued for the same path in the meantime stays queued
+                    if self._pending.get(path) is entry:
+                        del self._pending[path]
+                self._condition.notify_all()
+
+
+_image_writer = ImageWriter()
+# queued images are written before the process exits
+atexit.register(_image_writer.flush)
+
+
+def configure_image_writer(compress_level=DEFAULT_COMPRESS_LEVEL):
+    """Sets the zlib compress_level (0-9) of the PNGs written by the process wide writer."""
+    try:
+        compress_level = min(max(int(compress_level), 0), 9)
+    except (TypeError, ValueError):
+        logger.warning(f"Invalid image compress level '{compress_level}', using {DEFAULT_COMPRESS_LEVEL}")
+        compress_level = DEFAULT_COMPRESS_LEVEL
+    _image_writer.compress_level = compress_level
+    return _image_writer
+
+
+def get_image_writer():
+    """Returns the process wide image writer."""
+    return _image_writer
@@ -0,0 +1,129 @@
+"""
+Streaming log export.
+
+Journal records are formatted, filtered and encoded one at a time, so a log
+download of any time window uses constant memory: filter_log_lines yields the
+matching lines, iter_chunks batches them into chunks for the response and
+gzip_chunks optionally compresses the chunks on the fly.
+
+Records are dicts with the formatted "line", the raw "message" and the
+journal "priority" (syslog level, or None). InkyPi's own messages carry the
+Python log level and logger name (see config/logging.conf), other output is
+filtered by its syslog priority. Lines that continue a record, like
+traceback lines, follow the filter result of the record they belong to.
+"""
+
+import logging
+import re
+import zlib
+from datetime import datetime
+
+# Records returned by one export at most
+MAX_RECORDS = 50_000
+CHUNK_SIZE = 64 * 1024
+
+# "%(asctime)s - %(levelname)s - %(name)s - %(message)s"
+LOG_LINE_PATTERN = re.compile(r"^\S+ - (?P<level>DEBUG|INFO|WARNING|ERROR|CRITICAL) - (?P<logger>\S+) - ")
+
+# syslog priorities to python log levels
+SYSLOG_LEVELS = {
+    0: logging.CRITICAL, 1: logging.CRITICAL, 2: logging.CRITICAL, 3: logging.ERROR,
+    4: logging.WARNING, 5: logging.INFO, 6: logging.INFO, 7: logging.DEBUG,
+}
+
+
+def parse_level(level_name):
+    """Returns the python log level for a name like "warning", or None if it is not a level."""
+    if not level_name:
+        return None
+    level = logging.getLevelName(level_name.strip().upper())
+    return level if isinstance(level, int) else None
+
+
+def format_journal_record(record):
+    """Formats a journal record like journalctl's default output."""
+    try:
+        ts = datetime.fromtimestamp(record.get_realtime_usec() / 1_000_000)
+        formatted_ts = ts.strftime("%b %d %H:%M:%S")
+    except Exception:
+        formatted_ts = "??? ?? ??:??:??"
+
+    data = record.data
+    hostname = data.get("_HOSTNAME", "unknown-host")
+    identifier = data.get("SYSLOG_IDENTIFIER") or data.get("_COMM", "?")
+    pid = data.get("_PID", "?")
+    msg = data.get("MESSAGE", "").rstrip()
+    try:
+        priority = int(data.get("PRIORITY"))
+    except (TypeError, ValueError):
+        priority = None
+
+    return {"line": f"{formatted_ts} {hostname} {identifier}[{pid}]: {msg}\n", "message": msg, "priority": priority}
+
+
+def filter_log_lines(records, level=None, logger_name=None, text=None, limit=MAX_RECORDS):
+    """Yields the lines of the records matching every given filter.
+
+    Args:
+        records: Iterable of record dicts, read lazily.
+        level: Minimum python log level.
+        logger_name: Logger name, matches the logger and its children.
+        text: Case insensitive text the line must contain.
+        limit: Maximum number of lines, a note is added when the export is cut short.
+    """
+    text = text.lower() if text else None
+    # whether the latest record matched, lines continuing it follow it
+    matched = level is None and not logger_name
+    count = 0
+    for record in records:
+        match = LOG_LINE_PATTERN.match(record["message"])
+        if match:
+            matched = _matches(logging.getLevelName(match.group("level")), match.group("logger"), level, logger_name)
+            keep = matched
+        elif record["priority"] is not None and record["priority"] < 6:
+            # warnings and errors of other output, e.g. the browser
+            keep = _matches(SYSLOG_LEVELS.get(record["priority"], logging.INFO), None, level, logger_name)
+        else:
+            # continuation of the previous record, e.g. a traceback
+            keep = matched
+        if keep and text and text not in record["line"].lower():
+            keep = False
+        if not keep:
+            continue
+
+        if count >= limit:
+            yield f"... export stopped after {limit} lines\n"
+            return
+        count += 1
+        yield record["line"]
+
+
+def _matches(record_level, record_logger, level, logger_name):
+    if level is not None and record_level < level:
+        return False
+    if logger_name:
+        return record_logger is not None and (record_logger == logger_name or record_logger.startswith(logger_name + "."))
+    return True
+
+
+def iter_chunks(lines, chunk_size=CHUNK_SIZE):
+    """Joins lines into chunks of about chunk_size characters."""
+    chunk, size = [], 0
+    for line in lines:
+        chunk.append(line)
+        size += len(line)
+        if size >= chunk_size:
+            yield "".join(chunk)
+            chunk, size = [], 0
+    if chunk:
+        yield "".join(chunk)
+
+
+def gzip_chunks(chunks):
+    """Compresses text chunks into a gzip stream, yielding compressed bytes as they are produced."""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode("utf-8"))
+        if data:
+            yield data
+    yield compressor.flush()
@@ -1,4 +1,5 @@
 import logging
+from datetime import datetime, time, timedelta
 
 logger = logging.getLogger(__name__)
 
@@ -12,4 +13,18 @@ def calculate_seconds(interval, unit):
         seconds = interval * 60 * 60 * 24
     else:
         logger.warning(f"Unrecognized unit: {unit}, defaulting to 5 minutes")
-    return seconds
\ No newline at end of file
+    return seconds
+
+def localize(naive_dt, tzinfo):
+    """Attaches tzinfo to a naive datetime, using pytz's localize when available so DST offsets are right.
+
+    Times repeated when DST ends resolve to the first occurrence.
+    """
+    if hasattr(tzinfo, "localize"):
+        return tzinfo.localize(naive_dt, is_dst=True)
+    return naive_dt.replace(tzinfo=tzinfo)
+
+def start_of_next_day(current_dt):
+    """Returns local midnight following current_dt, in the same timezone."""
+    next_day = current_dt.date() + timedelta(days=1)
+    return localize(datetime.combine(next_day, time()), current_dt.tzinfo)
@@ -0,0 +1,262 @@
+"""
+Ingest pipeline for uploaded images.
+
+Uploads used to be decoded on the request thread to apply the EXIF
+orientation and re-encoded with default quality, which is slow, lossy and
+needs the whole decoded frame in memory for large photos. Now:
+
+- uploads are streamed to disk in chunks while they are hashed, and stored as
+  "<name>-<hash>.<ext>", the original bytes untouched
+- an upload whose content is already stored is not written again, the stored
+  file is reused
+- the size and EXIF orientation are read from the header and recorded in a
+  small JSON file next to the derivatives, nothing is decoded
+- a display sized derivative, with the orientation applied, is built by a
+  background worker thread; plugins display it through get_display_path and
+  fall back to the original until it is ready
+
+Metadata and derivatives are disposable, they live under src/cache/uploads and
+are rebuilt on demand.
+
+Usage:
+    from utils.upload_ingest import ingest_upload, get_display_path
+
+    path = ingest_upload(request_file, save_dir, derivative_size=800)
+    image_path = get_display_path(path, 800)
+"""
+
+import glob
+import hashlib
+import json
+import logging
+import os
+import queue
+import re
+import tempfile
+import threading
+
+from PIL import Image, ImageOps
+
+from utils.app_utils import get_cache_dir
+from utils.image_compositor import ORIENTATION_TAG, TRANSPOSED_ORIENTATIONS
+
+logger = logging.getLogger(__name__)
+
+UPLOAD_CACHE_DIR = "uploads"
+CHUNK_SIZE = 1024 * 1024
+HASH_LENGTH = 16
+DERIVATIVE_QUALITY = 95
+RASTER_EXTENSIONS = {'png', 'avif', 'jpg', 'jpeg', 'gif', 'webp', 'heif', 'heic'}
+
+UPLOAD_NAME_PATTERN = re.compile(rf"-(?P<digest>[0-9a-f]{{{HASH_LENGTH}}})\.[^.]+$")
+
+_jobs = queue.Queue()
+_pending = set()
+_pending_lock = threading.Lock()
+_worker = None
+
+
+def get_upload_digest(path):
+    """Returns the content hash in the name of an ingested upload, or None for other files."""
+    match = UPLOAD_NAME_PATTERN.search(os.path.basename(path))
+    return match.group("digest") if match else None
+
+
+def _is_raster(path):
+    return os.path.splitext(path)[1].replace('.', '').lower() in RASTER_EXTENSIONS
+
+
+def _info_path(digest):
+    return os.path.join(get_cache_dir(UPLOAD_CACHE_DIR), f"{digest}.json")
+
+
+def derivative_path(digest, size):
+    """Path of the derivative of an upload whose shorter side is scaled to size."""
+    return os.path.join(get_cache_dir(UPLOAD_CACHE_DIR), f"{digest}-{size}.jpg")
+
+
+def ingest_upload(file, save_dir, derivative_size=None):
+    """Stores an uploaded file, reusing the stored copy if the same content was uploaded before.
+
+    Args:
+        file: Uploaded file with a filename and a readable stream, e.g. a werkzeug FileStorage.
+        save_dir: Directory uploads are stored in.
+        derivative_size: Shorter side of the display derivative to build in the background,
+            usually the longer side of the display resolution. None builds none yet.
+
+    Returns:
+        str: Path of the stored file.
+    """
+    stem, extension = os.path.splitext(os.path.basename(file.filename))
+    digest = hashlib.sha256()
+    with tempfile.NamedTemporaryFile(dir=save_dir, suffix=".tmp", delete=False) as tmp_file:
+        try:
+            while True:
+                chunk = file.stream.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                digest.update(chunk)
+                tmp_file.write(chunk)
+        except Exception:
+            tmp_file.close()
+            os.remove(tmp_file.name)
+            raise
+    digest = digest.hexdigest()[:HASH_LENGTH]
+
+    existing = glob.glob(os.path.join(glob.escape(save_dir), f"*-{digest}.*"))
+    if existing:
+        os.remove(tmp_file.name)
+        path = existing[0]
+        logger.info(f"Upload {file.filename} is already stored as {os.path.basename(path)}")
+    else:
+        path = os.path.join(save_dir, f"{stem}-{digest}{extension}")
+        os.replace(tmp_file.name, path)
+        logger.info(f"Stored upload {file.filename} as {os.path.basename(path)}")
+
+    if _is_raster(path):
+        try:
+            read_upload_info(path)
+        except Exception as e:
+            logger.warning(f"Could not read image info of {path}: {e}")
+        if derivative_size:
+            schedule_derivative(path, derivative_size)
+    return path
+
+
+def read_upload_info(path):
+    """Returns the recorded size and orientation of an ingested image, reading its header if not recorded.
+
+    Returns:
+        dict: {"width", "height", "orientation"} where width and height are the displayed size,
+            with the orientation applied, or None if the file is not an ingested upload.
+    """
+    digest = get_upload_digest(path)
+    if not digest:
+        return None
+
+    info_path = _info_path(digest)
+    try:
+        with open(info_path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        pass
+
+    # only the header is read, the image is not decoded
+    with Image.open(path) as image:
+        width, height = image.size
+        orientation = image.getexif().get(ORIENTATION_TAG, 1)
+    if orientation in TRANSPOSED_ORIENTATIONS:
+        width, height = height, width
+    info = {"width": width, "height": height, "orientation": orientation}
+
+    tmp_path = f"{info_path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(info, f)
+    os.replace(tmp_path, info_path)
+    return info
+
+
+def get_display_path(path, size):
+    """Returns the file to display for an upload, its derivative when one is ready.
+
+    Args:
+        path: Path of the upload.
+        size: Shorter side the displayed image needs, usually the longer side of the display.
+
+    Returns:
+        str: The derivative, or the original if it is small enough, not an ingested image or
+            its derivative is not built yet, in which case it is scheduled.
+    """
+    if not _is_raster(path) or not get_upload_digest(path):
+        return path
+    try:
+        info = read_upload_info(path)
+    except Exception as e:
+        logger.warning(f"Could not read image info of {path}: {e}")
+        return path
+    if min(info["width"], info["height"]) <= size:
+        return path
+
+    derivative = derivative_path(get_upload_digest(path), size)
+    if os.path.exists(derivative):
+        return derivative
+    schedule_derivative(path, size)
+    return path
+
+
+def schedule_derivative(path, size):
+    """Queues building the derivative of an upload on the background worker."""
+    with _pending_lock:
+        if (path, size) in _pending:
+            return
+        _pending.add((path, size))
+        _start_worker()
+    _jobs.put((path, size))
+
+
+def _start_worker():
+    global _worker
+    if _worker is None or not _worker.is_alive():
+        _worker = threading.Thread(target=_run_worker, name="upload-ingest", daemon=True)
+        _worker.start()
+
+
+def _run_worker():
+    while True:
+        path, size = _jobs.get()
+        try:
+            build_derivative(path, size)
+        except Exception as e:
+            logger.warning(f"Failed to build derivative of {path}: {e}")
+        finally:
+            with _pending_lock:
+                _pending.discard((path, size))
+            _jobs.task_done()
+
+
+def wait_for_derivatives():
+    """Blocks until every queued derivative is built."""
+    _jobs.join()
+
+
+def build_derivative(path, size):
+    """Builds the derivative of an upload: oriented, RGB and scaled so its shorter side is size.
+
+    Returns:
+        str: Path of the derivative, or None if the original is small enough to display as is.
+    """
+    info = read_upload_info(path)
+    if info is None or min(info["width"], info["height"]) <= size:
+        return None
+    derivative = derivative_path(get_upload_digest(path), size)
+    if os.path.exists(derivative):
+        return derivative
+
+    scale = size / min(info["width"], info["height"])
+    target = (max(1, round(info["width"] * scale)), max(1, round(info["height"] * scale)))
+    with Image.open(path) as image:
+        # JPEGs are decoded at a reduced scale, draft sizes are in the stored orientation
+        draft_size = target[::-1] if info["orientation"] in TRANSPOSED_ORIENTATIONS else target
+        image.draft("RGB", draft_size)
+        image = ImageOps.exif_transpose(image).convert("RGB")
+        image = image.resize(target, Image.LANCZOS)
+
+    tmp_path = f"{derivative}.tmp"
+    image.save(tmp_path, format="JPEG", quality=DERIVATIVE_QUALITY, subsampling=0)
+    os.replace(tmp_path, derivative)
+    logger.info(f"Built {target[0]}x{target[1]} derivative of {os.path.basename(path)}")
+    return derivative
+
+
+def delete_upload(path):
+    """Deletes an upload with its recorded info and derivatives."""
+    if os.path.exists(path):
+        os.remove(path)
+    digest = get_upload_digest(path)
+    if digest:
+        cache_dir = get_cache_dir(UPLOAD_CACHE_DIR)
+        for cached in glob.glob(os.path.join(glob.escape(cache_dir), f"{digest}[.-]*")):
+            try:
+                os.remove(cached)
+            except OSError:
+                pass
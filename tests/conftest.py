@@ -0,0 +1,6 @@
+import os
+import sys
+
+# modules under src import each other absolutely (e.g. "from utils.app_utils import ..."),
+# the same way they are resolved when the app runs from src
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
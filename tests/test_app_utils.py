@@ -0,0 +1,56 @@
+from collections import OrderedDict
+
+import pytest
+
+pytest.importorskip("PIL.ImageFont")
+
+from utils import app_utils
+from utils.app_utils import get_font, preload_fonts
+
+
+@pytest.fixture(autouse=True)
+def font_cache(monkeypatch):
+    monkeypatch.setattr(app_utils, "_font_cache", OrderedDict())
+    monkeypatch.setattr(app_utils, "_font_data", {})
+    return app_utils._font_cache
+
+
+def fail_open(path, *args, **kwargs):
+    pytest.fail(f"{path} opened although it was preloaded")
+
+
+class TestFontCache:
+
+    def test_sized_faces_are_cached(self, font_cache):
+        font = get_font("Jost", 20)
+
+        assert get_font("Jost", 20) is font
+        assert get_font("Jost", 30) is not font
+        assert get_font("Jost", 20, "bold") is not font
+        assert list(font_cache) == [("Jost", "normal", 20), ("Jost", "normal", 30), ("Jost", "bold", 20)]
+
+    def test_least_recently_used_face_is_evicted(self, font_cache, monkeypatch):
+        monkeypatch.setattr(app_utils, "FONT_CACHE_SIZE", 2)
+        first = get_font("Jost", 10)
+        get_font("Jost", 20)
+        assert get_font("Jost", 10) is first
+        get_font("Jost", 30)
+
+        assert list(font_cache) == [("Jost", "normal", 10), ("Jost", "normal", 30)]
+        assert get_font("Jost", 10) is first
+
+    def test_unknown_font(self, font_cache):
+        assert get_font("Comic Sans", 20) is None
+        assert not font_cache
+
+    def test_preloaded_fonts_are_not_read_again(self, monkeypatch):
+        preload_fonts(["Jost"])
+        assert len(app_utils._font_data) == 2
+
+        monkeypatch.setattr(app_utils, "open", fail_open, raising=False)
+        assert get_font("Jost", 20, "bold").getbbox("Jost")
+
+    def test_preload_skips_missing_files(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(app_utils, "resolve_path", lambda path: str(tmp_path / path))
+        preload_fonts()
+        assert app_utils._font_data == {}
@@ -0,0 +1,74 @@
+import os
+
+import pytest
+
+Image = pytest.importorskip("PIL.Image")
+
+from utils import asset_bundle
+from utils.asset_bundle import bundle_icon, get_style_bundle, minify_css, used_font_families
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    def get_cache_dir(*subdirs):
+        path = tmp_path.joinpath("cache", *subdirs)
+        path.mkdir(parents=True, exist_ok=True)
+        return str(path)
+    monkeypatch.setattr(asset_bundle, "get_cache_dir", get_cache_dir)
+    # keep the test independent of fontTools
+    monkeypatch.setattr(asset_bundle, "font_subset", None)
+    return tmp_path / "cache"
+
+
+class TestAssetBundle:
+
+    def test_minify_css(self):
+        css = """/* header */
+        .a > .b :hover {
+            color : red ;
+            margin: 0 calc(1px + 2px);
+        }
+        @media (max-width: 600px) { .c, .d { padding: 0; } }"""
+        assert minify_css(css) == ".a>.b :hover{color:red;margin:0 calc(1px + 2px)}@media (max-width: 600px){.c,.d{padding:0}}"
+
+    def test_minify_css_keeps_strings(self):
+        css = """.quote::before { content: "a  b ; c : d"; }
+        .path::after { content: '/* not a comment */'; } /* a "comment" */
+        .escaped { content: "say \\"hi  there\\""; font-family: "Jost" , sans-serif; }"""
+        assert minify_css(css) == (""".quote::before{content:"a  b ; c : d"}.path::after{content:'/* not a comment */'}"""
+                                   """.escaped{content:"say \\"hi  there\\"";font-family:"Jost",sans-serif}""")
+
+    def test_used_font_families(self):
+        assert used_font_families(['body { font-family: "Jost", sans-serif; }']) == ["Jost"]
+        assert used_font_families(['.pixel { font-family: Dogica; }', "<p>Napoli</p>"]) == ["Dogica"]
+        # fonts chosen at render time keep every family
+        assert len(used_font_families(['<div style="font-family: {{ font }}">'])) > 2
+
+    def test_style_bundle_rebuilds_when_sources_change(self, tmp_path, cache_dir):
+        render_dir = tmp_path / "render"
+        render_dir.mkdir()
+        (render_dir / "page.html").write_text("<div></div>")
+        css_file = render_dir / "page.css"
+        css_file.write_text('body { font-family: "Jost"; background: url(images/bg.png); }')
+
+        bundle = get_style_bundle("test", [str(css_file)], [str(render_dir)])
+        assert bundle.count("@font-face") == 2
+        assert 'font-family:"Jost"' in bundle
+        assert f"url({(render_dir / 'images' / 'bg.png').as_uri()})" in bundle
+        assert get_style_bundle("test", [str(css_file)], [str(render_dir)]) is bundle
+
+        css_file.write_text("body { color: blue; }")
+        os.utime(css_file, ns=(0, 0))
+        assert get_style_bundle("test", [str(css_file)], [str(render_dir)]) == "body{color:blue}"
+
+    def test_bundle_icon(self, tmp_path, cache_dir):
+        icon_path = tmp_path / "icon.png"
+        Image.new("RGBA", (512, 256)).save(icon_path)
+
+        bundled = bundle_icon(str(icon_path), 64)
+        assert bundled != str(icon_path)
+        with Image.open(bundled) as icon:
+            assert icon.size == (64, 32)
+        assert bundle_icon(str(icon_path), 64) == bundled
+        # icons already small enough are used as they are
+        assert bundle_icon(str(icon_path), 600) == str(icon_path)
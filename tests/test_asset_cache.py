@@ -0,0 +1,123 @@
+import os
+import re
+from io import BytesIO
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("requests")
+Image = pytest.importorskip("PIL.Image")
+
+from utils import asset_cache
+from utils.asset_cache import PLACEHOLDER_URI, find_remote_assets, localize_remote_assets, prune_asset_cache
+
+
+def png_bytes(size, mode="RGB"):
+    output = BytesIO()
+    Image.new(mode, size, "red").save(output, format="PNG")
+    return output.getvalue()
+
+
+def find_local_uris(page):
+    return re.findall(r'src="(file://[^"]+)"', page)
+
+
+class FakeResponse:
+
+    def __init__(self, content, status_code=200, content_type="image/png", content_length=True):
+        self.content = content
+        self.status_code = status_code
+        self.headers = {"Content-Type": content_type}
+        if content_length:
+            self.headers["Content-Length"] = str(len(content))
+        self.read = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def iter_content(self, chunk_size=1):
+        for start in range(0, len(self.content), chunk_size):
+            self.read += chunk_size
+            yield self.content[start:start + chunk_size]
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise Exception(f"HTTP {self.status_code}")
+
+
+class FakeSession:
+
+    def __init__(self, responses):
+        self.responses = responses
+        self.requested = []
+
+    def get(self, url, timeout=None, stream=False):
+        self.requested.append(url)
+        return self.responses[url]
+
+
+class TestAssetCache:
+
+    def test_find_remote_assets(self):
+        page = """<img src="https://example.com/a.png?x=1&amp;y=2"><img src='http://example.com/b.jpg'>
+                  <div style="background-image: url(https://example.com/c.png)"></div>
+                  <img src="/local/d.png"><a href="https://example.com/page">link</a>"""
+        assert find_remote_assets(page) == {
+            "https://example.com/a.png?x=1&amp;y=2", "http://example.com/b.jpg", "https://example.com/c.png"}
+
+    def test_find_urls_with_parentheses(self):
+        page = """<img src="https://upload.example.org/Paris_(France).jpg">
+                  <div style="background: url('https://example.com/a_(1).png')"></div>
+                  <div style="background: url(https://example.com/b.png)"></div>"""
+        assert find_remote_assets(page) == {
+            "https://upload.example.org/Paris_(France).jpg", "https://example.com/a_(1).png", "https://example.com/b.png"}
+
+    def test_localizes_and_downsizes(self, tmp_path):
+        session = FakeSession({
+            "https://example.com/big.png?w=1&h=2": FakeResponse(png_bytes((1000, 500))),
+            "https://example.com/small.png": FakeResponse(png_bytes((10, 10))),
+        })
+        page = '<img src="https://example.com/big.png?w=1&amp;h=2"><img src="https://example.com/small.png">'
+        result = localize_remote_assets(page, (200, 200), session=session, cache_dir=str(tmp_path))
+
+        assert "https://" not in result
+        paths = [Path(uri[len("file://"):]) for uri in find_local_uris(result)]
+        with Image.open(paths[0]) as image:
+            assert image.size == (200, 100)
+        with Image.open(paths[1]) as image:
+            assert image.size == (10, 10)
+
+        # served from the cache the second time
+        assert localize_remote_assets(page, (200, 200), session=session, cache_dir=str(tmp_path)) == result
+        assert len(session.requested) == 2
+
+    def test_failed_downloads_use_placeholder(self, tmp_path):
+        session = FakeSession({"https://example.com/missing.png": FakeResponse(b"", status_code=404)})
+        result = localize_remote_assets('<img src="https://example.com/missing.png">', (100, 100),
+                                        session=session, cache_dir=str(tmp_path))
+        assert result == f'<img src="{PLACEHOLDER_URI}">'
+
+    @pytest.mark.parametrize("content_length", [True, False])
+    def test_oversized_downloads_use_placeholder(self, tmp_path, monkeypatch, content_length):
+        monkeypatch.setattr(asset_cache, "MAX_ASSET_BYTES", 100)
+        monkeypatch.setattr(asset_cache, "CHUNK_SIZE", 10)
+        response = FakeResponse(png_bytes((100, 100)), content_length=content_length)
+        session = FakeSession({"https://example.com/huge.png": response})
+        result = localize_remote_assets('<img src="https://example.com/huge.png">', (100, 100),
+                                        session=session, cache_dir=str(tmp_path))
+
+        assert result == f'<img src="{PLACEHOLDER_URI}">'
+        assert response.read <= 110
+        assert os.listdir(tmp_path) == []
+
+    def test_prune_removes_least_recently_used(self, tmp_path):
+        for index, name in enumerate(["old.png", "newer.png", "newest.png"]):
+            path = tmp_path / name
+            path.write_bytes(b"x" * 100)
+            os.utime(path, (index, index))
+
+        prune_asset_cache(max_bytes=250, cache_dir=str(tmp_path))
+        assert sorted(os.listdir(tmp_path)) == ["newer.png", "newest.png"]
@@ -0,0 +1,97 @@
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+
+from src.plugins.calendar.layout import build_layout, get_visible_days, format_time_range, layout_segments, parse_events
+
+TZ = timezone(timedelta(hours=-4))
+NOW = datetime(2026, 10, 19, 14, 0, tzinfo=TZ)  # a Monday
+SETTINGS = {"weekStartDay": "0", "displayWeekends": "true", "displayEventTime": "true"}
+
+
+def event(title, start, end=None, all_day=False):
+    return {"title": title, "start": start, "end": end, "allDay": all_day,
+            "backgroundColor": "#007BFF", "textColor": "#ffffff"}
+
+
+class TestCalendarLayout:
+
+    @pytest.mark.parametrize(
+        "view,first_day,first,count",
+        [
+            ("timeGridDay", 0, date(2026, 10, 19), 1),
+            ("timeGridWeek", 0, date(2026, 10, 18), 7),   # week starting Sunday
+            ("timeGridWeek", 1, date(2026, 10, 19), 7),   # week starting Monday
+            ("timeGrid", 0, date(2026, 10, 19), 7),       # 7 days from today
+            ("dayGrid", 0, date(2026, 10, 18), 28),
+            ("dayGridMonth", 0, date(2026, 9, 27), 35),   # full weeks covering October
+            ("listMonth", 0, date(2026, 10, 1), 31),
+        ]
+    )
+    def test_visible_days(self, view, first_day, first, count):
+        days = get_visible_days(view, NOW.date(), first_day)
+        assert days[0] == first
+        assert len(days) == count
+
+    def test_segments_stack_overlapping_events(self):
+        columns = get_visible_days("timeGridWeek", NOW.date())
+        events = parse_events([
+            event("Trip", "2026-10-17", "2026-10-21", all_day=True),
+            event("Holiday", "2026-10-20", all_day=True),
+            event("Conference", "2026-10-23", "2026-10-26", all_day=True),
+        ], TZ)
+        segments, levels = layout_segments(columns, events)
+        placed = {segment["event"].title: segment for segment in segments}
+
+        assert levels == 2
+        # Trip started before the visible week and ends on Tuesday (end is exclusive)
+        assert (placed["Trip"]["column"], placed["Trip"]["span"], placed["Trip"]["level"]) == (0, 3, 0)
+        assert not placed["Trip"]["is_start"] and placed["Trip"]["is_end"]
+        assert placed["Holiday"]["level"] == 1
+        # Conference fits on the first level after the Trip, and continues past Saturday
+        assert (placed["Conference"]["column"], placed["Conference"]["level"]) == (5, 0)
+        assert not placed["Conference"]["is_end"]
+
+    def test_overlapping_timed_events_share_column(self):
+        layout = build_layout("timeGridDay", [
+            event("Standup", "2026-10-19T09:00:00-04:00", "2026-10-19T09:30:00-04:00"),
+            event("Review", "2026-10-19T09:15:00-04:00", "2026-10-19T10:30:00-04:00"),
+            event("Lunch", "2026-10-19T12:00:00-04:00"),
+        ], NOW, SETTINGS)
+        placed = {item["event"].title: item for item in layout["time_grid"]["columns"][0]["events"]}
+
+        assert (placed["Standup"]["left"], placed["Standup"]["width"]) == (0, 50)
+        assert (placed["Review"]["left"], placed["Review"]["width"]) == (50, 50)
+        assert placed["Lunch"]["width"] == 100
+        assert placed["Standup"]["top"] == pytest.approx(9 / 24 * 100)
+        # events without an end last one hour
+        assert placed["Lunch"]["height"] == pytest.approx(1 / 24 * 100)
+        assert layout["time_grid"]["columns"][0]["now"] == pytest.approx(14 / 24 * 100)
+
+    def test_hidden_weekends(self):
+        layout = build_layout("dayGridMonth", [], NOW, dict(SETTINGS, displayWeekends="false"))
+        assert [header["label"] for header in layout["headers"]] == ["Mon", "Tue", "Wed", "Thu", "Fri"]
+        assert all(len(week["cells"]) == 5 for week in layout["weeks"])
+
+    def test_list_repeats_multi_day_events(self):
+        layout = build_layout("listMonth", [
+            event("Trip", "2026-10-20", "2026-10-22", all_day=True),
+            event("Call", "2026-10-20T15:00:00-04:00", "2026-10-20T16:30:00-04:00"),
+        ], NOW, SETTINGS)
+        assert [(day["label"], [item["time"] for item in day["events"]]) for day in layout["list"]] == [
+            ("October 20, 2026", ["all-day", "3 - 4:30pm"]),
+            ("October 21, 2026", ["all-day"]),
+        ]
+
+    @pytest.mark.parametrize(
+        "start,end,time_format,expected",
+        [
+            ((9, 0), (10, 0), "12h", "9 - 10am"),
+            ((11, 30), (13, 0), "12h", "11:30am - 1pm"),
+            ((9, 0), (10, 0), "24h", "09:00 - 10:00"),
+        ]
+    )
+    def test_format_time_range(self, start, end, time_format, expected):
+        day = datetime(2026, 10, 19)
+        assert format_time_range(day.replace(hour=start[0], minute=start[1]),
+                                 day.replace(hour=end[0], minute=end[1]), time_format) == expected
@@ -0,0 +1,79 @@
+import os
+from datetime import datetime
+
+import pytest
+
+pytest.importorskip("numpy")
+pytest.importorskip("pytz")
+Image = pytest.importorskip("PIL.Image")
+
+from plugins.clock import clock as clock_module
+from plugins.clock.clock import Clock
+
+DIMENSIONS = (80, 48)
+WHITE, BLACK = (255, 255, 255), (0, 0, 0)
+
+
+def at(hour, minute):
+    return datetime(2026, 10, 19, hour, minute)
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(clock_module, "get_cache_dir", lambda *subdirs: str(tmp_path))
+    return tmp_path
+
+
+@pytest.fixture
+def clock(cache_dir, monkeypatch):
+    clock = Clock({"id": "clock"})
+    clock.drawn = []
+
+    def draw_clock_face(clock_face, dimensions, time, primary_color, secondary_color):
+        clock.drawn.append(time)
+        return Image.new("RGB", dimensions, primary_color)
+
+    monkeypatch.setattr(clock, "draw_clock_face", draw_clock_face)
+    return clock
+
+
+class TestFrameKey:
+
+    def test_analog_faces_repeat_every_twelve_hours(self):
+        assert Clock.frame_key("Gradient Clock", at(15, 5)) == Clock.frame_key("Gradient Clock", at(3, 5)) == "0305"
+        assert Clock.frame_key("Digital Clock", at(15, 5)) == "1505"
+
+    def test_word_clock_shares_keys_within_five_minute_buckets(self):
+        keys = [Clock.frame_key("Word Clock", at(10, minute)) for minute in range(0, 13)]
+
+        assert len(set(keys[0:3])) == len(set(keys[3:8])) == len(set(keys[8:13])) == 1
+        assert len({keys[0], keys[3], keys[8]}) == 3
+        # "five to eleven" changes to "eleven o'clock" at 10:58
+        assert Clock.frame_key("Word Clock", at(10, 58)) == Clock.frame_key("Word Clock", at(11, 0))
+
+
+class TestFrameCache:
+
+    def test_frame_is_cached(self, clock):
+        first = clock.get_frame("Word Clock", DIMENSIONS, at(10, 3), WHITE, BLACK)
+        second = clock.get_frame("Word Clock", DIMENSIONS, at(10, 7), WHITE, BLACK)
+
+        assert clock.drawn == [at(10, 3)]
+        assert second.tobytes() == first.tobytes()
+        # other colors are another configuration
+        clock.get_frame("Word Clock", DIMENSIONS, at(10, 3), BLACK, WHITE)
+        assert len(clock.drawn) == 2
+
+    def test_frames_are_pruned(self, clock, monkeypatch):
+        monkeypatch.setattr(clock_module, "MAX_CACHED_FRAMES", 3)
+        for minute in range(5):
+            clock.get_frame("Digital Clock", DIMENSIONS, at(10, minute), WHITE, BLACK)
+
+        frame_dir = clock.get_frame_dir("Digital Clock", DIMENSIONS, WHITE, BLACK)
+        assert len(os.listdir(frame_dir)) == 3
+
+    def test_configurations_are_pruned(self, clock, cache_dir):
+        for color in [(1, 1, 1), (2, 2, 2), (3, 3, 3)]:
+            clock.get_frame("Digital Clock", DIMENSIONS, at(10, 0), color, BLACK)
+
+        assert len(os.listdir(cache_dir)) == clock_module.MAX_CACHED_CONFIGS
@@ -0,0 +1,191 @@
+import pytest
+
+Image = pytest.importorskip("PIL.Image")
+
+from display import display_manager as display_manager_module
+from display.abstract_display import AbstractDisplay
+from display.display_manager import DisplayManager
+from utils.image_utils import apply_image_enhancement, change_orientation, resize_image
+
+
+class FakeDeviceConfig:
+
+    def __init__(self, tmp_path, resolution=(800, 480), orientation="horizontal", inverted=False,
+                 image_settings=None):
+        self.current_image_file = str(tmp_path / "current_image.png")
+        self.config = {
+            "display_type": "mock",
+            "output_dir": str(tmp_path / "mock_display"),
+            "resolution": list(resolution),
+            "orientation": orientation,
+            "inverted_image": inverted,
+            "image_settings": image_settings or {},
+        }
+
+    def get_config(self, key=None, default=None):
+        return self.config.get(key, default)
+
+    def get_resolution(self):
+        return tuple(self.config["resolution"])
+
+
+@pytest.fixture
+def resampling(monkeypatch):
+    """Records every resize, crop and rotate of a PIL image."""
+    calls = []
+    for name in ("resize", "crop", "rotate"):
+        original = getattr(Image.Image, name)
+
+        def spy(self, *args, _name=name, _original=original, **kwargs):
+            calls.append(_name)
+            return _original(self, *args, **kwargs)
+
+        monkeypatch.setattr(Image.Image, name, spy)
+    return calls
+
+
+class TestNoOpFastPaths:
+
+    def test_resize_image_returns_exact_size_input(self, resampling):
+        image = Image.new("RGB", (800, 480))
+        assert resize_image(image, (800, 480)) is image
+        assert resampling == []
+
+    def test_resize_image_same_ratio_skips_crop(self, resampling):
+        resized = resize_image(Image.new("RGB", (1600, 960)), (800, 480))
+        assert resized.size == (800, 480)
+        assert resampling == ["resize"]
+
+    def test_resize_image_still_crops(self):
+        image = Image.new("RGB", (1000, 480), "red")
+        image.paste((0, 0, 255), (0, 0, 100, 480))
+        resized = resize_image(image, (800, 480))
+        assert resized.size == (800, 480)
+        assert resized.getpixel((0, 0)) == (255, 0, 0)
+
+    def test_change_orientation_horizontal_is_no_op(self, resampling):
+        image = Image.new("RGB", (800, 480))
+        assert change_orientation(image, "horizontal") is image
+        assert change_orientation(image, "vertical").size == (480, 800)
+
+    def test_neutral_enhancement_is_no_op(self):
+        image = Image.new("RGB", (800, 480))
+        assert apply_image_enhancement(image, {"brightness": 1.0, "contrast": "1.0"}) is image
+        assert apply_image_enhancement(Image.new("RGBA", (8, 8))).mode == "RGB"
+        assert apply_image_enhancement(image, {"contrast": 1.5}) is not image
+
+
+class TestDisplayManager:
+
+    @pytest.mark.parametrize("resolution", [(800, 480), (600, 448), (1872, 1404)])
+    @pytest.mark.parametrize("orientation", ["horizontal", "vertical"])
+    def test_panel_sized_output_is_not_resampled(self, tmp_path, monkeypatch, resampling, resolution, orientation):
+        device_config = FakeDeviceConfig(tmp_path, resolution, orientation)
+        display_manager = DisplayManager(device_config)
+        shown = []
+        monkeypatch.setattr(display_manager.display, "display_image", lambda image, settings=[]: shown.append(image))
+
+        # plugins render at the resolution, rotated for vertical orientation
+        size = resolution if orientation == "horizontal" else resolution[::-1]
+        display_manager.display_image(Image.new("RGB", size, "white"))
+
+        assert shown[0].size == resolution
+        assert "resize" not in resampling
+        assert "crop" not in resampling
+        assert resampling.count("rotate") == (1 if orientation == "vertical" else 0)
+
+    def test_inverted_and_other_sizes_still_processed(self, tmp_path, monkeypatch):
+        device_config = FakeDeviceConfig(tmp_path, inverted=True)
+        display_manager = DisplayManager(device_config)
+        shown = []
+        monkeypatch.setattr(display_manager.display, "display_image", lambda image, settings=[]: shown.append(image))
+
+        image = Image.new("RGB", (1000, 480), "white")
+        image.paste((0, 0, 0), (100, 0, 200, 240))
+        display_manager.display_image(image)
+
+        assert shown[0].size == (800, 480)
+        # upside down: the black block ends up at the bottom right
+        assert shown[0].getpixel((799, 479)) == (0, 0, 0)
+        assert shown[0].getpixel((0, 0)) == (255, 255, 255)
+
+
+class FakePanel(AbstractDisplay):
+    """Panel counting the frames it prepares and shows."""
+
+    def __init__(self):
+        self.prepared = 0
+        self.shown = []
+
+    def prepare_image(self, image, image_settings=[]):
+        self.prepared += 1
+        return image.convert("1").tobytes()
+
+    def show_prepared(self, frame, image_settings=[]):
+        self.shown.append(frame)
+
+
+class LegacyPanel(AbstractDisplay):
+    """Panel implementing only display_image."""
+
+    def __init__(self):
+        self.shown = []
+
+    def display_image(self, image, image_settings=[]):
+        self.shown.append(image)
+
+
+class TestPanelFrameCache:
+
+    @pytest.fixture
+    def display_manager(self, tmp_path):
+        display_manager = DisplayManager(FakeDeviceConfig(tmp_path, image_settings={"contrast": 1.2}))
+        display_manager.display = FakePanel()
+        return display_manager
+
+    def test_redisplay_uses_cached_frame(self, display_manager, resampling):
+        display_manager.display_image(Image.new("RGB", (1000, 600), "white"), image_hash="a")
+        display_manager.display_image(Image.new("RGB", (1000, 600), "white"), image_hash="a")
+
+        assert display_manager.display.prepared == 1
+        assert len(display_manager.display.shown) == 2
+        assert display_manager.display.shown[0] == display_manager.display.shown[1]
+        assert resampling.count("resize") == 1
+
+    def test_settings_are_part_of_the_key(self, display_manager):
+        image = Image.new("RGB", (800, 480), "white")
+        display_manager.display_image(image, image_hash="a")
+        display_manager.display_image(image, image_settings=["keep-width"], image_hash="a")
+        display_manager.device_config.config["image_settings"] = {"contrast": 1.5}
+        display_manager.display_image(image, image_hash="a")
+        display_manager.device_config.config["inverted_image"] = True
+        display_manager.display_image(image, image_hash="a")
+
+        assert display_manager.display.prepared == 4
+
+    def test_without_hash_nothing_is_cached(self, display_manager):
+        image = Image.new("RGB", (800, 480), "white")
+        display_manager.display_image(image)
+        display_manager.display_image(image)
+
+        assert display_manager.display.prepared == 2
+        assert len(display_manager.frames) == 0
+
+    def test_cache_is_bounded(self, display_manager, monkeypatch):
+        monkeypatch.setattr(display_manager_module, "PANEL_FRAME_CACHE_SIZE", 2)
+        image = Image.new("RGB", (800, 480), "white")
+        for image_hash in ("a", "b", "a", "c"):
+            display_manager.display_image(image, image_hash=image_hash)
+
+        assert [key[0] for key in display_manager.frames] == ["a", "c"]
+        display_manager.display_image(image, image_hash="a")
+        assert display_manager.display.prepared == 3
+
+    def test_legacy_display_is_not_cached(self, display_manager):
+        display_manager.display = LegacyPanel()
+        image = Image.new("RGB", (800, 480), "white")
+        display_manager.display_image(image, image_hash="a")
+        display_manager.display_image(image, image_hash="a")
+
+        assert len(display_manager.display.shown) == 2
+        assert len(display_manager.frames) == 0
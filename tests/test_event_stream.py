@@ -0,0 +1,135 @@
+import json
+import threading
+import time
+
+import pytest
+
+from utils import event_stream as event_stream_module
+from utils.event_stream import POLL_RETRY_MS, RETRY_MS, EventStream, format_event
+
+
+def parse_stream(body):
+    """Splits a text/event-stream body into dicts of fields."""
+    messages = []
+    for block in body.strip().split("\n\n"):
+        fields = {}
+        for line in block.split("\n"):
+            name, _, value = line.partition(": ")
+            fields[name] = value
+        messages.append(fields)
+    return messages
+
+
+class TestEventStream:
+
+    def test_events_since_cursor(self):
+        stream = EventStream(max_events=8)
+        start = stream.last_id
+        first = stream.publish("generating", {"refresh_info": {"plugin_id": "clock"}})
+        second = stream.publish("displayed", {"image_hash": "abc"})
+
+        events, complete = stream.events_since(start)
+        assert complete
+        assert [event["id"] for event in events] == [first, second]
+        assert events[1]["data"]["image_hash"] == "abc"
+
+        events, complete = stream.events_since(str(first))
+        assert complete
+        assert [event["event"] for event in events] == ["displayed"]
+        assert stream.events_since(second) == ([], True)
+
+    def test_missed_events(self):
+        stream = EventStream(max_events=2)
+        start = stream.last_id
+        for _ in range(3):
+            stream.publish("skipped")
+
+        events, complete = stream.events_since(start)
+        assert not complete
+        assert len(events) == 2
+        # ids from a previous process or garbage
+        assert stream.events_since(stream.last_id + 100) == ([], False)
+        assert stream.events_since("abc") == ([], False)
+
+    def test_render(self):
+        stream = EventStream()
+        start = stream.last_id
+        event_id = stream.publish("displayed", {"image_hash": "abc"})
+
+        messages = parse_stream(stream.render(str(start), retry_ms=1500))
+        assert messages[0] == {"retry": "1500"}
+        assert messages[1]["id"] == str(event_id)
+        assert messages[1]["event"] == "displayed"
+        assert json.loads(messages[1]["data"])["image_hash"] == "abc"
+
+        # new subscribers only get their cursor moved to the latest event
+        assert parse_stream(stream.render(None)) == [{"retry": str(RETRY_MS)}, {"id": str(event_id)}]
+
+    def test_render_reset(self):
+        stream = EventStream(max_events=1)
+        start = stream.last_id
+        stream.publish("skipped")
+        stream.publish("skipped")
+
+        messages = parse_stream(stream.render(str(start)))
+        assert messages[1]["event"] == "reset"
+        assert messages[1]["id"] == str(stream.last_id)
+
+    def test_stream_pushes_new_events(self):
+        stream = EventStream()
+        start = stream.last_id
+        body = stream.stream(str(start), keepalive_seconds=5, max_seconds=10)
+        assert parse_stream(next(body)) == [{"retry": str(RETRY_MS)}]
+
+        publisher = threading.Timer(0.05, stream.publish, ("displayed", {"image_hash": "abc"}))
+        publisher.start()
+        waited = time.monotonic()
+        messages = parse_stream(next(body))
+        assert time.monotonic() - waited < 5
+        assert messages[0]["event"] == "displayed"
+        assert messages[0]["id"] == str(stream.last_id)
+        body.close()
+        assert stream.subscribers == 0
+
+    def test_stream_keep_alive_and_end(self):
+        stream = EventStream()
+        body = list(stream.stream(None, keepalive_seconds=0.02, max_seconds=0.1))
+
+        assert body[0] == f"retry: {RETRY_MS}\n\nid: {stream.last_id}\n\n"
+        assert body[1:] and set(body[1:]) == {": keep-alive\n\n"}
+        assert stream.subscribers == 0
+
+    def test_streams_over_limit_poll(self):
+        stream = EventStream(max_subscribers=1)
+        held = stream.stream(None, max_seconds=10)
+        next(held)
+        assert stream.subscribers == 1
+
+        polled = list(stream.stream(None))
+        assert len(polled) == 1
+        assert parse_stream(polled[0])[0] == {"retry": str(POLL_RETRY_MS)}
+
+        held.close()
+        assert stream.subscribers == 0
+
+    def test_format_event(self):
+        assert format_event({"id": 5, "event": "error", "data": {"error": "boom"}}) == \
+            'id: 5\nevent: error\ndata: {"error": "boom"}\n\n'
+
+    def test_events_route(self, monkeypatch):
+        flask = pytest.importorskip("flask")
+        monkeypatch.setattr(event_stream_module, "STREAM_SECONDS", 0)
+        from blueprints.main import main_bp
+        from utils.event_stream import get_event_stream
+
+        app = flask.Flask(__name__)
+        app.register_blueprint(main_bp)
+        client = app.test_client()
+        start = get_event_stream().last_id
+        event_id = get_event_stream().publish("displayed", {"image_hash": "abc"})
+
+        response = client.get("/api/events", headers={"Last-Event-ID": str(start)})
+        assert response.status_code == 200
+        assert response.mimetype == "text/event-stream"
+        assert response.headers["Cache-Control"] == "no-cache"
+        assert f"id: {event_id}\nevent: displayed" in response.get_data(as_text=True)
@@ -0,0 +1,138 @@
+import pytest
+
+pytest.importorskip("requests")
+
+from utils.feed_reader import iter_entries, parse_feed, read_feed, sanitize_html
+
+RSS = b"""<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0" xmlns:content="http://purl.org/rss/1.0/modules/content/" xmlns:media="http://search.yahoo.com/mrss/">
+  <channel>
+    <title>News</title>
+    <item>
+      <title>First &amp; foremost</title>
+      <link>https://example.com/1</link>
+      <pubDate>Mon, 19 Oct 2026 12:00:00 GMT</pubDate>
+      <description>&lt;p&gt;Summary&lt;/p&gt;</description>
+      <content:encoded><![CDATA[<p>Full <img src="https://example.com/1.jpg" alt="One"></p>]]></content:encoded>
+      <media:content url="https://example.com/1.jpg" medium="image"/>
+    </item>
+    <item>
+      <title>Second</title>
+      <link>https://example.com/2</link>
+      <enclosure url="https://example.com/2.jpg" type="image/jpeg" length="100"/>
+    </item>
+    <item>
+      <title>Third</title>
+    </item>
+  </channel>
+</rss>
+"""
+
+ATOM = b"""<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+  <title>Comics</title>
+  <entry>
+    <title>Latest</title>
+    <link href="https://example.com/latest" rel="alternate"/>
+    <published>2026-10-19T12:00:00Z</published>
+    <summary type="html">&lt;img src="https://example.com/comic.png" alt="Caption"/&gt;</summary>
+  </entry>
+  <entry>
+    <title>Older</title>
+    <content type="html">&lt;p&gt;Body&lt;/p&gt;</content>
+  </entry>
+</feed>
+"""
+
+
+class FakeResponse:
+
+    def __init__(self, content, chunk_size):
+        self.content = content
+        self.chunk_size = chunk_size
+        self.read = 0
+        self.closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.closed = True
+
+    def raise_for_status(self):
+        pass
+
+    def iter_content(self, chunk_size=None):
+        while self.read < len(self.content):
+            chunk = self.content[self.read:self.read + self.chunk_size]
+            self.read += len(chunk)
+            yield chunk
+
+
+class FakeSession:
+
+    def __init__(self, response):
+        self.response = response
+
+    def get(self, url, **kwargs):
+        return self.response
+
+
+class TestFeedReader:
+
+    def test_rss_fields(self):
+        entries = parse_feed(RSS).entries
+        assert [entry.title for entry in entries] == ["First & foremost", "Second", "Third"]
+
+        first = entries[0]
+        assert (first.link, first.published) == ("https://example.com/1", "Mon, 19 Oct 2026 12:00:00 GMT")
+        assert first.description == first.summary == "<p>Summary</p>"
+        assert first.content[0]["value"] == '<p>Full <img src="https://example.com/1.jpg" alt="One" /></p>'
+        assert first.media_content[0]["url"] == "https://example.com/1.jpg"
+        assert entries[1].enclosures[0]["url"] == "https://example.com/2.jpg"
+        assert "media_content" not in entries[1]
+
+    def test_atom_fields(self):
+        entries = parse_feed(ATOM).entries
+        assert (entries[0].title, entries[0].link, entries[0].published) == (
+            "Latest", "https://example.com/latest", "2026-10-19T12:00:00Z")
+        assert entries[0].description == '<img src="https://example.com/comic.png" alt="Caption" />'
+        # the summary falls back to the content, like feedparser
+        assert entries[1].description == "<p>Body</p>"
+        assert entries[1].get("content", [{}])[0].get("value") == "<p>Body</p>"
+
+    def test_stops_after_max_entries(self):
+        response = FakeResponse(RSS, chunk_size=64)
+        feed = read_feed("https://example.com/feed", max_entries=1, session=FakeSession(response))
+
+        assert [entry.title for entry in feed.entries] == ["First & foremost"]
+        assert feed.streamed
+        assert response.read < len(RSS)
+        assert response.closed
+
+    def test_max_entries_none_reads_everything(self):
+        chunks = [RSS[offset:offset + 10] for offset in range(0, len(RSS), 10)]
+        assert len(list(iter_entries(chunks))) == 3
+
+    def test_malformed_feed_falls_back_to_feedparser(self):
+        pytest.importorskip("feedparser")
+        # &nbsp; is not defined in XML, feedparser still reads the feed
+        malformed = RSS.replace(b"<title>Second</title>", b"<title>Second&nbsp;item</title>")
+        response = FakeResponse(malformed, chunk_size=64)
+        feed = read_feed("https://example.com/feed", max_entries=2, session=FakeSession(response))
+
+        assert not feed.streamed
+        assert [entry.title for entry in feed.entries] == ["First & foremost", "Second\xa0item"]
+
+    @pytest.mark.parametrize(
+        "value,expected",
+        [
+            ("plain text", "plain text"),
+            ('<p onclick="steal()">Hi<script>alert(1)</script></p>', "<p>Hi</p>"),
+            ('<a href="javascript:alert(1)" title="t">link</a>', '<a title="t">link</a>'),
+            ("<style>p {}</style><b>bold</b> &amp; <unknown>kept text</unknown>", "<b>bold</b> &amp; kept text"),
+            ('<img src="https://example.com/a.png" onerror="x()">', '<img src="https://example.com/a.png" />'),
+        ]
+    )
+    def test_sanitize_html(self, value, expected):
+        assert sanitize_html(value) == expected
@@ -0,0 +1,177 @@
+from datetime import datetime
+
+import pytest
+
+pytest.importorskip("icalendar")
+pytest.importorskip("recurring_ical_events")
+pytz = pytest.importorskip("pytz")
+
+from plugins.calendar import ics_cache
+from plugins.calendar.ics_cache import IcsCache
+
+TZ = pytz.timezone("America/New_York")
+URL = "https://example.com/calendar.ics"
+
+ICS = b"""BEGIN:VCALENDAR
+VERSION:2.0
+PRODID:-//InkyPi//Test//EN
+BEGIN:VEVENT
+UID:weekly@example.com
+SUMMARY:Standup
+DTSTART;TZID=America/New_York:20260105T090000
+DTEND;TZID=America/New_York:20260105T093000
+RRULE:FREQ=WEEKLY;BYDAY=MO
+END:VEVENT
+BEGIN:VEVENT
+UID:trip@example.com
+SUMMARY:Trip
+DTSTART;VALUE=DATE:20261017
+DTEND;VALUE=DATE:20261021
+END:VEVENT
+END:VCALENDAR
+"""
+
+
+class FakeResponse:
+
+    def __init__(self, status_code, content=b"", headers=None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise Exception(f"HTTP {self.status_code}")
+
+
+class FakeSession:
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    def get(self, url, headers=None, timeout=None):
+        self.requests.append((url, headers))
+        return self.responses.pop(0)
+
+
+@pytest.fixture
+def session(monkeypatch):
+    def install(*responses):
+        fake = FakeSession(responses)
+        monkeypatch.setattr(ics_cache, "get_http_session", lambda: fake)
+        return fake
+    return install
+
+
+@pytest.fixture
+def parses(monkeypatch):
+    calls = []
+    from_ical = ics_cache.icalendar.Calendar.from_ical
+    monkeypatch.setattr(ics_cache.icalendar.Calendar, "from_ical",
+                        lambda content: calls.append(content) or from_ical(content))
+    return calls
+
+
+def titles(events):
+    return [(str(event.get("summary")), event.decoded("dtstart").isoformat()) for event in events]
+
+
+class TestIcsCache:
+
+    def test_between_expands_recurrences(self, session):
+        session(FakeResponse(200, ICS))
+        events = IcsCache().between(URL, datetime(2026, 10, 18), datetime(2026, 10, 25), TZ)
+        assert titles(events) == [
+            ("Trip", "2026-10-17"),
+            ("Standup", "2026-10-19T09:00:00-04:00"),
+        ]
+
+    def test_events_without_uid_are_kept_apart(self, session):
+        ics = b"""BEGIN:VCALENDAR
+VERSION:2.0
+PRODID:-//InkyPi//Test//EN
+BEGIN:VEVENT
+SUMMARY:Dentist
+DTSTART;TZID=America/New_York:20261019T100000
+DTEND;TZID=America/New_York:20261019T110000
+END:VEVENT
+BEGIN:VEVENT
+SUMMARY:Call
+DTSTART;TZID=America/New_York:20261019T100000
+DTEND;TZID=America/New_York:20261019T103000
+END:VEVENT
+BEGIN:VEVENT
+SUMMARY:Trip
+DTSTART;VALUE=DATE:20261017
+DTEND;VALUE=DATE:20261021
+END:VEVENT
+END:VCALENDAR
+"""
+        session(FakeResponse(200, ics), FakeResponse(304))
+        cache = IcsCache()
+        events = cache.between(URL, datetime(2026, 10, 18), datetime(2026, 10, 25), TZ)
+        assert titles(events) == [
+            ("Trip", "2026-10-17"),
+            ("Dentist", "2026-10-19T10:00:00-04:00"),
+            ("Call", "2026-10-19T10:00:00-04:00"),
+        ]
+
+        # the trip is expanded again with the earlier days, it is still indexed once
+        events = cache.between(URL, datetime(2026, 10, 11), datetime(2026, 10, 20), TZ)
+        assert [title for title, _ in titles(events)] == ["Trip", "Dentist", "Call"]
+
+    def test_not_modified_skips_download_and_parse(self, session, parses):
+        fake = session(FakeResponse(200, ICS, {"ETag": '"v1"'}), FakeResponse(304))
+        cache = IcsCache()
+        cache.between(URL, datetime(2026, 10, 18), datetime(2026, 10, 25), TZ)
+        events = cache.between(URL, datetime(2026, 10, 25), datetime(2026, 11, 1), TZ)
+
+        assert fake.requests[1][1] == {"If-None-Match": '"v1"'}
+        assert len(parses) == 1
+        assert titles(events) == [("Standup", "2026-10-26T09:00:00-04:00")]
+
+    def test_unchanged_body_is_not_parsed_again(self, session, parses):
+        session(FakeResponse(200, ICS), FakeResponse(200, ICS), FakeResponse(200, ICS.replace(b"Trip", b"Vacation")))
+        cache = IcsCache()
+        for _ in range(2):
+            cache.between(URL, datetime(2026, 10, 18), datetime(2026, 10, 25), TZ)
+        assert len(parses) == 1
+
+        events = cache.between(URL, datetime(2026, 10, 18), datetime(2026, 10, 25), TZ)
+        assert len(parses) == 2
+        assert titles(events)[0] == ("Vacation", "2026-10-17")
+
+    def test_window_slides_incrementally(self, session, monkeypatch):
+        session(*[FakeResponse(304)] * 3)
+        cache = IcsCache()
+        state = cache._get_state(URL)
+        state.update(FakeResponse(200, ICS))
+
+        expanded = []
+        expand = ics_cache.CachedCalendar.expand
+        monkeypatch.setattr(ics_cache.CachedCalendar, "expand",
+                            lambda self, start, end: expanded.append((start, end)) or expand(self, start, end))
+
+        cache.between(URL, datetime(2026, 10, 18), datetime(2026, 10, 25), TZ)
+        # inside the window expanded ahead, served from the index
+        events = cache.between(URL, datetime(2026, 11, 1), datetime(2026, 11, 8), TZ)
+        assert len(expanded) == 1
+        assert titles(events) == [("Standup", "2026-11-02T09:00:00-05:00")]
+
+        # past the window only the missing days are expanded, and old occurrences are dropped
+        events = cache.between(URL, datetime(2026, 11, 22), datetime(2026, 12, 6), TZ)
+        assert len(expanded) == 2
+        assert expanded[1][0] == expanded[0][1]
+        assert titles(events) == [("Standup", "2026-11-23T09:00:00-05:00"), ("Standup", "2026-11-30T09:00:00-05:00")]
+        assert min(item.start for item in state.occurrences.values()) >= TZ.localize(datetime(2026, 11, 15)).timestamp()
+
+    def test_fetch_errors(self, session):
+        session(FakeResponse(404))
+        with pytest.raises(RuntimeError, match="Failed to fetch iCalendar url"):
+            IcsCache().between(URL, datetime(2026, 10, 18), datetime(2026, 10, 25), TZ)
+
+    def test_webcal_urls_are_fetched_over_https(self, session):
+        fake = session(FakeResponse(200, ICS))
+        IcsCache().between("webcal://example.com/calendar.ics", datetime(2026, 10, 18), datetime(2026, 10, 25), TZ)
+        assert fake.requests[0][0] == URL
@@ -0,0 +1,65 @@
+import pytest
+
+Image = pytest.importorskip("PIL.Image")
+
+from utils import image_backend
+from utils.image_backend import PillowBackend, VipsBackend, create_image_backend
+
+
+class FakeVipsImage:
+    """Evaluated 8-bit vips image, enough for VipsBackend.to_pil."""
+
+    interpretation = "b-w"
+    format = "uchar"
+
+    def __init__(self, bands, width=4, height=2):
+        self.bands = bands
+        self.width = width
+        self.height = height
+
+    def write_to_memory(self):
+        return bytes(range(self.bands)) * (self.width * self.height)
+
+
+class TestPillowBackend:
+
+    def test_rotate_and_enhance(self):
+        backend = PillowBackend()
+        assert not backend.streaming
+        assert backend.rotate(Image.new("RGB", (40, 20)), 90).size == (20, 40)
+
+        darker = backend.enhance(Image.new("RGBA", (4, 4), (200, 200, 200, 255)), {"brightness": 0.5})
+        assert darker.mode == "RGB"
+        assert darker.getpixel((0, 0)) == (100, 100, 100)
+
+
+class TestBackendSelection:
+
+    def test_unknown_backend_falls_back_to_pillow(self):
+        assert create_image_backend("unknown").name == "pillow"
+        assert create_image_backend(None).name == "pillow"
+
+    def test_vips_falls_back_without_pyvips(self, monkeypatch):
+        monkeypatch.setattr(image_backend, "pyvips", None)
+        assert create_image_backend("vips").name == "pillow"
+
+
+class TestVipsBandMapping:
+
+    @pytest.mark.parametrize("bands, mode", [(1, "L"), (2, "LA"), (3, "RGB"), (4, "RGBA")])
+    def test_to_pil_modes(self, bands, mode):
+        img = VipsBackend().to_pil(FakeVipsImage(bands))
+        assert img.mode == mode
+        assert img.size == (4, 2)
+
+    def test_modes_round_trip(self):
+        assert all(VipsBackend.MODES[bands] == mode for mode, bands in VipsBackend.BANDS.items())
+
+    def test_grey_alpha_png_through_vips(self, tmp_path):
+        pytest.importorskip("pyvips")
+        path = tmp_path / "grey.png"
+        Image.new("LA", (30, 20), (128, 200)).save(path)
+        backend = VipsBackend()
+
+        assert backend.thumbnail(str(path), (15, 10)).mode == "RGB"
+        assert backend.pad(Image.new("LA", (30, 20)), (40, 20)).mode == "LA"
@@ -0,0 +1,66 @@
+import pytest
+
+Image = pytest.importorskip("PIL.Image")
+
+from utils.image_compositor import compose_image, contain_size, cover_box, fit_image, open_image, pad_blur, pad_color
+
+DIMENSIONS = (800, 480)
+
+
+def photo(size, color="red"):
+    return Image.new("RGB", size, color)
+
+
+class TestImageCompositor:
+
+    def test_contain_size_and_cover_box(self):
+        assert contain_size((4000, 4000), DIMENSIONS) == (480, 480)
+        assert contain_size((400, 100), DIMENSIONS) == (800, 200)
+        assert cover_box((1000, 1000), (1000, 500)) == (0, 250, 1000, 750)
+        assert cover_box((2000, 500), (1000, 500)) == (500, 0, 1500, 500)
+
+    def test_fit_image(self):
+        assert fit_image(photo((3000, 1000)), DIMENSIONS).size == DIMENSIONS
+        img = photo(DIMENSIONS)
+        assert fit_image(img, DIMENSIONS) is img
+
+    def test_pad_blur_centers_foreground(self):
+        img = photo((400, 800), "red")
+        img.paste((0, 0, 255), (0, 0, 400, 400))
+        padded = pad_blur(img, DIMENSIONS)
+
+        assert padded.size == DIMENSIONS
+        # foreground is 240x480 at the center
+        assert padded.getpixel((400, 100)) == (0, 0, 255)
+        assert padded.getpixel((400, 400)) == (255, 0, 0)
+
+    def test_pad_color(self):
+        padded = pad_color(photo((400, 800)), DIMENSIONS, "#00ff00")
+        assert padded.size == DIMENSIONS
+        assert padded.getpixel((10, 10)) == (0, 255, 0)
+        assert padded.getpixel((400, 240)) == (255, 0, 0)
+
+    def test_compose_image_options(self):
+        img = photo((1000, 1000))
+        assert compose_image(img, DIMENSIONS, {}).size == DIMENSIONS
+        assert compose_image(img, DIMENSIONS, {"padImage": "true"}).size == DIMENSIONS
+        padded = compose_image(img, DIMENSIONS, {"padImage": "true", "backgroundOption": "color",
+                                                 "backgroundColor": "#0000ff"})
+        assert padded.getpixel((10, 10)) == (0, 0, 255)
+
+    def test_open_image_draft_decodes(self, tmp_path):
+        path = tmp_path / "photo.jpg"
+        photo((4000, 3000)).save(path, format="JPEG")
+
+        contained = open_image(str(path), DIMENSIONS, fit="contain")
+        assert contained.size == (640, 480)
+        assert contained.mode == "RGB"
+        assert open_image(str(path), DIMENSIONS, fit="cover").size == DIMENSIONS
+
+    def test_open_image_applies_orientation(self, tmp_path):
+        path = tmp_path / "photo.jpg"
+        exif = Image.Exif()
+        exif[0x0112] = 6
+        photo((4000, 3000)).save(path, format="JPEG", exif=exif.tobytes())
+
+        assert open_image(str(path), DIMENSIONS, fit="contain").size == (360, 480)
@@ -0,0 +1,71 @@
+import pytest
+
+pytest.importorskip("psutil")
+pytest.importorskip("requests")
+Image = pytest.importorskip("PIL.Image")
+
+from utils import image_loader
+from utils.image_loader import AdaptiveImageLoader, ImageVariant, get_transfer_stats
+
+DIMENSIONS = (800, 480)
+
+
+@pytest.fixture
+def loader(monkeypatch):
+    loader = AdaptiveImageLoader(plugin_id="test_loader")
+    loader.probed = []
+    loader.downloaded = []
+
+    def probe(variant, headers=None):
+        loader.probed.append(variant.url)
+        return None
+
+    def from_url(url, dimensions, timeout_ms=40000, resize=True, headers=None):
+        loader.downloaded.append(url)
+        loader.last_download_bytes = 1000
+        return Image.new("RGB", dimensions)
+
+    monkeypatch.setattr(loader, "_probe_variant", probe)
+    monkeypatch.setattr(loader, "from_url", from_url)
+    return loader
+
+
+class TestSelectVariant:
+
+    def test_smallest_covering_variant_wins(self, loader):
+        variants = [ImageVariant("small", 400, 240), ImageVariant("medium", 1024, 768),
+                    ImageVariant("large", 2048, 1536), ImageVariant("original")]
+        assert loader.select_variant(variants, DIMENSIONS).url == "medium"
+
+    def test_falls_back_to_original(self, loader):
+        variants = [ImageVariant("small", 400, 240), ImageVariant("unknown"), ImageVariant("original")]
+        assert loader.select_variant(variants, DIMENSIONS).url == "original"
+        # variants without dimensions are probed, in order
+        assert loader.probed == ["unknown"]
+
+    def test_contain_needs_only_one_side(self, loader):
+        variants = [ImageVariant("portrait", 300, 480), ImageVariant("original")]
+        assert loader.select_variant(variants, DIMENSIONS, fit="contain").url == "portrait"
+        assert loader.select_variant(variants, DIMENSIONS, fit="cover").url == "original"
+
+
+class TestFromVariants:
+
+    def test_downloads_selected_variant_and_records_savings(self, loader):
+        before = get_transfer_stats().get("test_loader", {"bytes_saved": 0})["bytes_saved"]
+        variants = [ImageVariant("medium", 1024, 768), ImageVariant("original", size_bytes=5000)]
+
+        assert loader.from_variants(variants, DIMENSIONS).size == DIMENSIONS
+        assert loader.downloaded == ["medium"]
+        assert get_transfer_stats()["test_loader"]["bytes_saved"] == before + 4000
+
+    def test_unknown_original_size_makes_no_extra_request(self, loader, monkeypatch):
+        monkeypatch.setattr(image_loader, "get_http_session",
+                            lambda: pytest.fail("no request besides the download expected"))
+        variants = [ImageVariant("medium", 1024, 768), ImageVariant("original")]
+
+        assert loader.from_variants(variants, DIMENSIONS) is not None
+        assert loader.downloaded == ["medium"]
+
+    def test_no_variants(self, loader):
+        assert loader.from_variants([], DIMENSIONS) is None
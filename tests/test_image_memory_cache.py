@@ -0,0 +1,89 @@
+import pytest
+
+pytest.importorskip("psutil")
+Image = pytest.importorskip("PIL.Image")
+
+from utils import image_memory_cache as image_memory_cache_module
+from utils.image_memory_cache import ImageMemoryCache, get_memory_budget
+
+FRAME_BYTES = 800 * 480 * 3
+
+
+def frame(color="white"):
+    return Image.new("RGB", (800, 480), color)
+
+
+class TestImageMemoryCache:
+
+    def test_get_requires_matching_hash(self):
+        cache = ImageMemoryCache(budget=FRAME_BYTES)
+        image = frame()
+        cache.put("a.png", image, "hash-a")
+
+        assert cache.get("a.png", "hash-a") == (image, "hash-a")
+        assert cache.get("a.png", "hash-b") is None
+        assert cache.get("a.png", None) is None
+        assert cache.get("b.png", "hash-a") is None
+
+    def test_least_recently_used_is_evicted_over_budget(self):
+        cache = ImageMemoryCache(budget=2 * FRAME_BYTES)
+        for path in ("a.png", "b.png"):
+            cache.put(path, frame(), path)
+        cache.get("a.png", "a.png")
+        cache.put("c.png", frame(), "c.png")
+
+        assert cache.get("b.png", "b.png") is None
+        assert cache.get("a.png", "a.png") is not None
+        assert cache.size == 2 * FRAME_BYTES
+
+    def test_put_replaces_and_discard_frees(self):
+        cache = ImageMemoryCache(budget=2 * FRAME_BYTES)
+        cache.put("a.png", frame(), "old")
+        cache.put("a.png", frame("black"), "new")
+        assert cache.size == FRAME_BYTES
+        assert cache.get("a.png", "old") is None
+
+        cache.discard("a.png")
+        assert cache.size == 0
+
+    def test_image_over_budget_is_not_cached(self):
+        cache = ImageMemoryCache(budget=FRAME_BYTES - 1)
+        cache.put("a.png", frame(), "hash")
+
+        assert cache.get("a.png", "hash") is None
+        assert cache.size == 0
+
+    def test_budget_is_bounded(self, monkeypatch):
+        class Memory:
+            available = 0
+
+        monkeypatch.setattr(image_memory_cache_module.psutil, "virtual_memory", lambda: Memory)
+        assert get_memory_budget() == image_memory_cache_module.MIN_BUDGET_BYTES
+        Memory.available = 64 * 1024 ** 3
+        assert get_memory_budget() == image_memory_cache_module.MAX_BUDGET_BYTES
+
+    def test_deleted_plugin_instance_is_discarded(self, tmp_path, monkeypatch):
+        pytest.importorskip("flask")
+        pytest.importorskip("pytz")
+        from blueprints.plugin import _delete_plugin_instance_images
+        from model import PlaylistManager, PluginInstance
+
+        class FakeDeviceConfig:
+            plugin_image_dir = str(tmp_path)
+
+            def get_plugin(self, plugin_id):
+                return None
+
+            def get_playlist_manager(self):
+                return PlaylistManager([])
+
+        cache = ImageMemoryCache(budget=FRAME_BYTES)
+        monkeypatch.setattr(image_memory_cache_module, "_image_memory_cache", cache)
+        plugin_instance = PluginInstance("clock", "Kitchen", {}, {})
+        plugin_image_path = str(tmp_path / plugin_instance.get_image_path())
+        frame().save(plugin_image_path)
+        cache.put(plugin_image_path, frame(), "hash")
+
+        _delete_plugin_instance_images(FakeDeviceConfig(), plugin_instance)
+        assert cache.size == 0
+        assert not (tmp_path / plugin_instance.get_image_path()).exists()
@@ -0,0 +1,105 @@
+import os
+
+import pytest
+
+Image = pytest.importorskip("PIL.Image")
+
+from utils.image_preview import get_preview, image_etag, preferred_format, snap_width
+
+
+@pytest.fixture
+def image_path(tmp_path):
+    path = tmp_path / "current_image.png"
+    Image.new("RGB", (800, 480), "red").save(path)
+    return str(path)
+
+
+class FakeRefreshInfo:
+    image_hash = "0123456789abcdef0123"
+
+
+class FakeDeviceConfig:
+
+    def __init__(self, current_image_file):
+        self.current_image_file = current_image_file
+
+    def get_refresh_info(self):
+        return FakeRefreshInfo()
+
+
+class TestImagePreview:
+
+    def test_snap_width(self):
+        assert snap_width(100, 800) == 160
+        assert snap_width(320, 800) == 320
+        assert snap_width(700, 800) is None
+        assert snap_width(5000, 2000) is None
+
+    def test_preferred_format(self):
+        assert preferred_format("image/avif,image/webp,*/*") in ("webp", "jpeg")
+        assert preferred_format("image/png,*/*") == "jpeg"
+        assert preferred_format(None) == "jpeg"
+
+    def test_etag_changes_with_file(self, image_path):
+        etag = image_etag(image_path, "abc")
+        assert etag.startswith("abc-")
+        assert image_etag(image_path + ".missing") is None
+
+        Image.new("RGB", (800, 480), "blue").save(image_path)
+        os.utime(image_path, ns=(0, 12345))
+        assert image_etag(image_path, "abc") != etag
+
+    def test_preview_is_resized_and_cached(self, image_path, tmp_path):
+        cache_dir = tmp_path / "previews"
+        cache_dir.mkdir()
+        etag = image_etag(image_path, "abc")
+
+        path, mimetype, width = get_preview(image_path, etag, 300, "jpeg", cache_dir=str(cache_dir))
+        assert (mimetype, width) == ("image/jpeg", 320)
+        with Image.open(path) as preview:
+            assert preview.size == (320, 192)
+
+        mtime = os.path.getmtime(path)
+        assert get_preview(image_path, etag, 310, "jpeg", cache_dir=str(cache_dir))[0] == path
+        assert os.path.getmtime(path) >= mtime
+        assert get_preview(image_path, etag, 790, "jpeg", cache_dir=str(cache_dir)) is None
+
+
+class TestCurrentImageRoute:
+
+    @pytest.fixture
+    def client(self, image_path, tmp_path, monkeypatch):
+        flask = pytest.importorskip("flask")
+        import utils.image_preview as image_preview
+        from blueprints.main import main_bp
+
+        cache_dir = tmp_path / "previews"
+        cache_dir.mkdir()
+        monkeypatch.setattr(image_preview, "get_cache_dir", lambda *subdirs: str(cache_dir))
+
+        app = flask.Flask(__name__)
+        app.config["DEVICE_CONFIG"] = FakeDeviceConfig(image_path)
+        app.register_blueprint(main_bp)
+        return app.test_client()
+
+    def test_etag_and_not_modified(self, client):
+        response = client.get("/api/current_image")
+        assert response.status_code == 200
+        assert response.mimetype == "image/png"
+        etag = response.headers["ETag"]
+        assert etag.startswith('"0123456789abcdef-')
+
+        response = client.get("/api/current_image", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.data == b""
+
+    def test_preview_width(self, client):
+        response = client.get("/api/current_image?w=320", headers={"Accept": "image/png"})
+        assert response.status_code == 200
+        assert response.mimetype == "image/jpeg"
+        assert "Accept" in response.headers["Vary"]
+        etag = response.headers["ETag"]
+        assert etag != client.get("/api/current_image").headers["ETag"]
+
+        response = client.get("/api/current_image?w=320", headers={"Accept": "image/png", "If-None-Match": etag})
+        assert response.status_code == 304
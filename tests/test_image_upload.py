@@ -0,0 +1,62 @@
+import pytest
+
+pytest.importorskip("psutil")
+pytest.importorskip("jinja2")
+Image = pytest.importorskip("PIL.Image")
+
+from plugins.image_upload.image_upload import ImageUpload
+
+
+class FakeDeviceConfig:
+
+    def __init__(self, resolution=(800, 480), orientation="horizontal"):
+        self.resolution = resolution
+        self.orientation = orientation
+
+    def get_resolution(self):
+        return self.resolution
+
+    def get_config(self, key, default=None):
+        return {"orientation": self.orientation}.get(key, default)
+
+
+@pytest.fixture
+def image_path(tmp_path):
+    path = tmp_path / "photo.png"
+    # left half red, right half blue
+    image = Image.new("RGB", (1000, 800), "red")
+    image.paste((0, 0, 255), (500, 0, 1000, 800))
+    image.save(path)
+    return str(path)
+
+
+class TestImageUpload:
+
+    @pytest.mark.parametrize("orientation, size", [("horizontal", (800, 480)), ("vertical", (480, 800))])
+    def test_image_is_cropped_to_fill_the_display(self, image_path, orientation, size):
+        settings = {"imageFiles[]": [image_path]}
+        image = ImageUpload({"id": "image_upload"}).generate_image(settings, FakeDeviceConfig(orientation=orientation))
+
+        assert image.size == size
+        assert image.mode == "RGB"
+        assert image.getpixel((0, 0)) == (255, 0, 0)
+        assert image.getpixel((size[0] - 1, 0)) == (0, 0, 255)
+        assert settings["image_index"] == 0
+
+    def test_padded_image_fits_inside_the_display(self, image_path):
+        settings = {"imageFiles[]": [image_path, image_path], "padImage": "true", "backgroundOption": "color",
+                    "backgroundColor": "#00ff00"}
+        image = ImageUpload({"id": "image_upload"}).generate_image(settings, FakeDeviceConfig())
+
+        assert image.size == (800, 480)
+        # 1000x800 fits as 600x480, centered between green bars
+        assert image.getpixel((50, 240)) == (0, 255, 0)
+        assert image.getpixel((150, 240)) == (255, 0, 0)
+        assert settings["image_index"] == 1
+
+    def test_unreadable_image(self, tmp_path):
+        path = tmp_path / "broken.png"
+        path.write_bytes(b"not an image")
+
+        with pytest.raises(RuntimeError, match="Failed to read image file"):
+            ImageUpload({"id": "image_upload"}).generate_image({"imageFiles[]": [str(path)]}, FakeDeviceConfig())
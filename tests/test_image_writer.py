@@ -0,0 +1,74 @@
+import threading
+
+import pytest
+
+Image = pytest.importorskip("PIL.Image")
+
+from utils import image_writer as image_writer_module
+from utils.image_writer import ImageWriter, encode_image, load_image, save_image
+
+
+class TestImageWriter:
+
+    def test_write_and_flush(self, tmp_path):
+        writer = ImageWriter()
+        path = tmp_path / "plugin.png"
+        writer.write(Image.new("RGB", (80, 48), "red"), str(path))
+
+        assert writer.flush()
+        with Image.open(path) as image:
+            assert image.format == "PNG"
+            assert image.getpixel((0, 0)) == (255, 0, 0)
+        assert writer.get_pending(str(path)) is None
+        assert not list(tmp_path.glob("*.tmp"))
+
+    def test_image_is_encoded_once_for_several_paths(self, tmp_path, monkeypatch):
+        encoded = []
+        monkeypatch.setattr(image_writer_module, "encode_image",
+                            lambda *args: encoded.append(args) or encode_image(*args))
+        writer = ImageWriter()
+        paths = [str(tmp_path / "a.png"), str(tmp_path / "b.png")]
+        writer.write(Image.new("RGB", (8, 8), "blue"), paths)
+
+        assert writer.flush()
+        assert len(encoded) == 1
+        assert all(load_image(path).getpixel((0, 0)) == (0, 0, 255) for path in paths)
+
+    def test_latest_write_wins_and_is_loaded_while_pending(self, tmp_path, monkeypatch):
+        release = threading.Event()
+        original = image_writer_module.write_file_atomic
+
+        def blocked(path, data):
+            release.wait(5)
+            original(path, data)
+
+        monkeypatch.setattr(image_writer_module, "write_file_atomic", blocked)
+        writer = ImageWriter()
+        path = str(tmp_path / "plugin.png")
+        writer.write(Image.new("RGB", (8, 8), "red"), path)
+        writer.write(Image.new("RGB", (8, 8), "green"), path)
+
+        assert writer.load(path).getpixel((0, 0)) == (0, 128, 0)
+        release.set()
+        assert writer.flush()
+        assert load_image(path).getpixel((0, 0)) == (0, 128, 0)
+
+    def test_compress_level(self, tmp_path):
+        image = Image.linear_gradient("L").resize((400, 400)).convert("RGB")
+        fast, small = tmp_path / "fast.png", tmp_path / "small.png"
+        save_image(image, str(fast), compress_level=1)
+        save_image(image, str(small), compress_level=9)
+
+        assert load_image(str(fast)).tobytes() == image.tobytes()
+        assert fast.stat().st_size > small.stat().st_size
+
+    @pytest.mark.parametrize("mode", ["RGB", "L", "1", "RGBA"])
+    def test_raw_round_trip(self, tmp_path, mode):
+        image = Image.effect_noise((30, 20), 64).convert(mode)
+        path = str(tmp_path / "frame.raw")
+        save_image(image, path, image_format="raw")
+
+        loaded = load_image(path)
+        assert loaded.mode == mode
+        assert loaded.size == (30, 20)
+        assert loaded.tobytes() == image.tobytes()
@@ -0,0 +1,87 @@
+import gzip
+import logging
+
+from utils.log_export import filter_log_lines, gzip_chunks, iter_chunks, parse_level
+
+
+def record(message, priority=6):
+    return {"line": f"Jan 01 00:00:00 host inkypi[1]: {message}\n", "message": message, "priority": priority}
+
+
+RECORDS = [
+    record("2025-01-01 - INFO - refresh_task - Running refresh"),
+    record("2025-01-01 - DEBUG - plugins.clock.clock - Drawing frame"),
+    record("2025-01-01 - ERROR - plugins.weather.weather - Failed to fetch weather"),
+    record("Traceback (most recent call last):"),
+    record('  File "weather.py", line 1, in <module>'),
+    record("2025-01-01 - WARNING - refresh_task - Refresh took 12s"),
+    record("chromium: GPU process crashed", priority=3),
+]
+
+
+def messages(lines):
+    return [line.split(": ", 1)[1].rstrip("\n") for line in lines]
+
+
+class TestFilterLogLines:
+
+    def test_no_filters_keeps_everything(self):
+        assert len(list(filter_log_lines(RECORDS))) == len(RECORDS)
+
+    def test_level_keeps_continuation_lines(self):
+        lines = messages(filter_log_lines(RECORDS, level=logging.ERROR))
+        assert lines == [
+            "2025-01-01 - ERROR - plugins.weather.weather - Failed to fetch weather",
+            "Traceback (most recent call last):",
+            '  File "weather.py", line 1, in <module>',
+            "chromium: GPU process crashed",
+        ]
+
+    def test_logger_matches_children(self):
+        lines = messages(filter_log_lines(RECORDS, logger_name="plugins"))
+        assert len(lines) == 4
+        assert lines[0].endswith("Drawing frame")
+        assert messages(filter_log_lines(RECORDS, logger_name="plugins.clock")) == [
+            "2025-01-01 - DEBUG - plugins.clock.clock - Drawing frame"
+        ]
+        assert list(filter_log_lines(RECORDS, logger_name="plugin")) == []
+
+    def test_text_is_case_insensitive(self):
+        lines = messages(filter_log_lines(RECORDS, text="REFRESH"))
+        assert len(lines) == 2
+
+    def test_limit_adds_note(self):
+        lines = list(filter_log_lines(RECORDS, limit=2))
+        assert len(lines) == 3
+        assert lines[-1] == "... export stopped after 2 lines\n"
+
+    def test_reads_records_lazily(self):
+        def endless():
+            while True:
+                yield record("2025-01-01 - INFO - refresh_task - Running refresh")
+
+        assert len(list(filter_log_lines(endless(), limit=10))) == 11
+
+    def test_parse_level(self):
+        assert parse_level("warning") == logging.WARNING
+        assert parse_level(" ERROR ") == logging.ERROR
+        assert parse_level("loud") is None
+        assert parse_level("") is None
+
+
+class TestChunks:
+
+    def test_iter_chunks_joins_lines(self):
+        lines = [f"line {i}\n" for i in range(100)]
+        chunks = list(iter_chunks(lines, chunk_size=64))
+        assert "".join(chunks) == "".join(lines)
+        assert all(len(chunk) < 64 + 10 for chunk in chunks)
+        assert len(chunks) > 1
+
+    def test_gzip_round_trip(self):
+        lines = [f"line {i}\n" for i in range(1000)]
+        data = b"".join(gzip_chunks(iter_chunks(lines, chunk_size=256)))
+        assert gzip.decompress(data).decode("utf-8") == "".join(lines)
+
+    def test_gzip_empty(self):
+        assert gzip.decompress(b"".join(gzip_chunks([]))) == b""
@@ -1,6 +1,7 @@
 import pytest
+from datetime import datetime, timezone
 
-from src.model import Playlist
+from src.model import Playlist, PluginInstance
 
 class TestPlaylist:
 
@@ -49,4 +50,66 @@ class TestPlaylist:
         playlist = Playlist("Test Playlist", start, end)
         assert playlist.is_active(current) == expected
         assert playlist.get_priority() == priority
-        
\ No newline at end of file
+        
+
+
+class TestPluginInstance:
+
+    def test_to_dict_round_trip_keeps_input_key_and_image_hash(self):
+        instance = PluginInstance("countdown", "Launch", {"title": "Launch"}, {"interval": 3600},
+                                  latest_refresh_time="2026-10-19T08:00:00+00:00",
+                                  input_key="abc", image_hash="def")
+
+        restored = PluginInstance.from_dict(instance.to_dict())
+
+        assert restored.input_key == "abc"
+        assert restored.image_hash == "def"
+        assert restored.latest_refresh_time == "2026-10-19T08:00:00+00:00"
+
+    def test_from_dict_without_input_key(self):
+        instance = PluginInstance.from_dict({
+            "plugin_id": "clock", "name": "Clock", "plugin_settings": {}, "refresh": {"interval": 60}
+        })
+
+        assert instance.input_key is None
+        assert instance.image_hash is None
+        assert instance.next_change_time is None
+
+    def test_earlier_next_change_time_does_not_shorten_interval(self):
+        instance = PluginInstance("clock", "Clock", {}, {"interval": 3600},
+                                  latest_refresh_time="2026-10-19T12:00:30+00:00",
+                                  next_change_time="2026-10-19T12:01:00+00:00")
+
+        assert not instance.should_refresh(datetime(2026, 10, 19, 12, 1, tzinfo=timezone.utc))
+        assert not instance.should_refresh(datetime(2026, 10, 19, 12, 59, tzinfo=timezone.utc))
+        assert instance.should_refresh(datetime(2026, 10, 19, 13, 0, 30, tzinfo=timezone.utc))
+        assert instance.get_stale_dt() == datetime(2026, 10, 19, 13, 0, 30, tzinfo=timezone.utc)
+        assert PluginInstance.from_dict(instance.to_dict()).next_change_time == "2026-10-19T12:01:00+00:00"
+
+    def test_stale_time_waits_for_later_next_change_time(self):
+        instance = PluginInstance("countdown", "Launch", {}, {"interval": 3600},
+                                  latest_refresh_time="2026-10-19T23:30:00+00:00",
+                                  next_change_time="2026-10-20T00:00:00+00:00")
+
+        assert instance.get_stale_dt() == datetime(2026, 10, 20, 0, 30, tzinfo=timezone.utc)
+        instance.next_change_time = "2026-10-20T06:00:00+00:00"
+        assert instance.get_stale_dt() == datetime(2026, 10, 20, 6, 0, tzinfo=timezone.utc)
+        instance.refresh = {"scheduled": "06:00"}
+        assert instance.get_stale_dt() is None
+
+    def test_unchanged_content_is_not_refreshed_after_interval(self):
+        instance = PluginInstance("countdown", "Launch", {}, {"interval": 3600},
+                                  latest_refresh_time="2026-10-19T08:00:00+00:00",
+                                  next_change_time="2026-10-20T00:00:00+00:00")
+
+        assert not instance.should_refresh(datetime(2026, 10, 19, 9, 0, tzinfo=timezone.utc))
+        assert not instance.should_refresh(datetime(2026, 10, 19, 23, 59, tzinfo=timezone.utc))
+        assert instance.should_refresh(datetime(2026, 10, 20, 0, 0, tzinfo=timezone.utc))
+
+    def test_unchanged_content_skips_scheduled_refresh(self):
+        instance = PluginInstance("countdown", "Launch", {}, {"scheduled": "06:00"},
+                                  latest_refresh_time="2026-10-19T05:00:00+00:00",
+                                  next_change_time="2026-10-20T00:00:00+00:00")
+
+        assert not instance.should_refresh(datetime(2026, 10, 19, 7, 0, tzinfo=timezone.utc))
+        assert instance.should_refresh(datetime(2026, 10, 20, 7, 0, tzinfo=timezone.utc))
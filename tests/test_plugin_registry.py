@@ -0,0 +1,123 @@
+import json
+import os
+import types
+
+import pytest
+
+pytest.importorskip("PIL")
+
+from plugins import plugin_registry
+from plugins.plugin_registry import get_plugin_instance, load_plugins
+
+
+class FakePlugin:
+
+    def __init__(self, config):
+        self.config = config
+
+
+@pytest.fixture
+def registry(tmp_path, monkeypatch):
+    """Empty registry over a plugins directory in tmp_path, recording module imports."""
+    for name in ("PLUGIN_SPECS", "PLUGIN_CLASSES", "PLUGIN_LOAD_TIMES"):
+        monkeypatch.setattr(plugin_registry, name, {})
+    monkeypatch.setattr(plugin_registry, "resolve_path", lambda path: str(tmp_path / path))
+    imported = []
+    modules = {}
+
+    def import_module(name):
+        imported.append(name)
+        module = modules[name]
+        if isinstance(module, Exception):
+            raise module
+        return module
+
+    monkeypatch.setattr(plugin_registry.importlib, "import_module", import_module)
+
+    def add(plugin_id, module):
+        plugin_dir = tmp_path / "plugins" / plugin_id
+        plugin_dir.mkdir(parents=True)
+        (plugin_dir / f"{plugin_id}.py").write_text("")
+        modules[f"plugins.{plugin_id}.{plugin_id}"] = module
+        return {"id": plugin_id, "class": "FakePlugin"}
+
+    return types.SimpleNamespace(add=add, imported=imported)
+
+
+class TestLazyLoading:
+
+    def test_plugins_are_imported_on_first_use(self, registry):
+        config = registry.add("fake", types.SimpleNamespace(FakePlugin=FakePlugin))
+        load_plugins([config, {"id": "missing", "class": "FakePlugin"}])
+
+        assert registry.imported == []
+        assert list(plugin_registry.PLUGIN_SPECS) == ["fake"]
+        plugin = get_plugin_instance(config)
+        assert isinstance(plugin, FakePlugin)
+        assert get_plugin_instance(config) is plugin
+        assert registry.imported == ["plugins.fake.fake"]
+        assert set(plugin_registry.PLUGIN_LOAD_TIMES["fake"]) == {"import_ms", "init_ms"}
+
+    @pytest.mark.parametrize("error", [ImportError("no module"), SyntaxError("bad syntax"), AttributeError("boom")])
+    def test_broken_plugin_is_reported(self, registry, error):
+        config = registry.add("broken", error)
+        load_plugins([config])
+
+        with pytest.raises(ValueError, match="failed to load"):
+            get_plugin_instance(config)
+        with pytest.raises(ValueError, match="not registered"):
+            get_plugin_instance({"id": "unknown"})
+
+    def test_reregistering_reloads_with_new_config(self, registry):
+        config = registry.add("fake", types.SimpleNamespace(FakePlugin=FakePlugin))
+        load_plugins([config])
+        get_plugin_instance(config)
+
+        load_plugins([{**config, "display_name": "Renamed"}])
+        assert get_plugin_instance(config).config["display_name"] == "Renamed"
+
+
+class TestPluginManifest:
+
+    @pytest.fixture
+    def config(self, tmp_path):
+        pytest.importorskip("dotenv")
+        from config import Config
+
+        config = Config.__new__(Config)
+        config.BASE_DIR = str(tmp_path)
+        config.plugin_manifest_file = str(tmp_path / "cache" / "plugin_manifest.json")
+        for plugin_id in ("clock", "weather"):
+            plugin_dir = tmp_path / "plugins" / plugin_id
+            plugin_dir.mkdir(parents=True)
+            (plugin_dir / "plugin-info.json").write_text(json.dumps({"id": plugin_id}))
+        return config
+
+    def test_manifest_is_written_and_reused(self, config, tmp_path, monkeypatch):
+        assert [plugin["id"] for plugin in config.read_plugins_list()] == ["clock", "weather"]
+        assert os.path.isfile(config.plugin_manifest_file)
+
+        monkeypatch.setattr("builtins.open", _fail_on_plugin_info(open))
+        assert [plugin["id"] for plugin in config.read_plugins_list()] == ["clock", "weather"]
+
+    def test_changed_plugin_info_invalidates_manifest(self, config, tmp_path):
+        config.read_plugins_list()
+        (tmp_path / "plugins" / "clock" / "plugin-info.json").write_text(json.dumps({"id": "clock", "version": 2}))
+
+        plugins = config.read_plugins_list()
+        assert plugins[0] == {"id": "clock", "version": 2}
+
+    def test_new_plugin_invalidates_manifest(self, config, tmp_path):
+        config.read_plugins_list()
+        (tmp_path / "plugins" / "comic").mkdir()
+        (tmp_path / "plugins" / "comic" / "plugin-info.json").write_text(json.dumps({"id": "comic"}))
+
+        assert [plugin["id"] for plugin in config.read_plugins_list()] == ["clock", "comic", "weather"]
+
+
+def _fail_on_plugin_info(original_open):
+    def guarded_open(path, *args, **kwargs):
+        if str(path).endswith("plugin-info.json"):
+            pytest.fail(f"{path} read although the manifest is current")
+        return original_open(path, *args, **kwargs)
+    return guarded_open
@@ -0,0 +1,336 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+pytest.importorskip("psutil")
+pytest.importorskip("pytz")
+Image = pytest.importorskip("PIL.Image")
+
+from model import PlaylistManager, PluginInstance, RefreshInfo
+import refresh_task
+from refresh_task import JobQueueFull, ManualRefresh, PlaylistRefresh, RefreshTask
+from utils.image_writer import get_image_writer
+from utils.image_memory_cache import get_image_memory_cache
+
+
+class FakeDeviceConfig:
+
+    def __init__(self, plugin_image_dir):
+        self.plugin_image_dir = str(plugin_image_dir)
+        self.config = {"orientation": "horizontal", "timezone": "UTC", "time_format": "24h"}
+
+    def get_resolution(self):
+        return (800, 480)
+
+    def get_config(self, key=None, default=None):
+        return self.config.get(key, default)
+
+
+class FakePlugin:
+
+    def __init__(self, input_key, next_change=None):
+        self.input_key = input_key
+        self.next_change = next_change
+        self.generated = 0
+
+    def get_plugin_id(self):
+        return "fake"
+
+    def compute_input_key(self, settings, device_config, now):
+        return self.input_key
+
+    def next_change_time(self, settings, now):
+        return self.next_change
+
+    def generate_image(self, settings, device_config):
+        self.generated += 1
+        return Image.new("RGB", (800, 480), "white")
+
+
+class FakePlaylist:
+    name = "Default"
+
+
+class FakePlaylistDeviceConfig(FakeDeviceConfig):
+
+    def __init__(self, plugin_image_dir, playlist_manager, refresh_info):
+        super().__init__(plugin_image_dir)
+        self.playlist_manager = playlist_manager
+        self.refresh_info = refresh_info
+
+    def get_playlist_manager(self):
+        return self.playlist_manager
+
+    def get_refresh_info(self):
+        return self.refresh_info
+
+
+NOW = datetime(2026, 10, 19, 12, 0, tzinfo=timezone.utc)
+
+
+def make_instance():
+    return PluginInstance("fake", "Fake", {"text": "hello"}, {"interval": 60})
+
+
+class TestPlaylistRefreshInputKey:
+
+    def test_unchanged_key_skips_generate_image(self, tmp_path):
+        device_config = FakeDeviceConfig(tmp_path)
+        plugin = FakePlugin("2026-10-19")
+        instance = make_instance()
+
+        first = PlaylistRefresh(FakePlaylist(), instance)
+        first.execute(plugin, device_config, NOW)
+        second = PlaylistRefresh(FakePlaylist(), instance)
+        image = second.execute(plugin, device_config, NOW + timedelta(minutes=5))
+
+        assert plugin.generated == 1
+        assert image.size == (800, 480)
+        assert second.image_hash == first.image_hash == instance.image_hash
+        assert instance.latest_refresh_time == (NOW + timedelta(minutes=5)).isoformat()
+
+    def test_changed_key_or_settings_regenerates(self, tmp_path):
+        device_config = FakeDeviceConfig(tmp_path)
+        plugin = FakePlugin("2026-10-19")
+        instance = make_instance()
+
+        PlaylistRefresh(FakePlaylist(), instance).execute(plugin, device_config, NOW)
+        plugin.input_key = "2026-10-20"
+        PlaylistRefresh(FakePlaylist(), instance).execute(plugin, device_config, NOW + timedelta(minutes=5))
+        instance.settings = {"text": "changed"}
+        PlaylistRefresh(FakePlaylist(), instance).execute(plugin, device_config, NOW + timedelta(minutes=10))
+
+        assert plugin.generated == 3
+
+    def test_no_key_or_force_always_regenerates(self, tmp_path):
+        device_config = FakeDeviceConfig(tmp_path)
+        plugin = FakePlugin(None)
+        instance = make_instance()
+
+        PlaylistRefresh(FakePlaylist(), instance).execute(plugin, device_config, NOW)
+        PlaylistRefresh(FakePlaylist(), instance).execute(plugin, device_config, NOW + timedelta(minutes=5))
+        plugin.input_key = "same"
+        PlaylistRefresh(FakePlaylist(), instance).execute(plugin, device_config, NOW + timedelta(minutes=10))
+        PlaylistRefresh(FakePlaylist(), instance, force=True).execute(plugin, device_config, NOW + timedelta(minutes=11))
+
+        assert plugin.generated == 4
+
+    def test_missing_image_regenerates(self, tmp_path):
+        device_config = FakeDeviceConfig(tmp_path)
+        plugin = FakePlugin("same")
+        instance = make_instance()
+
+        PlaylistRefresh(FakePlaylist(), instance).execute(plugin, device_config, NOW)
+        get_image_writer().flush()
+        (tmp_path / instance.get_image_path()).unlink()
+        PlaylistRefresh(FakePlaylist(), instance).execute(plugin, device_config, NOW + timedelta(seconds=10))
+
+        assert plugin.generated == 2
+
+
+class TestImageMemoryCache:
+
+    def test_latest_image_is_reused_without_disk(self, tmp_path, monkeypatch):
+        device_config = FakeDeviceConfig(tmp_path)
+        plugin = FakePlugin("same")
+        instance = make_instance()
+
+        first = PlaylistRefresh(FakePlaylist(), instance)
+        generated = first.execute(plugin, device_config, NOW)
+        monkeypatch.setattr(get_image_writer(), "load", lambda path: pytest.fail("image read from disk"))
+        monkeypatch.setattr(refresh_task, "compute_image_hash", lambda image: pytest.fail("image hashed again"))
+        second = PlaylistRefresh(FakePlaylist(), instance)
+        image = second.execute(plugin, device_config, NOW + timedelta(seconds=10))
+
+        assert image is generated
+        assert second.image_hash == first.image_hash
+
+    def test_stale_entry_falls_back_to_disk(self, tmp_path):
+        device_config = FakeDeviceConfig(tmp_path)
+        plugin = FakePlugin("same")
+        instance = make_instance()
+
+        PlaylistRefresh(FakePlaylist(), instance).execute(plugin, device_config, NOW)
+        get_image_writer().flush()
+        path = str(tmp_path / instance.get_image_path())
+        get_image_memory_cache().put(path, Image.new("RGB", (800, 480), "black"), "other")
+        image = PlaylistRefresh(FakePlaylist(), instance).execute(plugin, device_config, NOW + timedelta(seconds=10))
+
+        assert image.getpixel((0, 0)) == (255, 255, 255)
+        assert get_image_memory_cache().get(path, instance.image_hash)[0] is image
+
+
+class TestNextChangeTime:
+
+    def test_hint_is_stored_and_cleared(self, tmp_path):
+        device_config = FakeDeviceConfig(tmp_path)
+        plugin = FakePlugin(None, next_change=NOW + timedelta(minutes=1))
+        instance = make_instance()
+
+        PlaylistRefresh(FakePlaylist(), instance).execute(plugin, device_config, NOW)
+        assert instance.next_change_time == (NOW + timedelta(minutes=1)).isoformat()
+
+        # hints in the past are ignored
+        plugin.next_change = NOW
+        PlaylistRefresh(FakePlaylist(), instance, force=True).execute(plugin, device_config, NOW + timedelta(minutes=1))
+        assert instance.next_change_time is None
+
+    @pytest.mark.parametrize("plugin_module, plugin_class, settings", [
+        ("plugins.countdown.countdown", "Countdown", {"title": "Launch", "date": "2026-12-24"}),
+        ("plugins.year_progress.year_progress", "YearProgress", {}),
+    ])
+    def test_unchanged_instance_is_not_regenerated_when_interval_expires(self, tmp_path, monkeypatch,
+                                                                         plugin_module, plugin_class, settings):
+        pytest.importorskip("jinja2")
+        import importlib
+        import pytz
+
+        plugin = getattr(importlib.import_module(plugin_module), plugin_class)({"id": plugin_class.lower()})
+        generated = []
+        monkeypatch.setattr(plugin, "generate_image",
+                            lambda *args: generated.append(args) or Image.new("RGB", (800, 480), "white"))
+        monkeypatch.setattr(plugin, "compute_input_key", lambda *args: None)
+        device_config = FakeDeviceConfig(tmp_path)
+        instance = PluginInstance(plugin_class.lower(), "Instance", settings, {"interval": 3600})
+        start = datetime(2026, 10, 19, 12, 0, tzinfo=pytz.utc)
+
+        PlaylistRefresh(FakePlaylist(), instance).execute(plugin, device_config, start)
+        next_change = instance.get_next_change_dt()
+        assert next_change > start + timedelta(hours=1)
+
+        # the interval expired, but the content is the same until the next change
+        PlaylistRefresh(FakePlaylist(), instance).execute(plugin, device_config, start + timedelta(hours=2))
+        PlaylistRefresh(FakePlaylist(), instance).execute(plugin, device_config, next_change - timedelta(seconds=1))
+        assert len(generated) == 1
+        assert instance.latest_refresh_time == start.isoformat()
+
+        PlaylistRefresh(FakePlaylist(), instance).execute(plugin, device_config, next_change)
+        assert len(generated) == 2
+
+    def test_displayed_stale_instance_is_refreshed_without_cycling(self, tmp_path):
+        instance = make_instance()
+        instance.latest_refresh_time = NOW.isoformat()
+        instance.next_change_time = (NOW + timedelta(minutes=1)).isoformat()
+        playlist_manager = PlaylistManager([], active_playlist="Default")
+        playlist_manager.add_default_playlist()
+        playlist_manager.playlists[0].plugins.append(instance)
+        refresh_info = RefreshInfo("Playlist", "fake", NOW.isoformat(), "hash", playlist="Default", plugin_instance="Fake")
+        task = RefreshTask(FakePlaylistDeviceConfig(tmp_path, playlist_manager, refresh_info), None)
+
+        assert task._determine_stale_plugin(playlist_manager, refresh_info, NOW + timedelta(seconds=59)) == (None, None)
+        playlist, stale = task._determine_stale_plugin(playlist_manager, refresh_info, NOW + timedelta(minutes=1))
+        assert stale is instance
+
+        action = PlaylistRefresh(playlist, stale, cycle_time=refresh_info.refresh_time)
+        assert action.get_refresh_info()["refresh_time"] == NOW.isoformat()
+
+    def test_sleep_time_shortened_to_next_change(self, tmp_path, monkeypatch):
+        instance = make_instance()
+        instance.latest_refresh_time = NOW.isoformat()
+        instance.next_change_time = (NOW + timedelta(seconds=90)).isoformat()
+        playlist_manager = PlaylistManager([], active_playlist="Default")
+        playlist_manager.add_default_playlist()
+        playlist_manager.playlists[0].plugins.append(instance)
+        refresh_info = RefreshInfo("Playlist", "fake", NOW.isoformat(), "hash", playlist="Default", plugin_instance="Fake")
+        task = RefreshTask(FakePlaylistDeviceConfig(tmp_path, playlist_manager, refresh_info), None)
+        monkeypatch.setattr(task, "_get_current_datetime", lambda: NOW)
+
+        assert task._get_sleep_time(3600) == 90
+        assert task._get_sleep_time(60) == 60
+
+        refresh_info.refresh_type = "Manual Update"
+        assert task._get_sleep_time(3600) == 3600
+
+    def test_earlier_hint_waits_for_interval(self, tmp_path, monkeypatch):
+        instance = PluginInstance("fake", "Fake", {}, {"interval": 3600}, latest_refresh_time=NOW.isoformat(),
+                                  next_change_time=(NOW + timedelta(minutes=1)).isoformat())
+        playlist_manager = PlaylistManager([], active_playlist="Default")
+        playlist_manager.add_default_playlist()
+        playlist_manager.playlists[0].plugins.append(instance)
+        refresh_info = RefreshInfo("Playlist", "fake", NOW.isoformat(), "hash", playlist="Default", plugin_instance="Fake")
+        task = RefreshTask(FakePlaylistDeviceConfig(tmp_path, playlist_manager, refresh_info), None)
+        monkeypatch.setattr(task, "_get_current_datetime", lambda: NOW + timedelta(minutes=1))
+
+        assert task._get_sleep_time(7200) == 59 * 60
+        assert task._determine_stale_plugin(playlist_manager, refresh_info, NOW + timedelta(minutes=59)) == (None, None)
+        assert task._determine_stale_plugin(playlist_manager, refresh_info, NOW + timedelta(hours=1))[1] is instance
+
+
+class FakeJobDeviceConfig(FakePlaylistDeviceConfig):
+
+    def __init__(self, plugin_image_dir):
+        super().__init__(plugin_image_dir, PlaylistManager([]),
+                         RefreshInfo("Manual Update", "fake", NOW.isoformat(), "hash"))
+        self.config["plugin_cycle_interval_seconds"] = 3600
+
+    def get_plugin(self, plugin_id):
+        return {"id": plugin_id} if plugin_id == "fake" else None
+
+    def write_config(self):
+        pass
+
+
+class FakeDisplayManager:
+
+    def __init__(self):
+        self.displayed = []
+
+    def display_image(self, image, image_settings=[], image_hash=None):
+        self.displayed.append(image)
+
+
+class TestRefreshJobs:
+
+    def test_queued_job_for_same_instance_is_superseded(self, tmp_path):
+        task = RefreshTask(FakeJobDeviceConfig(tmp_path), FakeDisplayManager())
+        first = task.submit(ManualRefresh("fake", {"text": "one"}))
+        other = task.submit(ManualRefresh("other", {}))
+        latest = task.submit(ManualRefresh("fake", {"text": "two"}))
+
+        assert first.status == "superseded" and first.is_done()
+        assert first.to_dict()["superseded_by"] == latest.id
+        assert list(task.pending_jobs.values()) == [other, latest]
+        assert task.get_job(first.id) is first
+
+    def test_queue_is_bounded(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(refresh_task, "MAX_PENDING_JOBS", 2)
+        task = RefreshTask(FakeJobDeviceConfig(tmp_path), FakeDisplayManager())
+        task.submit(ManualRefresh("a", {}))
+        task.submit(ManualRefresh("b", {}))
+
+        with pytest.raises(JobQueueFull):
+            task.submit(ManualRefresh("c", {}))
+        # coalescing into a queued job is still allowed
+        task.submit(ManualRefresh("b", {"text": "newer"}))
+
+    def test_jobs_run_in_background(self, tmp_path, monkeypatch):
+        plugin = FakePlugin(None)
+        plugin.config = {}
+        monkeypatch.setattr(refresh_task, "get_plugin_instance", lambda plugin_config: plugin)
+        display_manager = FakeDisplayManager()
+        task = RefreshTask(FakeJobDeviceConfig(tmp_path), display_manager)
+        task.start()
+        try:
+            job = task.submit(ManualRefresh("fake", {}))
+            missing = task.submit(ManualRefresh("missing", {}))
+            assert job.wait(timeout=5) and missing.wait(timeout=5)
+        finally:
+            task.stop()
+
+        assert job.status == "displayed"
+        assert job.to_dict()["refresh_info"]["plugin_id"] == "fake"
+        assert len(display_manager.displayed) == 1
+        assert missing.status == "failed"
+        assert "Plugin config not found" in missing.to_dict()["error"]
+
+    def test_stop_fails_queued_jobs(self, tmp_path):
+        task = RefreshTask(FakeJobDeviceConfig(tmp_path), FakeDisplayManager())
+        # queued while no thread picks it up, as if a refresh were running
+        job = task.submit(ManualRefresh("fake", {}))
+        task.stop()
+
+        assert job.wait(timeout=0) and job.status == "failed"
+        assert "stopped" in job.to_dict()["error"]
+        assert not task.pending_jobs
+        with pytest.raises(RuntimeError):
+            task.submit(ManualRefresh("fake", {}))
@@ -0,0 +1,139 @@
+import io
+import os
+
+import pytest
+
+Image = pytest.importorskip("PIL.Image")
+
+from utils import upload_ingest
+from utils.upload_ingest import (build_derivative, delete_upload, get_display_path, get_upload_digest,
+                                 ingest_upload, read_upload_info, wait_for_derivatives)
+
+
+class FakeUpload:
+
+    def __init__(self, filename, data):
+        self.filename = filename
+        self.stream = io.BytesIO(data)
+
+
+def jpeg_bytes(size, orientation=None):
+    image = Image.new("RGB", size, "blue")
+    exif = Image.Exif()
+    if orientation:
+        exif[upload_ingest.ORIENTATION_TAG] = orientation
+    buffer = io.BytesIO()
+    image.save(buffer, format="JPEG", exif=exif.tobytes())
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def save_dir(tmp_path, monkeypatch):
+    cache_dir = tmp_path / "cache"
+    cache_dir.mkdir()
+    monkeypatch.setattr(upload_ingest, "get_cache_dir", lambda *subdirs: str(cache_dir))
+    saved = tmp_path / "saved"
+    saved.mkdir()
+    return str(saved)
+
+
+class TestUploadIngest:
+
+    def test_stores_original_bytes(self, save_dir):
+        data = jpeg_bytes((400, 300), orientation=6)
+        path = ingest_upload(FakeUpload("photo.jpg", data), save_dir)
+
+        assert os.path.basename(path).startswith("photo-")
+        assert get_upload_digest(path) is not None
+        with open(path, "rb") as f:
+            assert f.read() == data
+        assert [name for name in os.listdir(save_dir) if name.endswith(".tmp")] == []
+
+    def test_dedupes_identical_content(self, save_dir):
+        data = jpeg_bytes((400, 300))
+        first = ingest_upload(FakeUpload("photo.jpg", data), save_dir)
+        second = ingest_upload(FakeUpload("copy.jpg", data), save_dir)
+        other = ingest_upload(FakeUpload("photo.jpg", jpeg_bytes((300, 300))), save_dir)
+
+        assert second == first
+        assert other != first
+        assert len(os.listdir(save_dir)) == 2
+
+    def test_records_orientation(self, save_dir):
+        path = ingest_upload(FakeUpload("photo.jpg", jpeg_bytes((400, 300), orientation=6)), save_dir)
+        assert read_upload_info(path) == {"width": 300, "height": 400, "orientation": 6}
+
+    def test_non_images_are_stored_as_is(self, save_dir):
+        path = ingest_upload(FakeUpload("doc.pdf", b"%PDF-1.4"), save_dir)
+        assert get_display_path(path, 100) == path
+
+    def test_derivative_is_oriented_and_scaled(self, save_dir):
+        path = ingest_upload(FakeUpload("photo.jpg", jpeg_bytes((800, 600), orientation=6)), save_dir)
+        derivative = build_derivative(path, 150)
+
+        with Image.open(derivative) as image:
+            assert image.size == (150, 200)
+        assert get_display_path(path, 150) == derivative
+        # small enough images are displayed as they are
+        assert build_derivative(path, 600) is None
+        assert get_display_path(path, 600) == path
+
+    def test_derivative_built_in_background(self, save_dir):
+        path = ingest_upload(FakeUpload("photo.jpg", jpeg_bytes((800, 600))), save_dir, derivative_size=120)
+        wait_for_derivatives()
+
+        display_path = get_display_path(path, 120)
+        assert display_path != path
+        with Image.open(display_path) as image:
+            assert image.size == (160, 120)
+
+    def test_delete_upload_removes_derivatives(self, save_dir, tmp_path):
+        path = ingest_upload(FakeUpload("photo.jpg", jpeg_bytes((800, 600))), save_dir)
+        derivative = build_derivative(path, 100)
+
+        delete_upload(path)
+        assert not os.path.exists(path)
+        assert not os.path.exists(derivative)
+        assert os.listdir(tmp_path / "cache") == []
+
+
+class FakeDeviceConfig:
+
+    def __init__(self, playlist_manager):
+        self.playlist_manager = playlist_manager
+
+    def get_playlist_manager(self):
+        return self.playlist_manager
+
+
+class TestSharedUploads:
+
+    @pytest.fixture
+    def without_shared_files(self):
+        pytest.importorskip("flask")
+        pytest.importorskip("psutil")
+        pytest.importorskip("pytz")
+        from blueprints.plugin import _without_shared_files
+        return _without_shared_files
+
+    def test_files_shared_within_a_deleted_playlist_are_released(self, save_dir, without_shared_files):
+        from model import PlaylistManager, PluginInstance
+
+        shared = ingest_upload(FakeUpload("photo.jpg", jpeg_bytes((40, 30))), save_dir)
+        kept = ingest_upload(FakeUpload("other.jpg", jpeg_bytes((30, 30))), save_dir)
+        first = PluginInstance("image_upload", "First", {"imageFiles[]": [shared, kept]}, {})
+        second = PluginInstance("image_upload", "Second", {"imageFiles[]": [shared]}, {})
+        elsewhere = PluginInstance("image_upload", "Elsewhere", {"imageFiles[]": [kept]}, {})
+        playlist_manager = PlaylistManager([])
+        playlist_manager.add_playlist("Deleted")
+        playlist_manager.add_playlist("Kept")
+        playlist_manager.get_playlist("Deleted").plugins.extend([first, second])
+        playlist_manager.get_playlist("Kept").plugins.append(elsewhere)
+        device_config = FakeDeviceConfig(playlist_manager)
+
+        # deleting one instance keeps what the others use
+        assert without_shared_files(device_config, first) == {"imageFiles[]": []}
+        # deleting the whole playlist releases what only its instances use
+        deleted = playlist_manager.get_playlist("Deleted").plugins
+        assert without_shared_files(device_config, first, deleted) == {"imageFiles[]": [shared]}
+        assert without_shared_files(device_config, second, deleted) == {"imageFiles[]": [shared]}
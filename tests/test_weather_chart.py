@@ -0,0 +1,67 @@
+import pytest
+
+from src.plugins.weather.chart import build_curve_path, build_hourly_chart
+
+SETTINGS = {"displayRain": "true", "displayGraphIcons": "true", "graphIconStep": "2"}
+
+
+def hour(time, temperature, precipitation=0, rain=0):
+    return {"time": time, "temperature": temperature, "precipitation": precipitation,
+            "rain": rain, "icon": "icons\\01d.png"}
+
+
+class TestWeatherChart:
+
+    def test_temperature_range_spans_plot(self):
+        chart = build_hourly_chart([hour("1 PM", 10), hour("2 PM", 20), hour("3 PM", 15)],
+                                   "metric", SETTINGS, (800, 480))
+
+        assert (chart["min_temperature"], chart["max_temperature"]) == (10, 20)
+        # points are centered in each hour, the lowest at the bottom and the highest at the top
+        assert chart["temperature_line"].startswith("M0.5,100 ")
+        assert " 1.5,0 " in chart["temperature_line"]
+        assert chart["temperature_line"].endswith(" 2.5,50")
+        assert chart["temperature_area"].endswith("L2.5,100 L0.5,100 Z")
+
+    def test_flat_temperature_is_centered(self):
+        chart = build_hourly_chart([hour("1 PM", 5), hour("2 PM", 5)], "standard", SETTINGS, (800, 480))
+        assert chart["temperature_line"] == "M0.5,50 C1,50 1,50 1.5,50"
+        assert not chart["degrees"]
+
+    def test_precipitation_bars_and_rain_labels(self):
+        chart = build_hourly_chart([hour("1 PM", 10, 0.5, 1.2), hour("2 PM", 11, 0.05, 0.2), hour("3 PM", 12)],
+                                   "metric", SETTINGS, (800, 480))
+
+        assert chart["precipitation_bars"] == "M0,50H1V100H0ZM1,95H2V100H1Z"
+        assert chart["precipitation_tops"] == "M0,50H1M1,95H2"
+        assert [(amount["amount"], amount["unit"], amount["inside"]) for amount in chart["rain"]] == [
+            ("1.20", "mm", True),
+            ("0.20", "mm", False),
+        ]
+
+    def test_rain_threshold_depends_on_units(self):
+        hours = [hour("1 PM", 10, 0.5, 0.003), hour("2 PM", 11, 0.5, 0.05)]
+        assert [amount["unit"] for amount in build_hourly_chart(hours, "imperial", SETTINGS, (800, 480))["rain"]] == ["in"]
+        assert [amount["amount"] for amount in build_hourly_chart(hours, "metric", SETTINGS, (800, 480))["rain"]] == []
+
+        chart = build_hourly_chart(hours, "metric", dict(SETTINGS, displayRain="false"), (800, 480))
+        assert chart["rain"] == []
+
+    @pytest.mark.parametrize("width,step", [(1600, 1), (800, 2), (480, 4)])
+    def test_labels_are_skipped_on_narrow_displays(self, width, step):
+        hours = [hour(f"{index}", 10) for index in range(24)]
+        chart = build_hourly_chart(hours, "metric", SETTINGS, (width, 480))
+        assert [label["text"] for label in chart["labels"]] == [str(index) for index in range(0, 24, step)]
+
+    def test_icons_every_step(self):
+        hours = [hour(f"{index}", 10) for index in range(6)]
+        chart = build_hourly_chart(hours, "metric", dict(SETTINGS, graphIconStep="3"), (800, 480))
+        assert [icon["left"] for icon in chart["icons"]] == [8.33, 58.33]
+        assert chart["icons"][0]["src"] == "icons/01d.png"
+
+        chart = build_hourly_chart(hours, "metric", dict(SETTINGS, displayGraphIcons="false"), (800, 480))
+        assert chart["icons"] == []
+
+    def test_empty_forecast(self):
+        assert build_hourly_chart([], "metric", SETTINGS, (800, 480)) is None
+        assert build_curve_path([]) == ""